@@ -0,0 +1,213 @@
+import re
+import time
+from datetime import datetime
+
+from pubmed_cache import get_connection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS abstracts (
+    pmid TEXT PRIMARY KEY,
+    title TEXT,
+    abstract TEXT,
+    mesh_terms TEXT,
+    journal TEXT,
+    pub_year INTEGER,
+    pubdate TEXT,
+    doi TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_abstracts_journal ON abstracts (journal);
+CREATE INDEX IF NOT EXISTS idx_abstracts_year ON abstracts (pub_year);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS abstracts_fts USING fts5(
+    title, abstract, mesh_terms,
+    content='abstracts', content_rowid='rowid', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS abstracts_ai AFTER INSERT ON abstracts BEGIN
+    INSERT INTO abstracts_fts (rowid, title, abstract, mesh_terms)
+    VALUES (new.rowid, new.title, new.abstract, new.mesh_terms);
+END;
+CREATE TRIGGER IF NOT EXISTS abstracts_ad AFTER DELETE ON abstracts BEGIN
+    INSERT INTO abstracts_fts (abstracts_fts, rowid, title, abstract, mesh_terms)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.mesh_terms);
+END;
+CREATE TRIGGER IF NOT EXISTS abstracts_au AFTER UPDATE ON abstracts BEGIN
+    INSERT INTO abstracts_fts (abstracts_fts, rowid, title, abstract, mesh_terms)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.mesh_terms);
+    INSERT INTO abstracts_fts (rowid, title, abstract, mesh_terms)
+    VALUES (new.rowid, new.title, new.abstract, new.mesh_terms);
+END;
+"""
+
+# Column weights for bm25 ranking: title, abstract, MeSH terms
+RANK_WEIGHTS = (10.0, 1.0, 5.0)
+
+
+def get_index_connection():
+    """
+    Open the PubMed cache with the abstract index tables created.
+    Returns:
+        sqlite3.Connection: Open cache connection.
+    """
+    conn = get_connection()
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _element_text(element):
+    return "".join(element.itertext()).strip() if element is not None else ""
+
+
+def parse_pubmed_articles(root):
+    """
+    Extract indexable fields from an EFetch PubmedArticleSet.
+    Args:
+        root (xml.etree.ElementTree.Element): Parsed EFetch XML.
+    Returns:
+        list: Dictionaries with pmid, title, abstract, mesh_terms, journal, pub_year, pubdate and doi.
+    """
+    records = []
+    for article in root.findall(".//PubmedArticle"):
+        pmid = article.findtext(".//PMID")
+        if not pmid:
+            continue
+        pub_date = article.find(".//JournalIssue/PubDate")
+        pubdate = " ".join(_element_text(part) for part in pub_date) if pub_date is not None else ""
+        year_match = re.search(r"\d{4}", pubdate)
+        doi = article.find(".//ELocationID[@EIdType='doi']")
+        if doi is None:
+            doi = article.find(".//ArticleId[@IdType='doi']")
+        journal = article.findtext(".//Journal/ISOAbbreviation") or article.findtext(".//Journal/Title") or ""
+        records.append(
+            {
+                "pmid": pmid,
+                "title": _element_text(article.find(".//ArticleTitle")),
+                "abstract": " ".join(_element_text(p) for p in article.findall(".//AbstractText")),
+                "mesh_terms": "; ".join(
+                    _element_text(d) for d in article.findall(".//MeshHeading/DescriptorName")
+                ),
+                "journal": journal,
+                "pub_year": int(year_match.group()) if year_match else None,
+                "pubdate": pubdate,
+                "doi": _element_text(doi),
+            }
+        )
+    return records
+
+
+def save_articles(conn, records):
+    """
+    Insert or update article records; the FTS index is kept in sync by triggers.
+    Args:
+        conn (sqlite3.Connection): Connection from get_index_connection.
+        records (list): Records from parse_pubmed_articles.
+    """
+    fetched_at = datetime.now().isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO abstracts (pmid, title, abstract, mesh_terms, journal, pub_year, pubdate, doi, fetched_at)
+            VALUES (:pmid, :title, :abstract, :mesh_terms, :journal, :pub_year, :pubdate, :doi, :fetched_at)
+            ON CONFLICT(pmid) DO UPDATE SET
+                title = excluded.title, abstract = excluded.abstract, mesh_terms = excluded.mesh_terms,
+                journal = excluded.journal, pub_year = excluded.pub_year, pubdate = excluded.pubdate,
+                doi = excluded.doi, fetched_at = excluded.fetched_at
+            """,
+            [{**record, "fetched_at": fetched_at} for record in records],
+        )
+
+
+def index_efetch_response(root):
+    """
+    Store every article of an EFetch response in the local abstract index.
+    Called by the EFetch-based pages right after parsing the response.
+    Args:
+        root (xml.etree.ElementTree.Element): Parsed EFetch XML.
+    Returns:
+        int: Number of articles indexed.
+    """
+    records = parse_pubmed_articles(root)
+    if records:
+        conn = get_index_connection()
+        try:
+            save_articles(conn, records)
+        finally:
+            conn.close()
+    return len(records)
+
+
+def build_match_query(text):
+    """
+    Turn free text into a safe FTS5 query: every word must match, a trailing * is a prefix search.
+    Args:
+        text (str): User search text.
+    Returns:
+        str: FTS5 MATCH expression, or an empty string if there are no words.
+    """
+    terms = []
+    for word in re.findall(r"[\w\-]+\*?", text):
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', "")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " AND ".join(terms)
+
+
+def search_abstracts(conn, text, journal=None, year_from=None, year_to=None, limit=50):
+    """
+    Rank cached articles against a query using bm25 over title, abstract and MeSH terms.
+    Args:
+        conn (sqlite3.Connection): Connection from get_index_connection.
+        text (str): Free-text query.
+        journal (str, optional): Restrict to one journal.
+        year_from (int, optional): Earliest publication year.
+        year_to (int, optional): Latest publication year.
+        limit (int): Maximum number of results.
+    Returns:
+        tuple: (list of result dictionaries, elapsed milliseconds).
+    """
+    match = build_match_query(text)
+    if not match:
+        return [], 0.0
+
+    sql = f"""
+        SELECT a.pmid, a.title, a.journal, a.pubdate, a.doi, a.mesh_terms,
+               snippet(abstracts_fts, 1, '**', '**', '…', 24) AS snippet,
+               bm25(abstracts_fts, {', '.join(str(w) for w in RANK_WEIGHTS)}) AS score
+        FROM abstracts_fts
+        JOIN abstracts a ON a.rowid = abstracts_fts.rowid
+        WHERE abstracts_fts MATCH ?
+    """
+    params = [match]
+    if journal:
+        sql += " AND a.journal = ?"
+        params.append(journal)
+    if year_from:
+        sql += " AND a.pub_year >= ?"
+        params.append(year_from)
+    if year_to:
+        sql += " AND a.pub_year <= ?"
+        params.append(year_to)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+
+    start = time.perf_counter()
+    rows = conn.execute(sql, params).fetchall()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    columns = ["pmid", "title", "journal", "pubdate", "doi", "mesh_terms", "snippet", "score"]
+    return [dict(zip(columns, row)) for row in rows], elapsed_ms
+
+
+def list_journals(conn):
+    """
+    List journals present in the abstract index.
+    """
+    return [row[0] for row in conn.execute("SELECT DISTINCT journal FROM abstracts WHERE journal != '' ORDER BY journal")]
+
+
+def count_articles(conn):
+    """
+    Count articles in the abstract index.
+    """
+    return conn.execute("SELECT COUNT(*) FROM abstracts").fetchone()[0]
@@ -0,0 +1,73 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+from config import API_CACHE_DB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+
+def get_connection(db_path=API_CACHE_DB):
+    """
+    Open a connection to the persistent API response cache.
+    Args:
+        db_path (Path): Location of the SQLite database file.
+    Returns:
+        sqlite3.Connection: Open connection in WAL mode.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def cache_get_many(conn, namespace, keys, missing_ttl_days=None):
+    """
+    Look up cached values.
+    Args:
+        conn (sqlite3.Connection): Open cache connection.
+        namespace (str): Cache namespace, e.g. "crossref" or "rxcui".
+        keys (list): Keys to look up.
+        missing_ttl_days (float, optional): Age after which cached None values ("not found" answers) are
+        treated as uncached, so they are looked up again; kept forever when not given.
+    Returns:
+        dict: Mapping of key -> decoded value, for cached keys only.
+    """
+    retry_after = None
+    if missing_ttl_days is not None:
+        retry_after = (datetime.now() - timedelta(days=missing_ttl_days)).isoformat(timespec="seconds")
+    cached = {}
+    for key in keys:
+        row = conn.execute(
+            "SELECT value, fetched_at FROM api_cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row:
+            value = json.loads(row[0])
+            if value is None and retry_after is not None and row[1] <= retry_after:
+                continue
+            cached[key] = value
+    return cached
+
+
+def cache_set_many(conn, namespace, values):
+    """
+    Store values in the cache.
+    Args:
+        conn (sqlite3.Connection): Open cache connection.
+        namespace (str): Cache namespace.
+        values (dict): Mapping of key -> JSON-serialisable value.
+    """
+    fetched_at = datetime.now().isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO api_cache (namespace, key, value, fetched_at) VALUES (?, ?, ?, ?)",
+            [(namespace, key, json.dumps(value), fetched_at) for key, value in values.items()],
+        )
@@ -1,9 +1,45 @@
 import streamlit as st
+import tracing
+from startup import start_services
+
+
+def show_metrics():
+    """
+    Hidden admin view (?admin=metrics): per-page hot-path latency from the tracing spans.
+    """
+    st.title("Hot-path metrics")
+    if not tracing.is_enabled():
+        st.info("Tracing is off. Start the server with PANINI_TRACING=1 to record spans.")
+        return
+    rows = tracing.snapshot()
+    if not rows:
+        st.write("No spans recorded yet.")
+        return
+    st.dataframe([
+        {
+            "Page": row["page"],
+            "Stage": row["stage"],
+            "Count": row["count"],
+            "p50 (ms)": round(row["p50_s"] * 1000, 1),
+            "p95 (ms)": round(row["p95_s"] * 1000, 1),
+            "p99 (ms)": round(row["p99_s"] * 1000, 1),
+            "Total (s)": round(row["total_s"], 2),
+        }
+        for row in rows
+    ])
+    st.download_button("Download Prometheus text", tracing.prometheus_text(), file_name="metrics.txt")
+
 
 def main():
     """
     Main function to control the app flow and content.
     """
+    status = start_services()
+
+    if st.query_params.get("admin") == "metrics":
+        show_metrics()
+        return
+
     # Main content
     st.title("Panini Nutrition")
     st.write("Welcome to the app!")
@@ -11,6 +47,11 @@ def main():
     # Simple message or additional functionality can go here
     st.write("Welcome to Panini")
 
+    if status.ready.is_set():
+        st.sidebar.caption(f"Ready (warm-up took {sum(status.timings.values()):.1f} s)")
+    else:
+        st.sidebar.caption("Preparing datasets in the background...")
+
 if __name__ == "__main__":
     main()
 #https://panini.streamlit.app/
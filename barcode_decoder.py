@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import cv2
+import numpy as np
+from PIL import Image
+from pyzbar import pyzbar
+
+# Symbologies used on packaged food
+PRODUCT_SYMBOLS = {"EAN13", "EAN8", "UPCA", "UPCE", "CODE128"}
+
+# Longest image side used by the fast path; phone photos are downscaled to this
+FAST_PATH_MAX_SIDE = 1024
+
+# Rotation angles (degrees) tried by the fallback path
+FALLBACK_ANGLES = (0, 90, 180, 270, 15, -15, 30, -30)
+
+
+def load_grayscale(image_bytes):
+    """
+    Decode image bytes into a grayscale NumPy array.
+    """
+    with Image.open(BytesIO(image_bytes)) as image:
+        return np.asarray(image.convert("L"))
+
+
+def downscale(gray, max_side=FAST_PATH_MAX_SIDE):
+    """
+    Shrink an image so its longest side is at most max_side pixels.
+    """
+    height, width = gray.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1:
+        return gray
+    return cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+
+def rotate(gray, angle):
+    """
+    Rotate an image by angle degrees, keeping the whole image in frame.
+    """
+    if angle == 0:
+        return gray
+    if angle in (90, 180, 270):
+        codes = {90: cv2.ROTATE_90_CLOCKWISE, 180: cv2.ROTATE_180, 270: cv2.ROTATE_90_COUNTERCLOCKWISE}
+        return cv2.rotate(gray, codes[angle])
+    height, width = gray.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+    new_width, new_height = int(height * sin + width * cos), int(height * cos + width * sin)
+    matrix[0, 2] += new_width / 2 - width / 2
+    matrix[1, 2] += new_height / 2 - height / 2
+    return cv2.warpAffine(gray, matrix, (new_width, new_height), borderValue=255)
+
+
+def scan(gray):
+    """
+    Run zbar on a grayscale image.
+    Returns:
+        list: Decoded product barcodes.
+    """
+    return [
+        symbol.data.decode("utf-8")
+        for symbol in pyzbar.decode(gray)
+        if symbol.type in PRODUCT_SYMBOLS
+    ]
+
+
+def decode_frame(gray):
+    """
+    Decode barcodes from a grayscale image or video frame.
+    The fast path scans a downscaled copy; if it finds nothing, the fallback scans the full-resolution
+    image after adaptive thresholding across a sweep of rotations.
+    Args:
+        gray (np.ndarray): Grayscale image.
+    Returns:
+        list: Unique decoded barcodes.
+    """
+    found = scan(downscale(gray))
+    if found:
+        return list(dict.fromkeys(found))
+
+    blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+    thresholded = cv2.adaptiveThreshold(
+        blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10
+    )
+    for candidate in (gray, thresholded):
+        for angle in FALLBACK_ANGLES:
+            found = scan(rotate(candidate, angle))
+            if found:
+                return list(dict.fromkeys(found))
+    return []
+
+
+def decode_image(image_bytes):
+    """
+    Decode barcodes from an uploaded photo.
+    Args:
+        image_bytes (bytes): Encoded image (JPEG, PNG, ...).
+    Returns:
+        list: Unique decoded barcodes; empty if the image cannot be read or has no barcode.
+    """
+    try:
+        gray = load_grayscale(image_bytes)
+    except Exception:
+        return []
+    return decode_frame(gray)
+
+
+def decode_images(images, max_workers=4):
+    """
+    Decode barcodes from several images in a thread pool (zbar and OpenCV release the GIL).
+    Args:
+        images (list): Encoded image bytes.
+        max_workers (int): Number of worker threads.
+    Returns:
+        list: List of decoded barcode lists, in the same order as images.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(decode_image, images))
@@ -0,0 +1,43 @@
+# Cohort body composition: one screening-camp day (2,000 people) per scale step.
+import random
+
+import pandas as pd
+
+from panini.body_composition import compute_body_composition
+from panini.cohort import SKINFOLD_COLUMNS, compute_cohort_body_composition, summarize_cohort
+
+PEOPLE_PER_SCALE = 2000
+
+
+def synthetic_cohort(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        row = {
+            "weight": rng.uniform(40, 110),
+            "height": rng.uniform(140, 195),
+            "age": rng.randint(18, 80),
+            "sex": rng.choice(["Male", "Female"]),
+            "density": rng.uniform(1.0, 1.09),
+        }
+        row.update({column: rng.uniform(5, 35) for column in SKINFOLD_COLUMNS})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def per_person(cohort):
+    # The single-person calculator applied row by row, for comparison
+    skinfold_sites = [column.capitalize() for column in SKINFOLD_COLUMNS]
+    for row in cohort.itertuples(index=False):
+        skinfolds = {site: getattr(row, site.lower()) for site in skinfold_sites}
+        compute_body_composition(row.weight, row.height, row.age, row.sex, "7-Site", skinfolds, row.density)
+
+
+def benchmarks(scale, workdir):
+    cohort = synthetic_cohort(PEOPLE_PER_SCALE * scale)
+    results = compute_cohort_body_composition(cohort)
+    return {
+        "cohort_vectorized": lambda: compute_cohort_body_composition(cohort),
+        "cohort_per_person": lambda: per_person(cohort),
+        "summary": lambda: summarize_cohort(results),
+    }
@@ -0,0 +1,63 @@
+# Diet chart generation on the real diet tables and 10x/100x scale-ups.
+import random
+
+from harness import scale_frame
+from panini.data import read_dataset
+from panini.diet_planner import (
+    MEAL_SECTIONS,
+    MEAL_STRUCTURE,
+    OUR_DIET_MEAL_SECTIONS,
+    OUR_DIET_MEAL_STRUCTURE,
+    generate_batch_charts,
+    generate_daily_chart,
+    generate_monthly_chart,
+    prepare_diet_data,
+    select_items,
+)
+from panini.reports import create_diet_chart_pdf
+
+# Dataset -> (meal structure, PDF sections, scale items to the calorie target)
+DIET_TABLES = {
+    "mydiet": (MEAL_STRUCTURE, MEAL_SECTIONS, False),
+    "our_diet": (OUR_DIET_MEAL_STRUCTURE, OUR_DIET_MEAL_SECTIONS, True),
+}
+
+# The pages' default inputs
+TOTAL_CALORIES = 1000
+CALORIE_DISTRIBUTION = {"A": 200, "B": 0, "C": 300, "D": 100, "E": 200, "F": 0}
+
+# People in the batch case, with targets spread over a typical range
+BATCH_TARGETS = {f"person_{i}": 1200 + (i % 20) * 50 for i in range(100)}
+
+
+def benchmarks(scale, workdir):
+    cases = {}
+    for name, (structure, sections, scale_items) in DIET_TABLES.items():
+        diet_data = prepare_diet_data(scale_frame(read_dataset(name), scale))
+        rng = random.Random(0)
+        monthly_chart = generate_monthly_chart(
+            diet_data, TOTAL_CALORIES, CALORIE_DISTRIBUTION, False,
+            meal_structure=structure, scale_items=scale_items, seed=0,
+        )
+
+        cases[f"{name}.select_items"] = lambda diet_data=diet_data, rng=rng: select_items(
+            diet_data, "C", ["C1", "C2", "C3", "C4"], calorie_distribution=CALORIE_DISTRIBUTION, rng=rng
+        )
+        cases[f"{name}.generate_daily_chart"] = lambda diet_data=diet_data, rng=rng, structure=structure, scale_items=scale_items: (
+            generate_daily_chart(diet_data, TOTAL_CALORIES, CALORIE_DISTRIBUTION, False, structure, scale_items, rng)
+        )
+        cases[f"{name}.generate_monthly_chart"] = lambda diet_data=diet_data, structure=structure, scale_items=scale_items: (
+            generate_monthly_chart(
+                diet_data, TOTAL_CALORIES, CALORIE_DISTRIBUTION, False,
+                meal_structure=structure, scale_items=scale_items, seed=0,
+            )
+        )
+        cases[f"{name}.create_pdf"] = lambda chart=monthly_chart, sections=sections: create_diet_chart_pdf(
+            chart, TOTAL_CALORIES, CALORIE_DISTRIBUTION, False, sections
+        )
+        cases[f"{name}.generate_batch_charts"] = lambda diet_data=diet_data, structure=structure, scale_items=scale_items: (
+            generate_batch_charts(
+                diet_data, BATCH_TARGETS, days=7, meal_structure=structure, scale_items=scale_items, seed=0
+            )
+        )
+    return cases
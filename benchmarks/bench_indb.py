@@ -0,0 +1,38 @@
+# INDB queries and the OpenFoodFacts -> INDB mapping.
+import random
+
+from harness import scale_frame
+from indb import OPENFOODFACTS_TO_INDB, load_indb, products_to_indb
+
+# Synthetic packaged products per scale step
+PRODUCTS_PER_SCALE = 1000
+
+
+def synthetic_products(count, seed=0):
+    rng = random.Random(seed)
+    keys = list(OPENFOODFACTS_TO_INDB)
+    return [
+        {
+            "code": str(8900000000000 + i),
+            "product_name": f"Product {i}",
+            "brands": "Bench",
+            "nutriments": {key: rng.random() * 10 for key in rng.sample(keys, 12)},
+        }
+        for i in range(count)
+    ]
+
+
+def benchmarks(scale, workdir):
+    foods = scale_frame(load_indb(), scale)
+    products = synthetic_products(PRODUCTS_PER_SCALE * scale)
+
+    cases = {
+        "name_search": lambda: foods[foods["food_name"].str.contains("dal", case=False, na=False)],
+        "nutrient_range": lambda: foods[foods["energy_kcal"].between(100, 300) & (foods["protein_g"] > 10)],
+        "top_iron": lambda: foods.nlargest(20, "iron_mg"),
+        "describe": lambda: foods.describe(),
+        "products_to_indb": lambda: products_to_indb(products),
+    }
+    if scale == 1:
+        cases["load_indb"] = load_indb
+    return cases
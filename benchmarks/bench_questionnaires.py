@@ -0,0 +1,71 @@
+# Questionnaire scoring for a batch of synthetic respondents.
+import random
+
+import pandas as pd
+
+from panini.bulk_scoring import score_export
+from panini.questionnaire_engine import load_instrument
+from panini.questionnaires import (
+    calculate_dgai_scores,
+    calculate_dsqols_scores,
+    calculate_ipaq_scores,
+    calculate_mindful_eating_scores,
+    dsqols_badge,
+)
+
+# Synthetic respondents per scale step
+RESPONDENTS_PER_SCALE = 100
+
+IPAQ_SECTIONS = ["Vigorous Physical Activity", "Moderate Physical Activity", "Walking"]
+
+
+def benchmarks(scale, workdir):
+    rng = random.Random(0)
+    count = RESPONDENTS_PER_SCALE * scale
+
+    dsqols = load_instrument("dsqols").questionnaire()
+    dgai_instrument = load_instrument("dgai")
+    dgai = dgai_instrument.questionnaire()
+    mindful = load_instrument("mindful_eating").questionnaire()
+    frequency_options = dgai_instrument.values
+
+    dsqols_responses = [
+        {section: {q: rng.randint(1, 5) for q in questions} for section, questions in dsqols.items()}
+        for _ in range(count)
+    ]
+    dgai_responses = [
+        {section: [rng.choice(frequency_options) for _ in questions] for section, questions in dgai.items()}
+        for _ in range(count)
+    ]
+    mindful_responses = [
+        {section: [rng.choice(frequency_options) for _ in questions] for section, questions in mindful.items()}
+        for _ in range(count)
+    ]
+    # The same DGAI answers as an uploaded table: one row per respondent, one column per item id
+    dgai_table = pd.DataFrame([dgai_instrument.answers_from_sections(r) for r in dgai_responses])
+    # ...and as a spreadsheet export: question-text headers, lower-case labels
+    dgai_export = dgai_table.rename(columns=dict(zip(dgai_instrument.item_ids, sum(dgai.values(), [])))).apply(
+        lambda column: column.str.lower()
+    )
+    ipaq_responses = []
+    for _ in range(count):
+        responses = {
+            section: {"Days": rng.randint(0, 7), "Hours": rng.randint(0, 3), "Minutes": rng.randint(0, 59)}
+            for section in IPAQ_SECTIONS
+        }
+        responses["Sitting"] = {"Hours": rng.randint(0, 12), "Minutes": rng.randint(0, 59)}
+        ipaq_responses.append(responses)
+
+    def score_dsqols():
+        for responses in dsqols_responses:
+            section_scores, overall = calculate_dsqols_scores(responses)
+            dsqols_badge(overall)
+
+    return {
+        "dsqols": score_dsqols,
+        "dgai": lambda: [calculate_dgai_scores(r) for r in dgai_responses],
+        "dgai_table": lambda: dgai_instrument.score_many(dgai_table),
+        "dgai_export": lambda: score_export("dgai", dgai_export),
+        "mindful_eating": lambda: [calculate_mindful_eating_scores(r) for r in mindful_responses],
+        "ipaq": lambda: [calculate_ipaq_scores(r) for r in ipaq_responses],
+    }
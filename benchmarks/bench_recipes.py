@@ -0,0 +1,28 @@
+# Recipe loading, filtering and search over the recipe chunks.
+import pandas as pd
+
+from harness import ROOT, scale_frame
+
+RECIPE_FILES = sorted((ROOT / "data").glob("recipechunk_*.csv"))
+
+
+def benchmarks(scale, workdir):
+    recipes = scale_frame(pd.concat([pd.read_csv(f) for f in RECIPE_FILES], ignore_index=True), scale)
+    cuisines = ["Indian", "South Indian Recipes", "North Indian Recipes"]
+    courses = list(recipes["Course"].dropna().unique())
+    diets = ["Vegetarian", "Diabetic Friendly", "High Protein Vegetarian"]
+
+    def filter_recipes():
+        return recipes[
+            recipes["Cuisine"].isin(cuisines) & recipes["Course"].isin(courses) & recipes["Diet"].isin(diets)
+        ]
+
+    cases = {
+        "search_by_name": lambda: recipes[recipes["RecipeName"].str.contains("paneer", case=False, na=False)],
+        "filter": filter_recipes,
+        "cuisine_counts": lambda: recipes["Cuisine"].value_counts(),
+    }
+    if scale == 1:
+        # Loading is only measured on the real files
+        cases["load_all_chunks"] = lambda: pd.concat([pd.read_csv(f) for f in RECIPE_FILES], ignore_index=True)
+    return cases
@@ -0,0 +1,45 @@
+# Word report builders, one report per scale step, with a chart embedded from PNG bytes; and rendering a
+# chart to PNG bytes, as the pages do before showing it and passing it to the report.
+from panini.charts import figure_to_png
+from panini.energy import calculate_macronutrients
+from panini.questionnaire_engine import load_instrument
+from panini.questionnaires import calculate_dsqols_scores, dsqols_badge
+from panini.reports import calorie_needs_word_report, dsqols_word_report
+
+
+def chart_image():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.bar(["Protein", "Fat", "Carbohydrates"], [25, 30, 45])
+    return figure_to_png(fig)
+
+
+def build_reports(builder, count):
+    for _ in range(count):
+        builder()
+
+
+def benchmarks(scale, workdir):
+    images = {"Chart": chart_image()}
+
+    questionnaire = load_instrument("dsqols").questionnaire()
+    responses = {section: {q: 3 for q in questions} for section, questions in questionnaire.items()}
+    section_scores, overall = calculate_dsqols_scores(responses)
+    badge, message = dsqols_badge(overall)
+
+    inputs = {"Gender": "Female", "Age": 35, "Weight (kg)": 60, "Height (cm)": 160, "Goal": "Maintenance"}
+    macronutrients = calculate_macronutrients(1800)
+
+    return {
+        "dsqols_word_report": lambda: build_reports(
+            lambda: dsqols_word_report(responses, section_scores, overall, badge, message, images), scale
+        ),
+        "calorie_needs_word_report": lambda: build_reports(
+            lambda: calorie_needs_word_report(inputs, 1800, macronutrients, images), scale
+        ),
+        "chart_to_png": lambda: build_reports(chart_image, scale),
+    }
@@ -0,0 +1,53 @@
+# Submission store: batched writes with cube maintenance, and dashboard queries from the cubes against the
+# same statistics computed by scanning the raw submissions. 10,000 DGAI submissions per scale step.
+import random
+
+from panini.questionnaire_engine import load_instrument
+from score_cubes import cube_summary
+from submission_store import get_connection, make_submission, record_submissions
+
+SUBMISSIONS_PER_SCALE = 10000
+SITES = ["Delhi", "Pune", "Chennai", "Kolkata"]
+
+RAW_SQL = (
+    "SELECT CASE WHEN age < 18 THEN '<18' WHEN age < 30 THEN '18-29' WHEN age < 45 THEN '30-44' "
+    "WHEN age < 60 THEN '45-59' ELSE '60+' END AS band, COUNT(*), AVG(overall), "
+    "AVG(overall * overall) FROM submissions WHERE instrument = 'dgai' AND sex = 'Female' AND site IN (?, ?) "
+    "GROUP BY band"
+)
+
+
+def synthetic_submissions(count, seed=0):
+    rng = random.Random(seed)
+    instrument = load_instrument("dgai")
+    submissions = []
+    for _ in range(count):
+        answers = {item_id: rng.choice(instrument.values) for item_id in instrument.item_ids}
+        section_scores, overall, badge, _ = instrument.score(answers)
+        submissions.append(make_submission(
+            "dgai", answers, section_scores=section_scores, overall=overall, badge=badge,
+            submitted_at=f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00",
+            age=rng.randint(12, 85), sex=rng.choice(["Male", "Female"]), site=rng.choice(SITES),
+        ))
+    return submissions
+
+
+def benchmarks(scale, workdir):
+    submissions = synthetic_submissions(SUBMISSIONS_PER_SCALE * scale)
+    conn = get_connection(workdir / f"submissions_{scale}.sqlite")
+    record_submissions(conn, submissions)
+    filters = {"sex": ["Female"], "site": SITES[:2]}
+
+    def write_batch():
+        # One writer batch, as committed by the background queue
+        write_conn = get_connection(workdir / "submissions_write.sqlite")
+        try:
+            record_submissions(write_conn, submissions[:100])
+        finally:
+            write_conn.close()
+
+    return {
+        "write_batch_100": write_batch,
+        "dashboard_cubes": lambda: cube_summary(conn, "dgai", "overall", ["age_band"], filters),
+        "dashboard_raw_scan": lambda: conn.execute(RAW_SQL, SITES[:2]).fetchall(),
+    }
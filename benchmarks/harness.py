@@ -0,0 +1,46 @@
+# Shared helpers for the benchmark suite: synthetic scale-ups and measurement.
+import gc
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def scale_frame(df, factor):
+    """
+    Synthetic scale-up: repeat a table `factor` times.
+    """
+    if factor == 1:
+        return df.copy()
+    return pd.concat([df] * factor, ignore_index=True)
+
+
+def measure(func, repeat=3):
+    """
+    Time a callable and record its peak Python memory.
+    Memory is traced in a separate first run so tracemalloc overhead does not skew the timings.
+    Args:
+        func (callable): Benchmark body, called with no arguments.
+        repeat (int): Number of timed runs.
+    Returns:
+        dict: median_s, min_s and peak_mb.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "peak_mb": peak / 2**20}
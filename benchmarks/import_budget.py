@@ -0,0 +1,99 @@
+# Cold-import budget check for the Streamlit pages.
+# Each page's module-level imports run in a fresh interpreter, after streamlit, pandas and numpy
+# (which the server has loaded already), so only the page's own import cost is timed.
+# Exits with status 1 when a page exceeds its budget:
+#   python benchmarks/import_budget.py --budget 0.5
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES_DIR = ROOT / "pages"
+
+# Seconds allowed for a page's cold import
+DEFAULT_BUDGET = 0.5
+
+# Modules the server imports before any page runs
+BASELINE_MODULES = ["streamlit", "pandas", "numpy"]
+
+CHILD_SCRIPT = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+for name in {baseline!r}:
+    importlib.import_module(name)
+code = compile({source!r}, {filename!r}, "exec")
+start = time.perf_counter()
+exec(code, {{"__name__": "import_budget", "__file__": {filename!r}}})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": len(sys.modules)}}))
+"""
+
+
+def extract_import_statements(path):
+    """
+    Collect a page's module-level import statements and lazy_import assignments.
+    Args:
+        path (Path): Page script.
+    Returns:
+        str: Source code containing only those statements.
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    statements = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            statements.append(node)
+        elif (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Call)
+            and getattr(node.value.func, "id", None) == "lazy_import"
+        ):
+            statements.append(node)
+    return ast.unparse(ast.Module(body=statements, type_ignores=[]))
+
+
+def measure_page(path):
+    """
+    Time a page's cold import in a fresh interpreter.
+    Returns:
+        dict: {"seconds": float, "modules": int}, or {"error": str} if an import failed.
+    """
+    script = CHILD_SCRIPT.format(
+        root=str(ROOT), baseline=BASELINE_MODULES, source=extract_import_statements(path), filename=str(path)
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a page's cold import exceeds the time budget.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Seconds allowed per page")
+    parser.add_argument("pages", nargs="*", help="Page files to check (default: every page)")
+    args = parser.parse_args()
+
+    pages = [Path(p) for p in args.pages] or sorted(PAGES_DIR.glob("*.py"))
+    over_budget = []
+    for page in pages:
+        result = measure_page(page)
+        if "error" in result:
+            status = f"ERROR  {result['error']}"
+            over_budget.append(page.name)
+        else:
+            ok = result["seconds"] <= args.budget
+            status = f"{'ok    ' if ok else 'SLOW  '}{result['seconds'] * 1000:8.1f} ms"
+            if not ok:
+                over_budget.append(page.name)
+        print(f"{status}  {page.name}")
+
+    if over_budget:
+        print(f"\n{len(over_budget)} page(s) over the {args.budget:.2f} s budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print(f"\nAll {len(pages)} pages within the {args.budget:.2f} s budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Memory-leak regression check for the body composition charts.
+# Simulates page reruns with changing inputs, so the render cache both hits and evicts, and checks that
+# resident memory stays flat once warmed up. Exits with status 1 when it grows by more than the limit:
+#   python benchmarks/render_leak_check.py --reruns 1000 --max-growth-mb 25
+import argparse
+import gc
+import resource
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Reruns before the baseline reading, so font caches and imports are not counted as growth
+WARMUP_RERUNS = 50
+DEFAULT_RERUNS = 1000
+DEFAULT_MAX_GROWTH_MB = 25
+
+
+def rss_mb():
+    """
+    Current resident set size; peak RSS where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def rerun(i):
+    # One page rerun: the inputs a user might step through with the number widgets
+    from panini.body_composition import chart_values, compute_body_composition
+    from panini.charts import render_body_composition_panels
+
+    weight = 50 + (i % 300) * 0.2
+    sex = "Male" if i % 2 else "Female"
+    metrics = compute_body_composition(weight, 170.0, 30, sex, "3-Site", {"Chest": 10.0, "Abdomen": 12.0, "Thigh": 14.0}, 1.05)
+    categories, values = chart_values(metrics)
+    return render_body_composition_panels(tuple(categories), tuple(values), metrics["fat_mass"], metrics["fat_free_mass"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that chart rendering does not leak memory across reruns.")
+    parser.add_argument("--reruns", type=int, default=DEFAULT_RERUNS, help="Simulated page reruns")
+    parser.add_argument("--max-growth-mb", type=float, default=DEFAULT_MAX_GROWTH_MB, help="Allowed RSS growth")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    for i in range(WARMUP_RERUNS):
+        rerun(i)
+    gc.collect()
+    baseline = rss_mb()
+
+    for i in range(WARMUP_RERUNS, args.reruns):
+        rerun(i)
+        if (i + 1) % 250 == 0:
+            print(f"{i + 1:>6} reruns: {rss_mb():8.1f} MB", flush=True)
+    gc.collect()
+    final = rss_mb()
+
+    import matplotlib.pyplot as plt
+
+    print(f"RSS after warm-up {baseline:.1f} MB, after {args.reruns} reruns {final:.1f} MB ({final - baseline:+.1f} MB)")
+    print(f"Open pyplot figures: {len(plt.get_fignums())}")
+    if final - baseline > args.max_growth_mb or plt.get_fignums():
+        print(f"FAIL: memory grew by more than {args.max_growth_mb} MB or figures were left open")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
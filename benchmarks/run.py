@@ -0,0 +1,112 @@
+# Benchmark suite for the data-heavy pages' core functions, run headless (no Streamlit server).
+#   python benchmarks/run.py                          # real data plus 10x and 100x scale-ups
+#   python benchmarks/run.py --only diet_chart --scales 1 10
+#   python benchmarks/run.py --save baseline.json
+#   python benchmarks/run.py --compare baseline.json  # flag runs slower or larger than the baseline
+import argparse
+import importlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from harness import ROOT, measure
+
+SUITES = ["diet_chart", "recipes", "indb", "questionnaires", "reports", "body_composition", "submissions"]
+DEFAULT_SCALES = [1, 10, 100]
+
+# Relative slowdown (or memory growth) against the baseline reported as a regression
+REGRESSION_THRESHOLD = 0.2
+
+
+def run_suite(suite, scales, repeat, workdir):
+    """
+    Run every benchmark of one suite at each scale.
+    Returns:
+        dict: "<suite>.<case>@<scale>x" -> measurement dict, or {"error": str}.
+    """
+    module = importlib.import_module(f"bench_{suite}")
+    results = {}
+    for scale in scales:
+        try:
+            cases = module.benchmarks(scale, workdir)
+        except Exception as e:
+            results[f"{suite}@{scale}x"] = {"error": f"setup failed: {e}"}
+            continue
+        for name, func in cases.items():
+            key = f"{suite}.{name}@{scale}x"
+            try:
+                results[key] = measure(func, repeat)
+            except Exception as e:
+                results[key] = {"error": str(e)}
+            print(format_row(key, results[key]), flush=True)
+    return results
+
+
+def format_row(key, result, baseline=None):
+    if "error" in result:
+        return f"{key:<55} ERROR {result['error']}"
+    row = f"{key:<55} {result['median_s'] * 1000:10.1f} ms {result['peak_mb']:9.1f} MB"
+    if baseline and "error" not in baseline:
+        row += f"   time {change(result['median_s'], baseline['median_s']):+6.0%}"
+        row += f"   mem {change(result['peak_mb'], baseline['peak_mb']):+6.0%}"
+    return row
+
+
+def change(current, previous):
+    return (current - previous) / previous if previous else 0.0
+
+
+def find_regressions(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    List benchmarks whose median time or peak memory grew by more than threshold.
+    """
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if not previous or "error" in result or "error" in previous:
+            continue
+        if change(result["median_s"], previous["median_s"]) > threshold:
+            regressions.append(f"{key}: time {change(result['median_s'], previous['median_s']):+.0%}")
+        if change(result["peak_mb"], previous["peak_mb"]) > threshold:
+            regressions.append(f"{key}: memory {change(result['peak_mb'], previous['peak_mb']):+.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the core functions of the data-heavy pages.")
+    parser.add_argument("--only", nargs="+", choices=SUITES, help="Suites to run (default: all)")
+    parser.add_argument("--scales", nargs="+", type=int, default=DEFAULT_SCALES, help="Data scale factors")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file from an earlier --save")
+    args = parser.parse_args()
+
+    # Pages open their fonts and data with paths relative to the repository root
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for suite in args.only or SUITES:
+            results.update(run_suite(suite, args.scales, args.repeat, Path(workdir)))
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\nCompared with {args.compare}:")
+        for key, result in results.items():
+            print(format_row(key, result, baseline.get(key)))
+        regressions = find_regressions(results, baseline)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {REGRESSION_THRESHOLD:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
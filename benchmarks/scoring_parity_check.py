@@ -0,0 +1,92 @@
+# Consistency check between the two questionnaire scoring paths: Instrument.score (one submission, used by
+# the questionnaire pages) and Instrument.score_many (a whole table, used by bulk scoring). Both feed the
+# submission store, so they must give the same section scores, overall, badge and message for the same
+# answers. Scores random rows, including blank sections, blank rows and answers that are not options, and
+# exits with status 1 on the first mismatches:
+#   python benchmarks/scoring_parity_check.py --rows 2000
+import argparse
+import math
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_ROWS = 1000
+# Mismatches printed per instrument before giving up on it
+MAX_REPORTED = 5
+# Not an option of any instrument; both paths must treat it as unanswered
+INVALID_ANSWER = "x"
+
+
+def random_answers(instrument, rng):
+    # Each section is left blank now and then, so empty sections and fully blank rows are covered
+    choices = instrument.values + [None, INVALID_ANSWER]
+    answers = {}
+    for section in instrument.sections:
+        blank = rng.random() < 0.2
+        for item in section["items"]:
+            answers[item["id"]] = None if blank else rng.choice(choices)
+    return answers
+
+
+def same(single, bulk):
+    # score() uses None where score_many() has NaN
+    if single is None or bulk is None or (isinstance(bulk, float) and math.isnan(bulk)):
+        return single is None and (bulk is None or (isinstance(bulk, float) and math.isnan(bulk)))
+    if isinstance(single, str) or isinstance(bulk, str):
+        return single == bulk
+    return math.isclose(single, bulk, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def check_instrument(name, rows, rng):
+    """
+    Returns:
+        list: Descriptions of the rows where the two scoring paths disagree.
+    """
+    import pandas as pd
+
+    from panini.questionnaire_engine import load_instrument
+
+    instrument = load_instrument(name)
+    submissions = [random_answers(instrument, rng) for _ in range(rows)]
+    submissions.append({})
+    bulk = instrument.score_many(pd.DataFrame(submissions, columns=instrument.item_ids))
+
+    mismatches = []
+    for (index, row), answers in zip(bulk.iterrows(), submissions):
+        section_scores, overall, badge, message = instrument.score(answers)
+        expected = dict(section_scores, overall=overall, badge=badge, message=message)
+        differing = [column for column, value in expected.items() if not same(value, row[column])]
+        if differing:
+            mismatches.append(
+                f"{name} row {index}: "
+                + ", ".join(f"{column} score={expected[column]!r} score_many={row[column]!r}" for column in differing)
+            )
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that score() and score_many() agree on every instrument.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Random submissions per instrument")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from panini.questionnaire_engine import list_instruments
+
+    rng = random.Random(args.seed)
+    failed = False
+    for name in list_instruments():
+        mismatches = check_instrument(name, args.rows, rng)
+        print(f"{name:<22} {args.rows + 1} rows, {len(mismatches)} mismatches", flush=True)
+        for mismatch in mismatches[:MAX_REPORTED]:
+            print(f"  {mismatch}")
+        failed = failed or bool(mismatches)
+    if failed:
+        print("FAIL: score() and score_many() disagree")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# Append-only store of body composition measurements, so follow-up visits can show a patient's trend.
+# Rows are never updated or deleted (triggers enforce it); a correction is a new measurement.
+# Trend queries use the (patient_id, measured_at) index and SQLite window functions for rolling averages
+# and change since the first visit.
+import json
+import sqlite3
+from datetime import datetime
+
+from config import BODY_COMPOSITION_DB
+from lazy_imports import lazy_import
+from panini.body_composition import SKINFOLD_SITES
+
+pd = lazy_import("pandas")
+
+# Stored metric columns, as returned by panini.body_composition.compute_body_composition
+METRIC_COLUMNS = [
+    "weight",
+    "height",
+    "bmi",
+    "fat_mass",
+    "fat_free_mass",
+    "ffmi",
+    "body_fat_percentage",
+    "siri_body_fat",
+    "body_density",
+    "jackson_pollock_body_fat",
+    "sum_skinfolds",
+]
+
+# Skinfold columns of a cohort table, stored with each row
+SKINFOLD_KEYS = {site.lower() for site in SKINFOLD_SITES["7-Site"]["Male"]}
+
+# Metrics offered for trends
+TREND_METRICS = ["weight", "bmi", "fat_mass", "fat_free_mass", "ffmi", "body_fat_percentage", "jackson_pollock_body_fat"]
+
+# Visits averaged by the rolling mean
+DEFAULT_WINDOW = 3
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    patient_id TEXT NOT NULL,
+    measured_at TEXT NOT NULL,
+    age REAL,
+    sex TEXT,
+    method TEXT,
+    {", ".join(f"{column} REAL" for column in METRIC_COLUMNS)},
+    skinfolds TEXT,
+    recorded_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_measurements_patient_time ON measurements (patient_id, measured_at);
+
+CREATE TRIGGER IF NOT EXISTS measurements_no_update BEFORE UPDATE ON measurements
+BEGIN
+    SELECT RAISE(ABORT, 'measurements are append-only');
+END;
+
+CREATE TRIGGER IF NOT EXISTS measurements_no_delete BEFORE DELETE ON measurements
+BEGIN
+    SELECT RAISE(ABORT, 'measurements are append-only');
+END;
+"""
+
+INSERT_SQL = (
+    f"INSERT INTO measurements (patient_id, measured_at, age, sex, method, {', '.join(METRIC_COLUMNS)}, skinfolds, "
+    f"recorded_at) VALUES ({', '.join('?' * (len(METRIC_COLUMNS) + 7))})"
+)
+
+
+def get_connection(db_path=BODY_COMPOSITION_DB):
+    """
+    Open the measurement store, creating tables if needed.
+    Args:
+        db_path (Path): Location of the SQLite database file.
+    Returns:
+        sqlite3.Connection: Open connection.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _measurement_row(patient_id, measured_at, age, sex, method, metrics, skinfolds, recorded_at):
+    if hasattr(measured_at, "isoformat"):
+        measured_at = measured_at.isoformat()
+    values = []
+    for column in METRIC_COLUMNS:
+        value = metrics.get(column)
+        # NaN (cohort tables) is stored as NULL
+        values.append(None if value is None or value != value else float(value))
+    return (
+        str(patient_id), measured_at, None if age is None or age != age else float(age), sex, method, *values,
+        json.dumps(skinfolds) if skinfolds else None, recorded_at,
+    )
+
+
+def record_measurement(conn, patient_id, metrics, age, sex, method="None", skinfolds=None, measured_at=None):
+    """
+    Append one visit.
+    Args:
+        conn (sqlite3.Connection): Open store connection.
+        patient_id (str): Patient identifier.
+        metrics (dict): Output of compute_body_composition.
+        age (float): Age in years at the visit.
+        sex (str): "Male" or "Female".
+        method (str): Jackson-Pollock method used, "None", "3-Site" or "7-Site".
+        skinfolds (dict, optional): Skinfold site -> thickness in mm.
+        measured_at (date, datetime or str, optional): Visit date; defaults to now.
+    """
+    now = datetime.now().isoformat(timespec="seconds")
+    with conn:
+        conn.execute(INSERT_SQL, _measurement_row(
+            patient_id, measured_at or now, age, sex, method, metrics, skinfolds, now
+        ))
+
+
+def parse_visit_dates(values):
+    """
+    Parse a column of visit dates as written in cohort sheets: ISO dates (2024-02-01) first, then
+    day-first dates (15/01/2024).
+    Args:
+        values (pd.Series): Raw date cells.
+    Returns:
+        pd.Series: Timestamps, NaT for blank or unreadable cells.
+    """
+    dates = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    unparsed = dates.isna() & values.notna()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(values[unparsed].astype(str), errors="coerce", dayfirst=True)
+    return dates
+
+
+def record_cohort(conn, results, patient_column, measured_at=None, date_column=None):
+    """
+    Append every row of a cohort results table (panini.cohort.compute_cohort_body_composition).
+    Args:
+        results (pd.DataFrame): Cohort results.
+        patient_column (str): Column with the patient identifiers.
+        measured_at (date or str, optional): Visit date for rows without one; defaults to now.
+        date_column (str, optional): Column with each row's visit date.
+    Returns:
+        tuple: (number of measurements stored, list of (row number, reason) for rows that were not stored,
+        i.e. rows without a patient identifier or with an unreadable visit date).
+    Sex codes ("M"/"F", 1/0) are stored as "Male"/"Female", as record_measurement stores them; unrecognised
+    codes are stored as NULL.
+    """
+    # Imported here: panini.cohort pulls in numpy and pandas, which single measurements do not need
+    from panini.cohort import sex_codes
+
+    now = datetime.now().isoformat(timespec="seconds")
+    default_visit = measured_at or now
+    if hasattr(default_visit, "isoformat"):
+        default_visit = default_visit.isoformat()
+    if date_column:
+        visits = parse_visit_dates(results[date_column]).tolist()
+        raw_visits = results[date_column].tolist()
+    else:
+        visits = raw_visits = [None] * len(results)
+    if "sex" in results.columns:
+        sexes = sex_codes(results["sex"]).map({1.0: "Male", 0.0: "Female"}).tolist()
+    else:
+        sexes = [None] * len(results)
+    rows = []
+    skipped = []
+    records = zip(results.to_dict("records"), visits, raw_visits, sexes)
+    for number, (record, visit, raw_visit, sex) in enumerate(records, 1):
+        patient_id = record.get(patient_column)
+        if patient_id is None or patient_id != patient_id or not str(patient_id).strip():
+            skipped.append((number, "no patient identifier"))
+            continue
+        if visit is not None and visit == visit:
+            visit = visit.isoformat()
+        elif raw_visit is None or raw_visit != raw_visit or not str(raw_visit).strip():
+            visit = default_visit
+        else:
+            skipped.append((number, f"unreadable visit date {raw_visit!r}"))
+            continue
+        skinfolds = {key: value for key, value in record.items() if key in SKINFOLD_KEYS and value == value}
+        rows.append(_measurement_row(
+            patient_id, visit, record.get("age"), sex if sex == sex else None,
+            record.get("jackson_pollock_method", "None"), record, skinfolds, now,
+        ))
+    with conn:
+        conn.executemany(INSERT_SQL, rows)
+    return len(rows), skipped
+
+
+def list_patients(conn):
+    """
+    Returns:
+        list: (patient_id, number of visits, first visit, last visit) tuples, most recent first.
+    """
+    return conn.execute(
+        "SELECT patient_id, COUNT(*), MIN(measured_at), MAX(measured_at) FROM measurements "
+        "GROUP BY patient_id ORDER BY MAX(measured_at) DESC"
+    ).fetchall()
+
+
+def patient_trend(conn, patient_id, metrics=TREND_METRICS, window=DEFAULT_WINDOW):
+    """
+    A patient's visits in date order, with a rolling average and the change since the first visit
+    for each metric.
+    Args:
+        conn (sqlite3.Connection): Open store connection.
+        patient_id (str): Patient identifier.
+        metrics (list): Metric columns, from METRIC_COLUMNS.
+        window (int): Visits in the rolling average.
+    Returns:
+        list: One dict per visit with measured_at, method, each metric, <metric>_rolling and <metric>_change.
+    """
+    unknown = set(metrics) - set(METRIC_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown metric(s): {', '.join(sorted(unknown))}")
+    ordered = "PARTITION BY patient_id ORDER BY measured_at, id"
+    columns = []
+    for metric in metrics:
+        columns.append(metric)
+        columns.append(
+            f"AVG({metric}) OVER ({ordered} ROWS BETWEEN {int(window) - 1} PRECEDING AND CURRENT ROW) AS {metric}_rolling"
+        )
+        columns.append(f"{metric} - FIRST_VALUE({metric}) OVER ({ordered}) AS {metric}_change")
+    cursor = conn.execute(
+        f"SELECT measured_at, method, {', '.join(columns)} FROM measurements "
+        f"WHERE patient_id = ? ORDER BY measured_at, id",
+        (str(patient_id),),
+    )
+    names = [description[0] for description in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
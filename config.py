@@ -20,3 +20,48 @@ FAVORITES_FILE = BASE_DIR / "data" / "favorites.json"
 # Ensure necessary directories exist
 os.makedirs(PDF_FOLDER, exist_ok=True)
 os.makedirs(FAVORITES_FILE.parent, exist_ok=True)
+
+# Local caches for API results (PubMed, CrossRef, RxNav, OpenFoodFacts)
+CACHE_DIR = BASE_DIR / "data" / "cache"
+PUBMED_CACHE_DB = CACHE_DIR / "pubmed.sqlite"
+API_CACHE_DB = CACHE_DIR / "api_cache.sqlite"
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# NCBI E-utilities key (optional, raises the rate limit from 3 to 10 requests/second)
+NCBI_API_KEY = os.environ.get("NCBI_API_KEY")
+
+# Contact address sent to CrossRef (mailto: in the User-Agent), required for its "polite" pool
+CROSSREF_MAILTO = os.environ.get("PANINI_CROSSREF_MAILTO")
+
+# Offline drug interaction knowledge base, built with `python interaction_kb.py ...`
+INTERACTION_KB_DB = BASE_DIR / "data" / "interaction_kb.sqlite"
+DRUG_FOOD_RULES_FILE = BASE_DIR / "data" / "drug_food_rules.json"
+
+# Packaged food products keyed by barcode (OpenFoodFacts lookups and dump imports)
+PRODUCT_DB = BASE_DIR / "data" / "products.sqlite"
+# OpenFoodFacts allows 100 product reads per minute per client
+OPENFOODFACTS_REQUESTS_PER_MINUTE = float(os.environ.get("PANINI_OPENFOODFACTS_RPM", 100))
+
+# Indian Nutrient Databank (INDB) food composition table
+INDB_FILE = BASE_DIR / "data" / "INDB_my.csv"
+
+# Hot-path timing spans (tracing.py); the metrics port, if set, serves them in Prometheus format on /metrics
+TRACING_ENABLED = os.environ.get("PANINI_TRACING", "").lower() in ("1", "true", "yes")
+METRICS_PORT = int(os.environ["PANINI_METRICS_PORT"]) if os.environ.get("PANINI_METRICS_PORT") else None
+# /metrics is unauthenticated; bind another interface (e.g. 0.0.0.0) only behind a trusted network
+METRICS_HOST = os.environ.get("PANINI_METRICS_HOST", "127.0.0.1")
+
+# Longitudinal body composition measurements (append-only)
+BODY_COMPOSITION_DB = BASE_DIR / "data" / "body_composition.sqlite"
+
+# Questionnaire submissions (per-instrument score tables and a normalized answers table)
+SUBMISSIONS_DB = BASE_DIR / "data" / "submissions.sqlite"
+# Submissions the background writer could not store, one JSON object per line
+SUBMISSIONS_DEAD_LETTER = BASE_DIR / "data" / "submissions_failed.jsonl"
+
+# Background report generation (report_jobs.py): job table, finished files and worker processes
+REPORT_JOBS_DB = BASE_DIR / "data" / "report_jobs.sqlite"
+REPORT_JOBS_DIR = BASE_DIR / "data" / "reports"
+REPORT_WORKERS = int(os.environ.get("PANINI_REPORT_WORKERS", min(4, os.cpu_count() or 1)))
+REPORT_RETENTION_HOURS = 24
+os.makedirs(REPORT_JOBS_DIR, exist_ok=True)
@@ -0,0 +1,20 @@
+import streamlit as st
+
+from tracing import span
+from panini.data import DATASETS, RECIPE_CHUNK_COUNT, dataset_path, read_dataset
+
+__all__ = ["DATASETS", "RECIPE_CHUNK_COUNT", "dataset_path", "load_dataset"]
+
+
+@st.cache_data(show_spinner=False)
+def load_dataset(name):
+    """
+    Load a registered dataset. The parsed table is cached for every session, and each caller gets its own copy.
+    Pages load their tables through here so the warm-up thread can parse them before the first request.
+    Args:
+        name (str): Key of panini.data.DATASETS.
+    Returns:
+        pd.DataFrame: The dataset.
+    """
+    with span("load_dataset"):
+        return read_dataset(name)
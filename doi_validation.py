@@ -0,0 +1,136 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from api_cache import cache_get_many, cache_set_many, get_connection
+from config import CROSSREF_MAILTO
+from http_utils import DEFAULT_TIMEOUT, RateLimiter, create_session
+
+CROSSREF_WORKS_URL = "https://api.crossref.org/works/"
+JCEM_TITLE = "The Journal of Clinical Endocrinology & Metabolism"
+
+# CrossRef serves clients that give a contact address (PANINI_CROSSREF_MAILTO) from its "polite" pool
+CROSSREF_USER_AGENT = "Panini-Nutrition/1.0 (https://panini.streamlit.app/{})".format(
+    f"; mailto:{CROSSREF_MAILTO}" if CROSSREF_MAILTO else ""
+)
+CROSSREF_LIMITER = RateLimiter(10)
+CACHE_NAMESPACE = "crossref"
+
+# DOIs CrossRef does not know (not registered yet, or mistyped) are looked up again after this many days
+MISSING_RETRY_DAYS = 7
+
+DOI_PATTERN = re.compile(r"10\.\d{4,9}/[^\s,;\"'<>]+")
+
+
+def normalize_doi(doi):
+    """
+    Strip resolver prefixes and whitespace from a DOI and lower-case it.
+    """
+    doi = doi.strip()
+    doi = re.sub(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", "", doi, flags=re.IGNORECASE)
+    return doi.rstrip(".").lower()
+
+
+def parse_doi_list(text):
+    """
+    Extract DOIs from pasted text (one per line, comma-separated or embedded in references).
+    Args:
+        text (str): Raw text.
+    Returns:
+        list: Unique normalised DOIs in input order.
+    """
+    return list(dict.fromkeys(normalize_doi(match) for match in DOI_PATTERN.findall(text)))
+
+
+def fetch_crossref_metadata(session, doi):
+    """
+    Fetch CrossRef metadata for one DOI.
+    Returns:
+        dict or None: The CrossRef "message" object, or None if the DOI is unknown.
+    """
+    CROSSREF_LIMITER.wait()
+    # DOI suffixes may contain "#", "?" or "%", which would otherwise end or alter the URL path
+    response = session.get(CROSSREF_WORKS_URL + quote(doi, safe="/"), timeout=DEFAULT_TIMEOUT)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    message = response.json().get("message", {})
+    # Keep only the fields used for validation so the cache stays small
+    return {
+        "container-title": message.get("container-title", []),
+        "publisher": message.get("publisher", ""),
+        "title": message.get("title", []),
+        "issued": message.get("issued", {}),
+    }
+
+
+def get_crossref_metadata(dois, max_workers=8):
+    """
+    Get CrossRef metadata for many DOIs, from the disk cache first and concurrently for misses.
+    Args:
+        dois (list): Normalised DOIs.
+        max_workers (int): Number of concurrent CrossRef requests.
+    Returns:
+        tuple: (mapping of DOI -> metadata or None if not registered, list of DOIs that failed).
+    """
+    conn = get_connection()
+    try:
+        metadata = cache_get_many(conn, CACHE_NAMESPACE, dois, missing_ttl_days=MISSING_RETRY_DAYS)
+        pending = [doi for doi in dois if doi not in metadata]
+        fetched = {}
+        failed = []
+        if pending:
+            session = create_session(pool_size=max_workers, user_agent=CROSSREF_USER_AGENT)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {doi: executor.submit(fetch_crossref_metadata, session, doi) for doi in pending}
+                for doi, future in futures.items():
+                    try:
+                        fetched[doi] = future.result()
+                    except Exception:
+                        failed.append(doi)
+            cache_set_many(conn, CACHE_NAMESPACE, fetched)
+        metadata.update(fetched)
+    finally:
+        conn.close()
+    return metadata, failed
+
+
+def summarize_metadata(doi, metadata):
+    """
+    Build a result row for one DOI.
+    Args:
+        doi (str): Normalised DOI.
+        metadata (dict or None): Metadata from get_crossref_metadata.
+    Returns:
+        dict: DOI, status, journal, publisher and whether it belongs to JCEM.
+    """
+    if metadata is None:
+        return {"DOI": doi, "Status": "Not Found", "Journal": "N/A", "Publisher": "N/A", "JCEM": False}
+    container_title = metadata.get("container-title", [])
+    return {
+        "DOI": doi,
+        "Status": "Valid",
+        "Journal": container_title[0] if container_title else "N/A",
+        "Publisher": metadata.get("publisher") or "N/A",
+        "JCEM": JCEM_TITLE in container_title,
+    }
+
+
+def validate_dois(dois, max_workers=8):
+    """
+    Validate many DOIs against CrossRef.
+    Args:
+        dois (list): DOIs in any common format.
+        max_workers (int): Number of concurrent CrossRef requests.
+    Returns:
+        list: One result row per DOI; DOIs that could not be checked have Status "Error".
+    """
+    dois = list(dict.fromkeys(normalize_doi(doi) for doi in dois if doi.strip()))
+    metadata, failed = get_crossref_metadata(dois, max_workers=max_workers)
+    rows = []
+    for doi in dois:
+        if doi in failed:
+            rows.append({"DOI": doi, "Status": "Error", "Journal": "N/A", "Publisher": "N/A", "JCEM": False})
+        else:
+            rows.append(summarize_metadata(doi, metadata.get(doi)))
+    return rows
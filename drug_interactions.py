@@ -0,0 +1,193 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from api_cache import cache_get_many, cache_set_many, get_connection
+from http_utils import DEFAULT_TIMEOUT, create_session
+import interaction_kb
+
+# RxNorm and OpenFDA API URLs
+RXNORM_BASE_URL = "https://rxnav.nlm.nih.gov/REST"
+OPENFDA_URL = "https://api.fda.gov/drug/label.json"
+
+RXCUI_NAMESPACE = "rxcui"
+PAIR_NAMESPACE = "rxnav_pair"
+WARNINGS_NAMESPACE = "openfda_warnings"
+
+# Drug names RxNav does not know (new, or misspelled) and drugs without an OpenFDA label are looked up
+# again after this many days
+MISSING_RETRY_DAYS = 7
+
+
+def normalize_drug_name(drug_name):
+    """
+    Normalise a drug name for cache keys.
+    """
+    return " ".join(drug_name.lower().split())
+
+
+def pair_key(rxcui1, rxcui2):
+    """
+    Order-independent cache key for a pair of RxCUIs.
+    """
+    return "+".join(sorted((rxcui1, rxcui2)))
+
+
+# Function to fetch RxCUI (RxNorm Concept Unique Identifier) for a drug
+def get_rxcui(session, drug_name):
+    response = session.get(f"{RXNORM_BASE_URL}/rxcui.json", params={"name": drug_name}, timeout=DEFAULT_TIMEOUT)
+    response.raise_for_status()
+    return (response.json().get("idGroup", {}).get("rxnormId") or [None])[0]
+
+
+# Function to check interactions between drugs using RxNorm
+def get_interaction_groups(session, rxcuis):
+    response = session.get(
+        f"{RXNORM_BASE_URL}/interaction/list.json", params={"rxcuis": "+".join(rxcuis)}, timeout=DEFAULT_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json().get("fullInteractionTypeGroup", [])
+
+
+# Fallback: Fetch drug warnings using OpenFDA
+def get_drug_warnings(session, drug_name):
+    response = session.get(
+        OPENFDA_URL, params={"search": f"active_ingredient:{drug_name}", "limit": 1}, timeout=DEFAULT_TIMEOUT
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    results = response.json().get("results", [])
+    if results:
+        return results[0].get("warnings", ["No warnings found"])
+    return None
+
+
+def split_interaction_pairs(interaction_groups):
+    """
+    Flatten RxNav interaction groups into per-pair records.
+    Args:
+        interaction_groups (list): "fullInteractionTypeGroup" from the RxNav response.
+    Returns:
+        dict: Mapping of pair key -> list of {"drugs", "rxcuis", "description", "severity", "source"}.
+    """
+    pairs = {}
+    for group in interaction_groups:
+        source = group.get("sourceName", "")
+        for interaction_type in group.get("fullInteractionType", []):
+            for pair in interaction_type.get("interactionPair", []):
+                concepts = pair.get("interactionConcept", [])
+                if len(concepts) != 2:
+                    continue
+                items = [concept.get("minConceptItem", {}) for concept in concepts]
+                rxcuis = [item.get("rxcui", "") for item in items]
+                pairs.setdefault(pair_key(*rxcuis), []).append(
+                    {
+                        "drugs": [item.get("name", "") for item in items],
+                        "rxcuis": rxcuis,
+                        "description": pair.get("description", "No description"),
+                        "severity": pair.get("severity", "N/A"),
+                        "source": source,
+                    }
+                )
+    return pairs
+
+
+def _cached_fetch(conn, namespace, keys, fetch, max_workers):
+    """
+    Return cached values for keys and fetch the misses concurrently.
+    Failed fetches are left out of both the result and the cache; cached "not found" (None) answers
+    older than MISSING_RETRY_DAYS count as misses.
+    """
+    values = cache_get_many(conn, namespace, keys, missing_ttl_days=MISSING_RETRY_DAYS)
+    pending = [key for key in keys if key not in values]
+    fetched = {}
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {key: executor.submit(fetch, key) for key in pending}
+            for key, future in futures.items():
+                try:
+                    fetched[key] = future.result()
+                except Exception:
+                    continue
+        cache_set_many(conn, namespace, fetched)
+    values.update(fetched)
+    return values
+
+
+def run_interaction_check(drug_names, max_workers=8):
+    """
+    Resolve drugs to RxCUIs, look up pairwise interactions and fall back to OpenFDA warnings.
+    Each step is answered from the offline knowledge base (interaction_kb) first. Remaining misses
+    go through the API cache, so only unseen drugs and pairs reach the network, concurrently.
+    Args:
+        drug_names (list): Drug names as entered by the user.
+        max_workers (int): Number of concurrent API requests.
+    Returns:
+        dict: {"drugs", "rxcuis" (name -> RxCUI), "unresolved", "interactions", "warnings",
+        "food_rules", "lookup_failed" (some pairs could not be checked, so interactions is incomplete)}.
+    """
+    drug_names = list(dict.fromkeys(name.strip() for name in drug_names if name.strip()))
+    session = create_session(pool_size=max_workers)
+    kb = interaction_kb.get_connection()
+    conn = get_connection()
+    try:
+        rxcuis = interaction_kb.lookup_rxcuis(kb, drug_names)
+        names = {name: normalize_drug_name(name) for name in drug_names if name not in rxcuis}
+        rxcui_by_key = _cached_fetch(
+            conn, RXCUI_NAMESPACE, list(dict.fromkeys(names.values())),
+            lambda key: get_rxcui(session, key), max_workers,
+        )
+        rxcuis.update({name: rxcui_by_key.get(key) for name, key in names.items()})
+        rxcuis = {name: rxcuis.get(name) for name in drug_names}
+        unresolved = [name for name, rxcui in rxcuis.items() if not rxcui]
+        resolved = list(dict.fromkeys(rxcui for rxcui in rxcuis.values() if rxcui))
+
+        # Pairwise interactions: local index first, then one RxNav call for every remaining pair
+        wanted_pairs = [interaction_kb.ordered_pair(a, b) for a, b in itertools.combinations(resolved, 2)]
+        pair_results = {
+            pair_key(*pair): records for pair, records in interaction_kb.lookup_pairs(kb, wanted_pairs).items()
+        }
+        wanted_keys = [pair_key(*pair) for pair in wanted_pairs]
+        remaining = [key for key in wanted_keys if key not in pair_results]
+        pair_results.update(cache_get_many(conn, PAIR_NAMESPACE, remaining))
+        missing_pairs = [key for key in remaining if key not in pair_results]
+        lookup_failed = False
+        if missing_pairs:
+            missing_rxcuis = sorted({rxcui for key in missing_pairs for rxcui in key.split("+")})
+            try:
+                fetched_pairs = split_interaction_pairs(get_interaction_groups(session, missing_rxcuis))
+                fetched = {key: fetched_pairs.get(key, []) for key in missing_pairs}
+                cache_set_many(conn, PAIR_NAMESPACE, fetched)
+                pair_results.update(fetched)
+            except Exception:
+                lookup_failed = True
+        interactions = [record for key in wanted_keys for record in pair_results.get(key, [])]
+
+        # Fallback to label warnings if no interactions found (or none could be checked): imported labels,
+        # then OpenFDA. Callers must not read empty interactions as "none" when lookup_failed is set.
+        warnings = {}
+        if not interactions:
+            local_warnings = interaction_kb.lookup_warnings(kb, resolved)
+            warnings = {name: local_warnings[rxcui] for name, rxcui in rxcuis.items() if rxcui in local_warnings}
+            names = {name: normalize_drug_name(name) for name in drug_names if name not in warnings}
+            warnings_by_key = _cached_fetch(
+                conn, WARNINGS_NAMESPACE, list(dict.fromkeys(names.values())),
+                lambda key: get_drug_warnings(session, key), max_workers,
+            )
+            warnings.update({name: warnings_by_key.get(key) for name, key in names.items()})
+            warnings = {name: warnings.get(name) for name in drug_names}
+
+        food_rules = interaction_kb.load_drug_food_rules(kb, rxcuis)
+    finally:
+        conn.close()
+        kb.close()
+
+    return {
+        "drugs": drug_names,
+        "rxcuis": rxcuis,
+        "unresolved": unresolved,
+        "interactions": interactions,
+        "warnings": warnings,
+        "food_rules": food_rules,
+        "lookup_failed": lookup_failed,
+    }
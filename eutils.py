@@ -0,0 +1,66 @@
+from config import NCBI_API_KEY
+from http_utils import DEFAULT_TIMEOUT, RateLimiter
+
+# NCBI E-utilities endpoints
+ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+ESUMMARY_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+
+# ESearch returns at most 10,000 PMIDs per query
+MAX_RETMAX = 10000
+
+# Number of PMIDs sent per ESummary/EFetch request
+SUMMARY_BATCH_SIZE = 200
+
+# NCBI allows 3 requests/second without an API key and 10 with one
+NCBI_LIMITER = RateLimiter(10 if NCBI_API_KEY else 3)
+
+
+def esearch(session, term, retmax=MAX_RETMAX, **extra_params):
+    """
+    Execute a single ESearch query.
+    Args:
+        session (requests.Session): Pooled HTTP session.
+        term (str): PubMed query string.
+        retmax (int): Maximum number of PMIDs to return.
+        **extra_params: Additional ESearch parameters (sort, mindate, datetype, ...).
+    Returns:
+        dict: {"count": total hits, "pmids": list of PMIDs}.
+    """
+    params = {
+        "db": "pubmed",
+        "term": term,
+        "retmode": "json",
+        "retmax": min(retmax, MAX_RETMAX),
+        "api_key": NCBI_API_KEY,
+        **extra_params,
+    }
+    NCBI_LIMITER.wait()
+    response = session.get(ESEARCH_URL, params=params, timeout=DEFAULT_TIMEOUT)
+    response.raise_for_status()
+    result = response.json().get("esearchresult", {})
+    return {"count": int(result.get("count", 0)), "pmids": result.get("idlist", [])}
+
+
+def esummary(session, pmids):
+    """
+    Fetch document summaries for a list of PMIDs in batches.
+    Args:
+        session (requests.Session): Pooled HTTP session.
+        pmids (list): PMIDs to summarise.
+    Returns:
+        list: ESummary result dictionaries, one per PMID, with "uid" set.
+    """
+    summaries = []
+    for start in range(0, len(pmids), SUMMARY_BATCH_SIZE):
+        batch = pmids[start:start + SUMMARY_BATCH_SIZE]
+        NCBI_LIMITER.wait()
+        response = session.post(
+            ESUMMARY_URL,
+            data={"db": "pubmed", "id": ",".join(batch), "retmode": "json", "api_key": NCBI_API_KEY},
+            timeout=DEFAULT_TIMEOUT,
+        )
+        response.raise_for_status()
+        result = response.json().get("result", {})
+        summaries.extend(result[uid] for uid in result.get("uids", []) if uid in result)
+    return summaries
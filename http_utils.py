@@ -0,0 +1,50 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Default timeout (seconds) for outbound API calls
+DEFAULT_TIMEOUT = 15
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces out calls to a remote API.
+    Args:
+        calls_per_second (float): Maximum number of calls allowed per second.
+    """
+
+    def __init__(self, calls_per_second):
+        self.interval = 1.0 / calls_per_second
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """
+        Block until the next call slot is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def create_session(pool_size=10, user_agent="Panini-Nutrition/1.0"):
+    """
+    Create a pooled requests session shared by worker threads.
+    Args:
+        pool_size (int): Number of keep-alive connections per host.
+        user_agent (str): User-Agent header sent with every request.
+    Returns:
+        requests.Session: Session with a connection pool mounted for http and https.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": user_agent})
+    return session
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from config import INDB_FILE
+
+# Per-100 g nutrient columns of INDB_my.csv, in file order
+NUTRIENT_COLUMNS = [
+    "energy_kj", "energy_kcal", "carb_g", "protein_g", "fat_g", "freesugar_g", "fibre_g",
+    "sfa_mg", "mufa_mg", "pufa_mg", "cholesterol_mg", "calcium_mg", "phosphorus_mg", "magnesium_mg",
+    "sodium_mg", "potassium_mg", "iron_mg", "copper_mg", "selenium_ug", "chromium_mg", "manganese_mg",
+    "molybdenum_mg", "zinc_mg", "vita_ug", "vite_mg", "vitd2_ug", "vitd3_ug", "vitk1_ug", "vitk2_ug",
+    "folate_ug", "vitb1_mg", "vitb2_mg", "vitb3_mg", "vitb5_mg", "vitb6_mg", "vitb7_ug", "vitb9_ug",
+    "vitc_mg", "carotenoids_ug",
+]
+
+# Nutrients reported by OpenFoodFacts with no INDB equivalent; left NaN for INDB foods
+PRODUCT_ONLY_COLUMNS = ["totalsugar_g"]
+
+# OpenFoodFacts nutriment key -> (INDB column, factor converting OpenFoodFacts units to INDB units).
+# OpenFoodFacts stores energy in kJ/kcal and every other nutrient in grams per 100 g.
+OPENFOODFACTS_TO_INDB = {
+    "energy-kj_100g": ("energy_kj", 1),
+    "energy-kcal_100g": ("energy_kcal", 1),
+    "carbohydrates_100g": ("carb_g", 1),
+    "proteins_100g": ("protein_g", 1),
+    "fat_100g": ("fat_g", 1),
+    # Total sugars (intrinsic and added), so not comparable with INDB free sugars
+    "sugars_100g": ("totalsugar_g", 1),
+    "fiber_100g": ("fibre_g", 1),
+    "saturated-fat_100g": ("sfa_mg", 1e3),
+    "monounsaturated-fat_100g": ("mufa_mg", 1e3),
+    "polyunsaturated-fat_100g": ("pufa_mg", 1e3),
+    "cholesterol_100g": ("cholesterol_mg", 1e3),
+    "calcium_100g": ("calcium_mg", 1e3),
+    "phosphorus_100g": ("phosphorus_mg", 1e3),
+    "magnesium_100g": ("magnesium_mg", 1e3),
+    "sodium_100g": ("sodium_mg", 1e3),
+    "potassium_100g": ("potassium_mg", 1e3),
+    "iron_100g": ("iron_mg", 1e3),
+    "copper_100g": ("copper_mg", 1e3),
+    "selenium_100g": ("selenium_ug", 1e6),
+    "chromium_100g": ("chromium_mg", 1e3),
+    "manganese_100g": ("manganese_mg", 1e3),
+    "molybdenum_100g": ("molybdenum_mg", 1e3),
+    "zinc_100g": ("zinc_mg", 1e3),
+    "vitamin-a_100g": ("vita_ug", 1e6),
+    "vitamin-e_100g": ("vite_mg", 1e3),
+    # OpenFoodFacts does not split vitamin D; fortified products almost always use D3
+    "vitamin-d_100g": ("vitd3_ug", 1e6),
+    "vitamin-k_100g": ("vitk1_ug", 1e6),
+    "folates_100g": ("folate_ug", 1e6),
+    "vitamin-b1_100g": ("vitb1_mg", 1e3),
+    "vitamin-b2_100g": ("vitb2_mg", 1e3),
+    "vitamin-pp_100g": ("vitb3_mg", 1e3),
+    "pantothenic-acid_100g": ("vitb5_mg", 1e3),
+    "vitamin-b6_100g": ("vitb6_mg", 1e3),
+    "biotin_100g": ("vitb7_ug", 1e6),
+    "vitamin-b9_100g": ("vitb9_ug", 1e6),
+    "vitamin-c_100g": ("vitc_mg", 1e3),
+    "beta-carotene_100g": ("carotenoids_ug", 1e6),
+}
+
+KJ_PER_KCAL = 4.184
+
+
+def load_indb(path=INDB_FILE):
+    """
+    Load the Indian Nutrient Databank (INDB) food composition table.
+    Args:
+        path (Path): Location of INDB_my.csv.
+    Returns:
+        pd.DataFrame: One row per food; nutrient columns are per 100 g.
+    """
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+def products_to_indb(products):
+    """
+    Normalise OpenFoodFacts products into INDB rows.
+    Args:
+        products (list): Product dicts with code, product_name, brands and nutriments.
+    Returns:
+        pd.DataFrame: Rows with food_code "OFF<barcode>", food_name, primarysource "openfoodfacts"
+        every INDB nutrient column and PRODUCT_ONLY_COLUMNS (NaN where the product does not report it).
+    """
+    columns = ["food_code", "food_name", "primarysource"] + NUTRIENT_COLUMNS + PRODUCT_ONLY_COLUMNS
+    if not products:
+        return pd.DataFrame(columns=columns)
+
+    raw = pd.DataFrame([product.get("nutriments", {}) for product in products])
+    foods = pd.DataFrame(
+        {
+            "food_code": ["OFF" + str(product.get("code", "")) for product in products],
+            "food_name": [
+                " - ".join(part for part in (product.get("product_name"), product.get("brands")) if part)
+                or "Unnamed product"
+                for product in products
+            ],
+            "primarysource": "openfoodfacts",
+        }
+    )
+    for column in NUTRIENT_COLUMNS + PRODUCT_ONLY_COLUMNS:
+        foods[column] = np.nan
+    for off_key, (column, factor) in OPENFOODFACTS_TO_INDB.items():
+        if off_key in raw.columns:
+            foods[column] = pd.to_numeric(raw[off_key], errors="coerce").to_numpy() * factor
+
+    # Fill whichever energy unit is missing from the other
+    foods["energy_kj"] = foods["energy_kj"].fillna(foods["energy_kcal"] * KJ_PER_KCAL)
+    foods["energy_kcal"] = foods["energy_kcal"].fillna(foods["energy_kj"] / KJ_PER_KCAL)
+    return foods[columns]
+
+
+def load_food_table(include_products=False):
+    """
+    Load INDB, optionally extended with every packaged product in the local product store.
+    Args:
+        include_products (bool): Append stored OpenFoodFacts products mapped to the INDB schema.
+    Returns:
+        pd.DataFrame: Combined food table with INDB columns, plus PRODUCT_ONLY_COLUMNS when products are
+        included.
+    """
+    foods = load_indb()
+    if include_products:
+        from product_store import get_all_products, get_connection
+
+        conn = get_connection()
+        try:
+            products = get_all_products(conn)
+        finally:
+            conn.close()
+        if products:
+            foods = pd.concat([foods, products_to_indb(products)], ignore_index=True)
+    return foods
@@ -0,0 +1,365 @@
+# Offline drug-drug and drug-food interaction knowledge base.
+# Build it from downloadable dumps, e.g.:
+#   python interaction_kb.py names RXNCONSO.RRF
+#   python interaction_kb.py pairs interactions.csv --complete
+#   python interaction_kb.py labels drug-label-0001-of-0012.json.zip
+#   python interaction_kb.py rules
+import argparse
+import csv
+import json
+import sqlite3
+import zipfile
+
+import pandas as pd
+
+from config import DRUG_FOOD_RULES_FILE, INTERACTION_KB_DB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drug_names (
+    name TEXT PRIMARY KEY,
+    rxcui TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS drug_interactions (
+    rxcui1 TEXT NOT NULL,
+    rxcui2 TEXT NOT NULL,
+    drug1 TEXT,
+    drug2 TEXT,
+    severity TEXT,
+    description TEXT,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_drug_interactions_pair ON drug_interactions (rxcui1, rxcui2);
+
+CREATE TABLE IF NOT EXISTS covered_drugs (
+    rxcui TEXT PRIMARY KEY,
+    source TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS drug_labels (
+    rxcui TEXT PRIMARY KEY,
+    name TEXT,
+    warnings TEXT,
+    drug_interactions TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS drug_food_rules (
+    rxcui TEXT,
+    drug TEXT NOT NULL,
+    nutrient TEXT,
+    threshold REAL,
+    pattern TEXT,
+    effect TEXT,
+    advice TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_drug_food_rules_rxcui ON drug_food_rules (rxcui);
+CREATE INDEX IF NOT EXISTS idx_drug_food_rules_drug ON drug_food_rules (drug);
+"""
+
+# RxNorm term types kept when importing names: ingredients and brand names
+RXNORM_NAME_TYPES = {"IN", "PIN", "MIN", "BN"}
+
+
+def normalize_name(name):
+    """
+    Normalise a drug name for lookups.
+    """
+    return " ".join(name.lower().split())
+
+
+def ordered_pair(rxcui1, rxcui2):
+    """
+    Order a pair of RxCUIs so each pair is stored and looked up once.
+    """
+    return (rxcui1, rxcui2) if rxcui1 <= rxcui2 else (rxcui2, rxcui1)
+
+
+def get_connection(db_path=INTERACTION_KB_DB):
+    """
+    Open the interaction knowledge base, creating tables if needed.
+    Args:
+        db_path (Path): Location of the SQLite database file.
+    Returns:
+        sqlite3.Connection: Open connection.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def import_rxnconso(conn, path):
+    """
+    Import drug name -> RxCUI mappings from the RxNorm RXNCONSO.RRF file.
+    Returns:
+        int: Number of names imported.
+    """
+    rows = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            fields = line.rstrip("\n").split("|")
+            # RXCUI|LAT|TS|LUI|STT|SUI|ISPREF|RXAUI|SAUI|SCUI|SDUI|SAB|TTY|CODE|STR|...
+            if len(fields) > 14 and fields[11] == "RXNORM" and fields[12] in RXNORM_NAME_TYPES:
+                rows.setdefault(normalize_name(fields[14]), fields[0])
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO drug_names (name, rxcui) VALUES (?, ?)", rows.items())
+    return len(rows)
+
+
+def import_interaction_pairs(conn, path, source=None, complete=False):
+    """
+    Import drug-drug interactions from a CSV with columns
+    rxcui1, rxcui2, drug1, drug2, severity, description and optionally source.
+    Args:
+        conn (sqlite3.Connection): Open knowledge base connection.
+        path (str): CSV file path.
+        source (str, optional): Source label used when the CSV has no source column.
+        complete (bool): Treat the file as exhaustive for the drugs it lists, so a missing
+            pair between two of them means no known interaction.
+    Returns:
+        int: Number of interactions imported.
+    """
+    rows = []
+    drugs = set()
+    source = source or str(path)
+    with open(path, newline="", encoding="utf-8") as file:
+        for record in csv.DictReader(file):
+            rxcui1, rxcui2 = ordered_pair(record["rxcui1"].strip(), record["rxcui2"].strip())
+            drug1, drug2 = record.get("drug1", ""), record.get("drug2", "")
+            if rxcui1 != record["rxcui1"].strip():
+                drug1, drug2 = drug2, drug1
+            rows.append(
+                (rxcui1, rxcui2, drug1, drug2, record.get("severity", "N/A"),
+                 record.get("description", ""), record.get("source") or source)
+            )
+            drugs.update((rxcui1, rxcui2))
+    with conn:
+        conn.executemany(
+            "INSERT INTO drug_interactions (rxcui1, rxcui2, drug1, drug2, severity, description, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        if complete:
+            conn.executemany(
+                "INSERT OR REPLACE INTO covered_drugs (rxcui, source) VALUES (?, ?)",
+                [(rxcui, source) for rxcui in drugs],
+            )
+    return len(rows)
+
+
+def _read_label_results(path):
+    if str(path).endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                with archive.open(member) as file:
+                    yield from json.load(file).get("results", [])
+    else:
+        with open(path, encoding="utf-8") as file:
+            yield from json.load(file).get("results", [])
+
+
+def import_openfda_labels(conn, path):
+    """
+    Import warnings and interaction text from an OpenFDA drug label dump (.json or .json.zip).
+    Returns:
+        int: Number of labels imported.
+    """
+    rows = {}
+    names = {}
+    for label in _read_label_results(path):
+        openfda = label.get("openfda", {})
+        generic_names = openfda.get("generic_name", [])
+        for rxcui in openfda.get("rxcui", []):
+            rows[rxcui] = (
+                rxcui,
+                generic_names[0] if generic_names else "",
+                json.dumps(label.get("warnings", [])),
+                json.dumps(label.get("drug_interactions", [])),
+            )
+            for name in generic_names:
+                names.setdefault(normalize_name(name), rxcui)
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO drug_labels (rxcui, name, warnings, drug_interactions) VALUES (?, ?, ?, ?)",
+            rows.values(),
+        )
+        conn.executemany("INSERT OR IGNORE INTO drug_names (name, rxcui) VALUES (?, ?)", names.items())
+    return len(rows)
+
+
+def import_drug_food_rules(conn, path=DRUG_FOOD_RULES_FILE):
+    """
+    Replace the drug-food rules with those in the rules JSON file.
+    Returns:
+        int: Number of rules imported.
+    """
+    with open(path, encoding="utf-8") as file:
+        rules = json.load(file)["rules"]
+    with conn:
+        conn.execute("DELETE FROM drug_food_rules")
+        conn.executemany(
+            "INSERT INTO drug_food_rules (rxcui, drug, nutrient, threshold, pattern, effect, advice) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (rule.get("rxcui"), normalize_name(rule["drug"]), rule.get("nutrient"), rule.get("threshold"),
+                 rule.get("pattern"), rule.get("effect", ""), rule.get("advice", ""))
+                for rule in rules
+            ],
+        )
+    return len(rules)
+
+
+def lookup_rxcuis(conn, drug_names):
+    """
+    Resolve drug names to RxCUIs from the local name table.
+    Returns:
+        dict: Mapping of name -> RxCUI for names found locally.
+    """
+    found = {}
+    for name in drug_names:
+        row = conn.execute("SELECT rxcui FROM drug_names WHERE name = ?", (normalize_name(name),)).fetchone()
+        if row:
+            found[name] = row[0]
+    return found
+
+
+def lookup_pairs(conn, pairs):
+    """
+    Answer drug-drug interaction pairs from the local index.
+    A pair is answered when it has stored interactions, or when both drugs are covered by a
+    complete dataset (meaning no known interaction). Other pairs are misses.
+    Args:
+        conn (sqlite3.Connection): Open knowledge base connection.
+        pairs (list): (rxcui1, rxcui2) tuples.
+    Returns:
+        dict: Mapping of ordered pair -> list of interaction records, for answered pairs only.
+    """
+    answered = {}
+    covered = set()
+    for pair in pairs:
+        rxcui1, rxcui2 = ordered_pair(*pair)
+        rows = conn.execute(
+            "SELECT drug1, drug2, severity, description, source FROM drug_interactions "
+            "WHERE rxcui1 = ? AND rxcui2 = ?",
+            (rxcui1, rxcui2),
+        ).fetchall()
+        if rows:
+            answered[(rxcui1, rxcui2)] = [
+                {"drugs": [r[0], r[1]], "rxcuis": [rxcui1, rxcui2], "severity": r[2], "description": r[3], "source": r[4]}
+                for r in rows
+            ]
+            continue
+        for rxcui in (rxcui1, rxcui2):
+            if rxcui not in covered and conn.execute(
+                "SELECT 1 FROM covered_drugs WHERE rxcui = ?", (rxcui,)
+            ).fetchone():
+                covered.add(rxcui)
+        if rxcui1 in covered and rxcui2 in covered:
+            answered[(rxcui1, rxcui2)] = []
+    return answered
+
+
+def lookup_warnings(conn, rxcuis):
+    """
+    Read label warnings for RxCUIs from the imported OpenFDA labels.
+    Returns:
+        dict: Mapping of RxCUI -> list of warning paragraphs, for labels found locally.
+    """
+    found = {}
+    for rxcui in rxcuis:
+        row = conn.execute("SELECT warnings FROM drug_labels WHERE rxcui = ?", (rxcui,)).fetchone()
+        if row:
+            found[rxcui] = json.loads(row[0]) or ["No warnings found"]
+    return found
+
+
+def load_drug_food_rules(conn, drugs):
+    """
+    Fetch the drug-food rules that apply to the given drugs.
+    Args:
+        conn (sqlite3.Connection): Open knowledge base connection.
+        drugs (dict): Mapping of drug name -> RxCUI (or None).
+    Returns:
+        list: Rule dictionaries with the drug name as entered by the user.
+    """
+    if not conn.execute("SELECT 1 FROM drug_food_rules LIMIT 1").fetchone():
+        import_drug_food_rules(conn)
+
+    columns = ["rxcui", "drug", "nutrient", "threshold", "pattern", "effect", "advice"]
+    rules = []
+    for name, rxcui in drugs.items():
+        rows = conn.execute(
+            f"SELECT {', '.join(columns)} FROM drug_food_rules WHERE rxcui = ? OR drug = ?",
+            (rxcui or "", normalize_name(name)),
+        ).fetchall()
+        rules.extend({**dict(zip(columns, row)), "drug": name} for row in rows)
+    return rules
+
+
+def check_food_interactions(rules, foods):
+    """
+    Match drug-food rules against INDB foods.
+    Args:
+        rules (list): Rules from load_drug_food_rules.
+        foods (pd.DataFrame): INDB table with food_code, food_name and nutrient columns (per 100 g).
+    Returns:
+        pd.DataFrame: One row per (drug, food) match with the triggering nutrient amount.
+    """
+    matches = []
+    for rule in rules:
+        if rule["nutrient"] and rule["nutrient"] in foods.columns:
+            amounts = pd.to_numeric(foods[rule["nutrient"]], errors="coerce")
+            hit = foods[amounts >= rule["threshold"]]
+            reason = rule["nutrient"]
+            amount = amounts[amounts >= rule["threshold"]]
+        elif rule["pattern"]:
+            hit = foods[foods["food_name"].str.contains(rule["pattern"], case=False, na=False, regex=True)]
+            reason = f"name matches '{rule['pattern']}'"
+            amount = pd.Series(float("nan"), index=hit.index)
+        else:
+            continue
+        if hit.empty:
+            continue
+        matches.append(
+            pd.DataFrame(
+                {
+                    "Drug": rule["drug"],
+                    "Food Code": hit["food_code"],
+                    "Food": hit["food_name"],
+                    "Trigger": reason,
+                    "Amount per 100 g": amount,
+                    "Effect": rule["effect"],
+                    "Advice": rule["advice"],
+                }
+            )
+        )
+    if not matches:
+        return pd.DataFrame(columns=["Drug", "Food Code", "Food", "Trigger", "Amount per 100 g", "Effect", "Advice"])
+    return pd.concat(matches, ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the offline drug interaction knowledge base.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("names", help="Import RxNorm RXNCONSO.RRF").add_argument("path")
+    pairs_parser = subparsers.add_parser("pairs", help="Import a drug-drug interaction CSV")
+    pairs_parser.add_argument("path")
+    pairs_parser.add_argument("--source")
+    pairs_parser.add_argument("--complete", action="store_true", help="File lists every interaction of its drugs")
+    subparsers.add_parser("labels", help="Import an OpenFDA drug label dump").add_argument("path")
+    subparsers.add_parser("rules", help="Import drug-food rules").add_argument("path", nargs="?", default=DRUG_FOOD_RULES_FILE)
+    args = parser.parse_args()
+
+    kb = get_connection()
+    try:
+        if args.command == "names":
+            count = import_rxnconso(kb, args.path)
+        elif args.command == "pairs":
+            count = import_interaction_pairs(kb, args.path, source=args.source, complete=args.complete)
+        elif args.command == "labels":
+            count = import_openfda_labels(kb, args.path)
+        else:
+            count = import_drug_food_rules(kb, args.path)
+        print(f"Imported {count} records into {INTERACTION_KB_DB}")
+    finally:
+        kb.close()
@@ -0,0 +1,135 @@
+# Background refresh of the latest articles for the journals browsed in pubmed_search.
+# Run as a sidecar process with `python journal_sync.py --interval 60`,
+# or start the in-process daemon thread with start_background_sync().
+import argparse
+import threading
+from datetime import date
+
+from eutils import esearch, esummary
+from http_utils import create_session
+from pubmed_cache import get_connection, get_last_sync, save_journal_articles, set_last_sync
+
+# Journal Options
+CLINICAL_JOURNALS = [
+    "N Engl J Med",
+    "Lancet",
+    "JAMA",
+    "BMJ",
+    "Ann Intern Med",
+    "PLOS Medicine",
+    "J Clin Invest",
+    "JAMA Intern Med",
+    "Am J Med",
+    "CMAJ"
+]
+
+ENDOCRINOLOGY_JOURNALS = [
+    "J Clin Endocrinol Metab",
+    "Diabetes Care",
+    "Endocrinology",
+    "Diabetologia",
+    "Lancet Diabetes Endocrinol",
+    "Thyroid",
+    "Endocrine Reviews",
+    "Bone",
+    "Horm Metab Res",
+    "Nature Rev Endocrinol"
+]
+
+ALL_JOURNALS = CLINICAL_JOURNALS + ENDOCRINOLOGY_JOURNALS
+
+# Number of articles pulled for a journal the first time it is synced
+INITIAL_SYNC_COUNT = 500
+
+# Minutes between background refreshes
+DEFAULT_INTERVAL_MINUTES = 60
+
+_sync_thread = None
+_sync_lock = threading.Lock()
+
+
+def sync_journal(session, conn, journal, initial_count=INITIAL_SYNC_COUNT):
+    """
+    Pull new PMIDs for one journal into the local cache.
+    The first sync fetches the newest initial_count articles; later syncs only fetch
+    articles added to PubMed since the last sync date.
+    Args:
+        session (requests.Session): Pooled HTTP session.
+        conn (sqlite3.Connection): Open cache connection.
+        journal (str): Journal abbreviation.
+        initial_count (int): Number of articles fetched on the first sync.
+    Returns:
+        int: Number of articles fetched.
+    """
+    today = date.today().strftime("%Y/%m/%d")
+    last_sync = get_last_sync(conn, journal)
+    term = f'"{journal}"[jour]'
+    if last_sync:
+        result = esearch(session, term, datetype="edat", mindate=last_sync, maxdate=today)
+    else:
+        result = esearch(session, term, retmax=initial_count, sort="pub_date")
+
+    summaries = esummary(session, result["pmids"]) if result["pmids"] else []
+    save_journal_articles(conn, journal, summaries)
+    set_last_sync(conn, journal, today)
+    return len(summaries)
+
+
+def sync_all(journals=ALL_JOURNALS):
+    """
+    Synchronise every listed journal, skipping journals that fail.
+    Args:
+        journals (list): Journal abbreviations to refresh.
+    Returns:
+        dict: Mapping of journal -> number of articles fetched, or None on failure.
+    """
+    session = create_session(pool_size=2)
+    conn = get_connection()
+    fetched = {}
+    try:
+        for journal in journals:
+            try:
+                fetched[journal] = sync_journal(session, conn, journal)
+            except Exception:
+                fetched[journal] = None
+    finally:
+        conn.close()
+    return fetched
+
+
+def run_scheduler(interval_minutes=DEFAULT_INTERVAL_MINUTES, stop_event=None, journals=ALL_JOURNALS):
+    """
+    Refresh all journals every interval_minutes until stop_event is set.
+    """
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        sync_all(journals)
+        stop_event.wait(interval_minutes * 60)
+
+
+def start_background_sync(interval_minutes=DEFAULT_INTERVAL_MINUTES):
+    """
+    Start the refresh loop in a daemon thread, once per process.
+    Returns:
+        threading.Thread: The running sync thread.
+    """
+    global _sync_thread
+    with _sync_lock:
+        if _sync_thread is None or not _sync_thread.is_alive():
+            _sync_thread = threading.Thread(
+                target=run_scheduler, args=(interval_minutes,), name="journal-sync", daemon=True
+            )
+            _sync_thread.start()
+    return _sync_thread
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh cached PubMed articles for the listed journals.")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_MINUTES, help="Minutes between refreshes")
+    parser.add_argument("--once", action="store_true", help="Run a single refresh and exit")
+    args = parser.parse_args()
+    if args.once:
+        for journal, count in sync_all().items():
+            print(f"{journal}: {'failed' if count is None else count}")
+    else:
+        run_scheduler(args.interval)
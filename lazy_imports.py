@@ -0,0 +1,70 @@
+import importlib
+import sys
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+    Args:
+        name (str): Fully qualified module name, e.g. "matplotlib.pyplot".
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<LazyModule {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_import(name):
+    """
+    Import a module lazily. Heavy libraries used by only one feature of a page
+    (docx for reports, wordcloud, networkx, ...) then load when that feature runs.
+    Args:
+        name (str): Fully qualified module name.
+    Returns:
+        module or LazyModule: The module itself if already imported, otherwise a lazy stand-in.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def preload(names):
+    """
+    Import modules eagerly, e.g. from a warm-up thread, so later lazy accesses are free.
+    Args:
+        names (list): Fully qualified module names.
+    Returns:
+        dict: Mapping of module name -> error message for modules that failed to import.
+    """
+    errors = {}
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            errors[name] = str(e)
+    return errors
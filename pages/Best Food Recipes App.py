@@ -1,17 +1,20 @@
 import streamlit as st
-import pandas as pd
 import os
+from dataset_registry import dataset_path, load_dataset
+from startup import start_services
+
+start_services()
 
 # App title
 st.title("Best Food Recipes App")
 st.write("Explore a variety of food recipes and beverages.")
 
 # Automatically read the CSV file from the 'data' folder
-file_path = 'data/recipe_links.csv' # Ensure the CSV file is placed in this folder
+file_path = dataset_path("recipe_links")  # Ensure the CSV file is placed in this folder
 
 if os.path.exists(file_path):
     # Load the data from the file
-    df = pd.read_csv(file_path)
+    df = load_dataset("recipe_links")
 
     # Display the data
     st.write("### Food Recipes List")
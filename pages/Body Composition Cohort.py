@@ -0,0 +1,105 @@
+import streamlit as st
+from io import BytesIO
+from lazy_imports import lazy_import
+from body_composition_store import get_connection, record_cohort
+import numpy as np
+from panini.cohort import (
+    COHORT_METRICS,
+    REQUIRED_COLUMNS,
+    SKINFOLD_COLUMNS,
+    cohort_to_csv,
+    compute_cohort_body_composition,
+    read_cohort,
+    summarize_cohort,
+)
+from startup import start_services
+from tracing import set_page, span
+
+set_page(__file__)
+start_services()
+
+# Heavy libraries are imported on first use
+plt = lazy_import("matplotlib.pyplot")
+
+# Metrics plotted as distributions
+PLOT_METRICS = ["bmi", "body_fat_percentage", "fat_mass", "ffmi", "fat_free_mass", "jackson_pollock_body_fat"]
+
+
+@st.cache_data(show_spinner=False)
+def process_upload(data, file_name):
+    # Cached on the file contents, so widget changes do not recompute the cohort
+    with span("compute"):
+        return compute_cohort_body_composition(read_cohort(BytesIO(data), file_name))
+
+
+st.title("Body Composition Calculator: Cohort Mode")
+st.write(
+    "Upload a CSV or Parquet table with one row per person to compute BMI, fat mass, fat-free mass, FFMI "
+    "and body fat percentage for everyone at once."
+)
+st.markdown(
+    f"**Required columns:** {', '.join(REQUIRED_COLUMNS)} (weight in kg, height in cm, sex as Male/Female, M/F or 1/0).  \n"
+    f"**Optional columns:** skinfolds in mm ({', '.join(SKINFOLD_COLUMNS)}), measured body density (density), "
+    "and patient_id with measured_at to save the visits for follow-up tracking."
+)
+
+uploaded_file = st.file_uploader("Upload cohort table", type=["csv", "parquet"])
+
+if uploaded_file is not None:
+    try:
+        results = process_upload(uploaded_file.getvalue(), uploaded_file.name)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    st.header("Results")
+    invalid = results["bmi"].isna().sum()
+    st.write(f"{len(results)} people processed.")
+    if invalid:
+        st.warning(f"{invalid} row(s) have missing or invalid weight, height, age or sex and were left blank.")
+    st.dataframe(results)
+    st.download_button(
+        "Download Results (CSV)",
+        cohort_to_csv(results),
+        file_name="body_composition_cohort.csv",
+        mime="text/csv",
+    )
+
+    patient_column = next((column for column in ("patient_id", "id") if column in results.columns), None)
+    if patient_column:
+        date_column = next((column for column in ("measured_at", "date") if column in results.columns), None)
+        if st.button("Save to follow-up tracking"):
+            conn = get_connection()
+            try:
+                stored, skipped = record_cohort(conn, results, patient_column, date_column=date_column)
+            finally:
+                conn.close()
+            st.success(f"Saved {stored} measurement(s); see them on the body composition page by patient ID.")
+            if skipped:
+                st.warning(f"{len(skipped)} row(s) were not saved:")
+                st.dataframe([{"Row": number, "Reason": reason} for number, reason in skipped], hide_index=True)
+
+    st.header("Summary")
+    st.dataframe(summarize_cohort(results))
+
+    counts = results["jackson_pollock_method"].value_counts()
+    st.write("Jackson-Pollock method used: " + ", ".join(f"{method}: {count}" for method, count in counts.items()))
+
+    st.header("Distributions")
+    plotted = [metric for metric in PLOT_METRICS if results[metric].notna().any()]
+    if plotted:
+        with span("render_charts"):
+            columns = 2
+            rows = int(np.ceil(len(plotted) / columns))
+            fig, axes = plt.subplots(rows, columns, figsize=(10, 3.5 * rows), squeeze=False)
+            for ax, metric in zip(axes.flat, plotted):
+                values = results[metric].dropna()
+                ax.hist(values, bins=30, color="#6495ED", edgecolor="white")
+                ax.axvline(values.median(), color="#DC143C", linestyle="--", label=f"Median {values.median():.2f}")
+                ax.set_title(COHORT_METRICS[metric], fontsize=12)
+                ax.legend(fontsize=8)
+            for ax in list(axes.flat)[len(plotted):]:
+                ax.set_visible(False)
+            fig.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
@@ -0,0 +1,105 @@
+import streamlit as st
+from io import BytesIO
+from panini.bulk_scoring import (
+    IPAQ,
+    read_export,
+    response_template,
+    score_export,
+    scorable_instruments,
+    summarize_scores,
+)
+from panini.cohort import cohort_to_csv
+from panini.questionnaire_engine import load_instrument
+from submission_store import get_connection, record_submissions, submissions_from_scores
+from startup import start_services
+from tracing import set_page, span
+
+set_page(__file__)
+start_services()
+
+
+def instrument_title(name):
+    return "International Physical Activity Questionnaire (IPAQ)" if name == IPAQ else load_instrument(name).title()
+
+
+@st.cache_data(show_spinner=False)
+def process_upload(data, file_name, name):
+    # Cached on the file contents and instrument, so widget changes do not rescore the export
+    with span("compute"):
+        return score_export(name, read_export(BytesIO(data), file_name))
+
+
+st.title("Bulk Questionnaire Scoring")
+st.markdown("""
+**Purpose:**
+Score questionnaires collected on paper or in spreadsheets without re-entering them one form at a time.
+Upload a CSV or Excel export (e.g. from Google Sheets or Google Forms: *File > Download*) with one row per respondent.
+""")
+
+name = st.selectbox("Questionnaire", scorable_instruments(), format_func=instrument_title)
+if name == IPAQ:
+    st.markdown(
+        "**Columns:** days per week and hours/minutes per day for each activity "
+        "(vigorous_days, vigorous_hours, vigorous_minutes, and the same for moderate and walking), "
+        "plus sitting_hours and sitting_minutes."
+    )
+else:
+    st.markdown(
+        "**Columns:** one per question, headed by the question text (as on the form) or its item id. "
+        "Answers are the option labels, in any language the questionnaire offers. Other columns, "
+        "such as names or timestamps, are kept in the results."
+    )
+st.download_button(
+    "Download Blank Template (CSV)",
+    response_template(name),
+    file_name=f"{name}_template.csv",
+    mime="text/csv",
+)
+
+uploaded_file = st.file_uploader("Upload responses", type=["csv", "xlsx"])
+
+if uploaded_file is not None:
+    try:
+        results, report = process_upload(uploaded_file.getvalue(), uploaded_file.name, name)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    st.header("Results")
+    st.write(f"{len(results)} respondents scored; {len(report['matched'])} question column(s) recognised.")
+    if report["missing"]:
+        st.warning(f"Not in the export, scored as unanswered: {', '.join(report['missing'])}")
+    if report["invalid"]:
+        expected = "a number" if name == IPAQ else "an option"
+        st.warning(f"{report['invalid']} answer(s) were not {expected} and were scored as unanswered.")
+    if report["blank"]:
+        st.warning(f"{report['blank']} row(s) have no answers; they are not scored, summarized or saved.")
+    if report["partial"]:
+        st.info(f"{report['partial']} row(s) are partly answered; see the complete column.")
+    st.dataframe(results)
+    st.download_button(
+        "Download Scores (CSV)",
+        cohort_to_csv(results),
+        file_name=f"{name}_scores.csv",
+        mime="text/csv",
+    )
+
+    st.header("Summary")
+    summary, badges = summarize_scores(results, name)
+    st.dataframe(summary)
+    if not badges.empty:
+        st.write("Badges: " + ", ".join(f"{badge}: {count}" for badge, count in badges.items()))
+
+    st.header("Save to Submission Store")
+    st.write(
+        "Store the scores for the questionnaire dashboard. Optional columns respondent_id (or id), "
+        "timestamp (or date), age, sex and site are stored with each respondent."
+    )
+    if st.button("Save Scores"):
+        with span("save"):
+            conn = get_connection()
+            try:
+                saved = record_submissions(conn, submissions_from_scores(name, results))
+            finally:
+                conn.close()
+        st.success(f"{len(saved)} submissions saved.")
@@ -1,47 +1,90 @@
 import streamlit as st
-import requests
+import pandas as pd
+from doi_validation import get_crossref_metadata, normalize_doi, parse_doi_list, validate_dois, JCEM_TITLE
+from startup import start_services
+
+start_services()
 
 
 # Function to validate DOI
 def validate_doi(doi):
-    url = f"https://api.crossref.org/works/{doi}"
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            container_title = data.get('message', {}).get('container-title', [])
-            publisher = data.get('message', {}).get('publisher', '')
-
-            # Check if the DOI belongs to JCEM
-            is_jcem = "The Journal of Clinical Endocrinology & Metabolism" in container_title
-            return is_jcem, container_title, publisher
-        else:
+        doi = normalize_doi(doi)
+        metadata, failed = get_crossref_metadata([doi], max_workers=1)
+        if failed or metadata.get(doi) is None:
             return None, None, None
+        container_title = metadata[doi].get('container-title', [])
+        publisher = metadata[doi].get('publisher', '')
+
+        # Check if the DOI belongs to JCEM
+        is_jcem = JCEM_TITLE in container_title
+        return is_jcem, container_title, publisher
     except Exception as e:
         st.error(f"An error occurred: {e}")
         return None, None, None
 
 
+# Read DOIs from an uploaded CSV: a column named "doi" if present, otherwise every cell
+def read_dois_from_csv(uploaded_file):
+    df = pd.read_csv(uploaded_file, dtype=str)
+    doi_columns = [col for col in df.columns if col.strip().lower() == "doi"]
+    values = df[doi_columns[0]] if doi_columns else df.stack()
+    return parse_doi_list("\n".join(values.dropna().astype(str)))
+
+
 # Streamlit App Interface
 st.title("JCEM DOI Validator")
 st.write("Enter a DOI to check if it belongs to **The Journal of Clinical Endocrinology & Metabolism (JCEM)**.")
 
-# Input Field
-doi = st.text_input("Enter DOI:", placeholder="e.g., 10.1210/clinem/dgae835")
-
-if doi:
-    st.write("Validating DOI...")
-    is_jcem, container_title, publisher = validate_doi(doi)
-
-    if is_jcem is None:
-        st.error("DOI could not be validated. Please check the DOI or try again later.")
-    elif is_jcem:
-        st.success(f"✅ The DOI belongs to **JCEM**!")
-        st.write(f"**Journal Title:** {container_title[0] if container_title else 'N/A'}")
-        st.write(f"**Publisher:** {publisher}")
-    else:
-        st.error(f"❌ The DOI does not belong to JCEM.")
-        st.write(f"**Journal Title:** {container_title[0] if container_title else 'N/A'}")
-        st.write(f"**Publisher:** {publisher if publisher else 'N/A'}")
+single_tab, bulk_tab = st.tabs(["Single DOI", "Bulk Validation"])
+
+with single_tab:
+    # Input Field
+    doi = st.text_input("Enter DOI:", placeholder="e.g., 10.1210/clinem/dgae835")
+
+    if doi:
+        st.write("Validating DOI...")
+        is_jcem, container_title, publisher = validate_doi(doi)
+
+        if is_jcem is None:
+            st.error("DOI could not be validated. Please check the DOI or try again later.")
+        elif is_jcem:
+            st.success(f"✅ The DOI belongs to **JCEM**!")
+            st.write(f"**Journal Title:** {container_title[0] if container_title else 'N/A'}")
+            st.write(f"**Publisher:** {publisher}")
+        else:
+            st.error(f"❌ The DOI does not belong to JCEM.")
+            st.write(f"**Journal Title:** {container_title[0] if container_title else 'N/A'}")
+            st.write(f"**Publisher:** {publisher if publisher else 'N/A'}")
+
+with bulk_tab:
+    st.write("Paste a list of DOIs or references, or upload a CSV with a `doi` column.")
+    pasted = st.text_area("DOIs (one per line):", height=200)
+    uploaded_file = st.file_uploader("Or upload a CSV", type=["csv"])
+
+    if st.button("Validate All"):
+        dois = parse_doi_list(pasted)
+        if uploaded_file:
+            dois = list(dict.fromkeys(dois + read_dois_from_csv(uploaded_file)))
+
+        if not dois:
+            st.warning("No DOIs found in the input.")
+        else:
+            with st.spinner(f"Validating {len(dois)} DOIs..."):
+                results = pd.DataFrame(validate_dois(dois))
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Checked", len(results))
+            col2.metric("JCEM", int(results["JCEM"].sum()))
+            col3.metric("Not Found", int((results["Status"] == "Not Found").sum()))
+            col4.metric("Errors", int((results["Status"] == "Error").sum()))
+
+            st.dataframe(results)
+            st.download_button(
+                label="Download Results as CSV",
+                data=results.to_csv(index=False).encode("utf-8"),
+                file_name="doi_validation_results.csv",
+                mime="text/csv",
+            )
 
 st.write("Powered by [CrossRef API](https://www.crossref.org/) and Streamlit.")
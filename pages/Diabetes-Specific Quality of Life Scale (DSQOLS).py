@@ -1,86 +1,27 @@
 import streamlit as st
-import matplotlib.pyplot as plt
+from lazy_imports import lazy_import
 import numpy as np
 from math import pi
-from docx import Document
-from docx.shared import Inches
-import tempfile
-
-# Define questionnaire
-questionnaire = {
-    "Emotional Impact": [
-        "I feel stressed about managing my blood sugar levels.",
-        "I feel frustrated about the restrictions diabetes places on my life.",
-        "I worry about long-term complications of diabetes.",
-        "I feel guilty when my blood sugar levels are not well-controlled.",
-        "I feel confident in my ability to manage diabetes (reverse-scored)."
-    ],
-    "Dietary Behavior": [
-        "I feel restricted by the dietary requirements of managing diabetes.",
-        "I find it difficult to resist foods that I should avoid.",
-        "I feel satisfied with the meal plans I follow for diabetes management.",
-        "I struggle to balance my diet with my insulin or medication routine.",
-        "I feel confident in making healthy food choices."
-    ],
-    "Treatment Satisfaction": [
-        "I feel satisfied with the effectiveness of my diabetes treatment plan.",
-        "I feel overwhelmed by the complexity of diabetes management.",
-        "I trust the advice and support I receive from my healthcare provider.",
-        "I feel bothered by the frequency of blood sugar checks and insulin injections.",
-        "I am satisfied with the tools and technology available to manage my diabetes."
-    ],
-    "Social and Interpersonal Impact": [
-        "I feel diabetes interferes with my social life and activities.",
-        "I avoid social gatherings because of diabetes-related dietary restrictions.",
-        "I feel supported by my family and friends in managing my diabetes.",
-        "I find it difficult to explain my diabetes to others.",
-        "I feel judged by others because of my diabetes."
-    ],
-    "Physical Health": [
-        "I feel physically limited because of diabetes.",
-        "I experience fatigue that interferes with my daily activities.",
-        "I feel energetic and healthy despite having diabetes (reverse-scored).",
-        "I have trouble sleeping because of diabetes-related issues.",
-        "I feel pain or discomfort related to diabetes (e.g., neuropathy, injections)."
-    ],
-    "Work and Financial Impact": [
-        "I feel that diabetes affects my work performance.",
-        "I feel that managing diabetes is financially burdensome.",
-        "I have to take time off work due to diabetes-related health issues.",
-        "I feel my career choices are limited because of diabetes.",
-        "I can manage diabetes effectively without disrupting my work routine (reverse-scored)."
-    ]
-}
-
-# Scoring system
-reverse_scored_questions = [
-    "I feel confident in my ability to manage diabetes (reverse-scored).",
-    "I feel satisfied with the meal plans I follow for diabetes management.",
-    "I feel confident in making healthy food choices.",
-    "I feel energetic and healthy despite having diabetes (reverse-scored).",
-    "I can manage diabetes effectively without disrupting my work routine (reverse-scored)."
-]
-
-
-def calculate_scores(responses):
-    section_scores = {}
-    total_score = 0
-
-    for section, questions in responses.items():
-        section_score = 0
-        for question, score in questions.items():
-            if question in reverse_scored_questions:
-                section_score += 6 - score  # Reverse scoring
-            else:
-                section_score += score
-        avg_score = section_score / len(questions)
-        section_scores[section] = avg_score
-        total_score += avg_score
-
-    overall_score = total_score / len(responses)
-    return section_scores, overall_score
+from panini.charts import figure_to_png
+from panini.questionnaire_engine import load_instrument
+from questionnaire_forms import render_form, respondent_details
+from report_downloads import report_download, request_report
+from submission_store import submit
+from startup import start_services
+from tracing import set_page, span, traced
 
+set_page(__file__)
+start_services()
 
+# Heavy libraries are imported on first use
+plt = lazy_import("matplotlib.pyplot")
+
+# Questions, options, reverse-scored items and badge bands: panini/instruments/dsqols.yaml
+instrument = load_instrument("dsqols")
+questionnaire = instrument.questionnaire()
+
+
+@traced("render_charts")
 def plot_visualizations(section_scores):
     # Bar Chart
     sections = list(section_scores.keys())
@@ -89,22 +30,22 @@ def plot_visualizations(section_scores):
     ax1.bar(sections, scores, color='skyblue')
     ax1.set_title('Section-wise Average Scores')
     ax1.set_ylabel('Average Score')
-    st.pyplot(fig1)
-    bar_chart_path = save_plot_as_image(fig1)
+    bar_chart_png = figure_to_png(fig1)
+    st.image(bar_chart_png)
 
     # Pie Chart
     fig2, ax2 = plt.subplots()
     ax2.pie(scores, labels=sections, autopct='%1.1f%%', startangle=140)
     ax2.set_title('Score Distribution')
-    st.pyplot(fig2)
-    pie_chart_path = save_plot_as_image(fig2)
+    pie_chart_png = figure_to_png(fig2)
+    st.image(pie_chart_png)
 
     # Radar Chart
     fig3 = radar_chart(section_scores)
-    st.pyplot(fig3)
-    radar_chart_path = save_plot_as_image(fig3)
+    radar_chart_png = figure_to_png(fig3)
+    st.image(radar_chart_png)
 
-    return bar_chart_path, pie_chart_path, radar_chart_path
+    return bar_chart_png, pie_chart_png, radar_chart_png
 
 
 def radar_chart(section_scores):
@@ -125,48 +66,6 @@ def radar_chart(section_scores):
     return fig
 
 
-def save_plot_as_image(fig):
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-    fig.savefig(temp_file.name, bbox_inches="tight")
-    return temp_file.name
-
-
-def generate_word_report(responses, section_scores, overall_score, badge, message, images):
-    doc = Document()
-    doc.add_heading('Diabetes-Specific Quality of Life Scale (DSQOLS) Report', level=1)
-    doc.add_paragraph(f"Overall Score: {overall_score:.2f}")
-    doc.add_paragraph(f"Awarded Badge: {badge}")
-    doc.add_paragraph(f"Message: {message}")
-
-    doc.add_heading('Section-wise Scores', level=2)
-    for section, score in section_scores.items():
-        doc.add_paragraph(f"{section}: {score:.2f}")
-
-    doc.add_heading('Your Responses', level=2)
-    for section, questions in responses.items():
-        doc.add_heading(section, level=3)
-        for question, score in questions.items():
-            doc.add_paragraph(f"{question}: {score}")
-
-    doc.add_heading('Visualizations', level=2)
-    for title, image_path in images.items():
-        doc.add_heading(title, level=3)
-        doc.add_picture(image_path, width=Inches(5.0))
-
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".docx")
-    doc.save(temp_file.name)
-    return temp_file.name
-
-
-def gamification(overall_score):
-    if overall_score <= 2:
-        return "Gold", "Great quality of life! Keep up the excellent work!"
-    elif overall_score <= 3.5:
-        return "Silver", "Good quality of life. Consider minor improvements for even better results."
-    else:
-        return "Bronze", "There is room for improvement. Focus on areas that matter most."
-
-
 def main():
     st.title("Diabetes-Specific Quality of Life Scale (DSQOLS)")
     st.markdown("""
@@ -175,18 +74,19 @@ def main():
     Respond to each question based on the past 4 weeks.
     """)
 
+    respondent = respondent_details()
+
     # Collect responses
-    responses = {}
-    for section, questions in questionnaire.items():
-        st.header(section)
-        responses[section] = {}
-        for question in questions:
-            score = st.slider(question, min_value=1, max_value=5, value=3, key=f"{section}_{question}")
-            responses[section][question] = score
+    answers, _ = render_form(instrument)
+    responses = {
+        section: dict(zip(questions, scores))
+        for (section, questions), scores in zip(questionnaire.items(), instrument.answers_by_section(answers).values())
+    }
 
     if st.button("Submit"):
-        section_scores, overall_score = calculate_scores(responses)
-        badge, message = gamification(overall_score)
+        section_scores, overall_score, badge, message = instrument.score(answers)
+        submit("dsqols", answers, section_scores=section_scores, overall=overall_score, badge=badge,
+               **respondent)
 
         st.subheader("Your Results")
         st.write(f"Overall Score: {overall_score:.2f}")
@@ -195,18 +95,17 @@ def main():
 
         # Visualizations
         st.subheader("Visualizations")
-        bar_chart_path, pie_chart_path, radar_chart_path = plot_visualizations(section_scores)
+        bar_chart_png, pie_chart_png, radar_chart_png = plot_visualizations(section_scores)
 
         # Generate Word report
         images = {
-            "Bar Chart": bar_chart_path,
-            "Pie Chart": pie_chart_path,
-            "Radar Chart": radar_chart_path
+            "Bar Chart": bar_chart_png,
+            "Pie Chart": pie_chart_png,
+            "Radar Chart": radar_chart_png
         }
-        word_file = generate_word_report(responses, section_scores, overall_score, badge, message, images)
-        st.success("Report generated successfully!")
-        with open(word_file, "rb") as file:
-            st.download_button("Download Report", file, file_name="DSQOLS_Report.docx")
+        with span("report"):
+            request_report("dsqols", "dsqols", responses, section_scores, overall_score, badge, message, images)
+    report_download("dsqols", "DSQOLS_Report.docx")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 import streamlit as st
-import pandas as pd
 import os
+from dataset_registry import load_dataset
+from startup import start_services
+
+start_services()
 
 # Streamlit app starts here
 st.title("Food Data Search Tool")
@@ -12,7 +15,7 @@ file_path = os.path.join(data_dir, default_file_name)
 
 if os.path.exists(file_path):
     # Load the CSV
-    df = pd.read_csv(file_path)
+    df = load_dataset("food_index")
     st.success(f"Auto-imported '{default_file_name}' from './data' directory.")
 
     # Columns for searching
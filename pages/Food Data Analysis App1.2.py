@@ -1,8 +1,27 @@
 import streamlit as st
+from lazy_imports import lazy_import
 import pandas as pd
-import plotly.express as px
-import matplotlib.pyplot as plt
-import seaborn as sns
+from dataset_registry import load_dataset
+from indb import load_food_table
+from startup import start_services
+from tracing import set_page, span
+
+set_page(__file__)
+start_services()
+
+# Heavy libraries are imported on first use
+px = lazy_import("plotly.express")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Newly scanned products show up within this many seconds
+PRODUCTS_TTL_SECONDS = 300
+
+
+@st.cache_data(ttl=PRODUCTS_TTL_SECONDS, show_spinner=False)
+def load_foods_with_products():
+    # Reading and normalising the whole product store is too slow to repeat on every rerun
+    return load_food_table(include_products=True)
 
 # Load dataset from the specified path
 file_path = 'data/INDB_my.csv'
@@ -11,14 +30,19 @@ st.title("Food Data Analysis App")
 st.write("Analyzing food nutritional data from the preloaded dataset.")
 
 # Check if the file exists and read it
+include_products = st.sidebar.checkbox("Include scanned packaged foods")
+
 try:
-    df = pd.read_csv(file_path)
+    with span("load_data"):
+        df = load_foods_with_products() if include_products else load_dataset("indb")
     st.write("### Dataset Preview")
     st.dataframe(df.head())
 
     # Summary statistics
     st.write("### Summary Statistics")
-    st.write(df.describe())
+    with span("describe"):
+        summary = df.describe()
+    st.write(summary)
 
     # Individual food item analysis
     st.write("### Individual Food Item Analysis")
@@ -107,9 +131,10 @@ try:
 
     # Correlation heatmap
     st.write("### Correlation Heatmap")
-    corr = df[nutrients].corr()
-    fig, ax = plt.subplots(figsize=(10, 8))
-    sns.heatmap(corr, annot=True, cmap="coolwarm", ax=ax)
+    with span("render_charts"):
+        corr = df[nutrients].corr()
+        fig, ax = plt.subplots(figsize=(10, 8))
+        sns.heatmap(corr, annot=True, cmap="coolwarm", ax=ax)
     st.pyplot(fig)
 
 except FileNotFoundError:
@@ -1,8 +1,14 @@
 import streamlit as st
+from lazy_imports import lazy_import
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-from wordcloud import WordCloud
+from startup import start_services
+
+start_services()
+
+# Heavy libraries are imported on first use
+plt = lazy_import("matplotlib.pyplot")
+px = lazy_import("plotly.express")
+wordcloud_lib = lazy_import("wordcloud")
 
 # App title
 st.title("Food Data Analysis App")
@@ -65,7 +71,7 @@ if uploaded_file:
     # Word Cloud for text columns
     if selected_column in text_columns:
         st.write(f"### Word Cloud for '{selected_column}'")
-        wordcloud = WordCloud(width=800, height=400, background_color="white").generate(
+        wordcloud = wordcloud_lib.WordCloud(width=800, height=400, background_color="white").generate(
             " ".join(df[selected_column].dropna())
         )
         fig, ax = plt.subplots(figsize=(10, 5))
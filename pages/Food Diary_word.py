@@ -1,7 +1,9 @@
 import streamlit as st
-from docx import Document
-import tempfile
 import re
+from report_downloads import report_download, request_report
+from startup import start_services
+
+start_services()
 
 
 def remove_emojis(text):
@@ -23,38 +25,6 @@ def remove_emojis(text):
     return emoji_pattern.sub(r"", text)
 
 
-def save_to_word(data, notes, rewards):
-    doc = Document()
-    doc.add_heading("Food Diary Summary", level=1)
-
-    # Add food diary data
-    for day, meals in data.items():
-        doc.add_heading(f"{day}", level=2)
-        for meal in meals:
-            doc.add_heading(meal["Meal Time"], level=3)
-            for key, value in meal.items():
-                if key != "Meal Time":
-                    doc.add_paragraph(f"{key}: {value}")
-
-    # Add additional notes
-    doc.add_heading("Additional Notes", level=2)
-    for key, value in notes.items():
-        doc.add_paragraph(f"{key}: {value}")
-
-    # Add rewards
-    doc.add_heading("Rewards", level=2)
-    if rewards:
-        for reward in rewards:
-            doc.add_paragraph(f"- {reward}")
-    else:
-        doc.add_paragraph("No rewards earned.")
-
-    # Save the document to a temporary file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".docx")
-    doc.save(temp_file.name)
-    return temp_file.name
-
-
 def main():
     st.title("🍎 Food Diary 🍔")
 
@@ -164,10 +134,8 @@ def main():
 
     # Generate Word Document
     if st.button("Generate Word Summary"):
-        word_file = save_to_word(food_diary, additional_notes, rewards)
-        st.success("Word document generated successfully!")
-        with open(word_file, "rb") as file:
-            st.download_button("Download Word Document", file, file_name="Food_Diary_Summary.docx")
+        request_report("food_diary", "food_diary", food_diary, additional_notes, rewards)
+    report_download("food_diary", "Food_Diary_Summary.docx", "Download Word Document")
 
 
 if __name__ == "__main__":
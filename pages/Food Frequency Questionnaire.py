@@ -1,4 +1,14 @@
 import streamlit as st
+from panini.questionnaire_engine import load_instrument, localized
+from questionnaire_forms import render_form, respondent_details
+from submission_store import submit
+from startup import start_services
+
+start_services()
+
+# Questions and options in English and Hindi: panini/instruments/ffq.yaml
+instrument = load_instrument("ffq")
+
 
 def main():
     st.title("Food Frequency Questionnaire (FFQ)")
@@ -13,81 +23,20 @@ def main():
         - **Always:** Daily
     """)
 
-    sections = {
-        "Fruits and Vegetables": [
-            "How often do you eat fresh fruits (e.g., apples, bananas, oranges)?",
-            "How often do you eat dried fruits (e.g., raisins, dates)?",
-            "How often do you eat green leafy vegetables (e.g., spinach, kale)?",
-            "How often do you eat starchy vegetables (e.g., potatoes, sweet potatoes)?",
-            "How often do you eat cruciferous vegetables (e.g., broccoli, cauliflower)?"
-        ],
-        "Grains and Cereals": [
-            "How often do you consume whole grains (e.g., brown rice, oats, quinoa)?",
-            "How often do you consume refined grains (e.g., white bread, pasta)?",
-            "How often do you eat breakfast cereals? Specify type:",
-            "How often do you eat baked goods (e.g., cookies, muffins, cakes)?"
-        ],
-        "Protein Sources": [
-            "How often do you consume red meat (e.g., beef, lamb)?",
-            "How often do you eat poultry (e.g., chicken, turkey)?",
-            "How often do you eat fish or seafood?",
-            "How often do you consume eggs?",
-            "How often do you eat plant-based proteins (e.g., lentils, chickpeas, tofu)?"
-        ],
-        "Dairy and Alternatives": [
-            "How often do you drink milk? Specify type (e.g., cow's milk, almond milk):",
-            "How often do you eat cheese?",
-            "How often do you eat yogurt? Specify type (e.g., Greek, low-fat):",
-            "How often do you consume dairy-free alternatives (e.g., soy milk, oat milk)?"
-        ],
-        "Snacks and Beverages": [
-            "How often do you eat salty snacks (e.g., chips, pretzels)?",
-            "How often do you eat sugary snacks (e.g., chocolate, candy)?",
-            "How often do you drink sugary beverages (e.g., soda, juice)?",
-            "How often do you drink caffeinated beverages (e.g., coffee, tea)?",
-            "How often do you consume alcohol? Specify type:"
-        ],
-        "Fats and Oils": [
-            "How often do you use butter or margarine?",
-            "How often do you use cooking oils? Specify type (e.g., olive, coconut):",
-            "How often do you consume high-fat condiments (e.g., mayonnaise, salad dressings)?"
-        ],
-        "Eating Habits": [
-            "How often do you eat meals prepared at home?",
-            "How often do you eat meals from restaurants or takeaways?",
-            "How often do you skip breakfast?",
-            "How often do you snack between meals?"
-        ],
-        "Special Foods": [
-            "How often do you consume organic foods?",
-            "How often do you eat fortified foods (e.g., vitamin D-enriched milk)?",
-            "How often do you eat fast foods (e.g., burgers, pizzas)?",
-            "How often do you consume cultural or traditional dishes? Specify:"
-        ],
-        "Supplements": [
-            "How often do you take multivitamins?",
-            "How often do you take omega-3 or fish oil supplements?",
-            "How often do you take protein supplements (e.g., whey, plant protein)?",
-            "Do you use meal replacement products (e.g., shakes, bars)? How often?"
-        ]
-    }
+    respondent = respondent_details()
 
+    answers, remarks = render_form(instrument)
     responses = {}
-    for section, questions in sections.items():
-        st.header(section)
-        responses[section] = []
-        for question in questions:
-            response = st.radio(
-                question,
-                ("Never", "Rarely", "Sometimes", "Often", "Always", "Other"),
-                index=0
-            )
-            remark = ""
-            if response == "Other":
-                remark = st.text_input(f"Remarks for '{question}':", "")
-            responses[section].append({"question": question, "response": response, "remark": remark})
+    for section in instrument.sections:
+        responses[localized(section["title"])] = [
+            {"question": localized(item["text"]), "response": answers[item["id"]], "remark": remarks.get(item["id"], "")}
+            for item in section["items"]
+        ]
 
     if st.button("Submit"):
+        section_scores, overall_score, _, _ = instrument.score(answers)
+        submit("ffq", answers, section_scores=section_scores, overall=overall_score, remarks=remarks,
+               **respondent)
         st.success("Thank you for completing the questionnaire!")
         st.write("Your responses:")
         st.json(responses)
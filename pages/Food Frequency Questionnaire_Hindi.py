@@ -1,4 +1,14 @@
 import streamlit as st
+from panini.questionnaire_engine import load_instrument, localized
+from questionnaire_forms import render_form, respondent_details
+from submission_store import submit
+from startup import start_services
+
+start_services()
+
+# Questions and options in English and Hindi: panini/instruments/ffq.yaml
+instrument = load_instrument("ffq")
+
 
 def main():
     st.title("भोजन आवृत्ति प्रश्नावली (FFQ)")
@@ -14,6 +24,8 @@ def main():
         st.warning("कृपया नाम और मोबाइल नंबर भरें।")
         return
 
+    respondent = respondent_details()
+
     st.markdown("""
     **निर्देश:**
     * कृपया नीचे दिए गए पैमाने का उपयोग करके बताएं कि आप निम्नलिखित खाद्य पदार्थ कितनी बार खाते हैं:
@@ -24,81 +36,19 @@ def main():
         - **हमेशा:** प्रतिदिन
     """)
 
-    sections = {
-        "फल और सब्जियां": [
-            "आप ताजे फल (जैसे सेब, केले, संतरे) कितनी बार खाते हैं?",
-            "आप सूखे मेवे (जैसे किशमिश, खजूर) कितनी बार खाते हैं?",
-            "आप हरी पत्तेदार सब्जियां (जैसे पालक, केल) कितनी बार खाते हैं?",
-            "आप स्टार्च वाली सब्जियां (जैसे आलू, शकरकंद) कितनी बार खाते हैं?",
-            "आप क्रूसीफेरस सब्जियां (जैसे ब्रोकली, फूलगोभी) कितनी बार खाते हैं?"
-        ],
-        "अनाज और सीरियल्स": [
-            "आप साबुत अनाज (जैसे ब्राउन राइस, ओट्स, क्विनोआ) कितनी बार खाते हैं?",
-            "आप परिष्कृत अनाज (जैसे सफेद ब्रेड, पास्ता) कितनी बार खाते हैं?",
-            "आप नाश्ते के सीरियल्स कितनी बार खाते हैं? प्रकार निर्दिष्ट करें:",
-            "आप बेक्ड वस्तुएं (जैसे कुकीज, मफिन्स, केक) कितनी बार खाते हैं?"
-        ],
-        "प्रोटीन स्रोत": [
-            "आप लाल मांस (जैसे बीफ, भेड़ का मांस) कितनी बार खाते हैं?",
-            "आप पोल्ट्री (जैसे चिकन, टर्की) कितनी बार खाते हैं?",
-            "आप मछली या समुद्री भोजन कितनी बार खाते हैं?",
-            "आप अंडे कितनी बार खाते हैं?",
-            "आप पौधों आधारित प्रोटीन (जैसे दालें, चने, टोफू) कितनी बार खाते हैं?"
-        ],
-        "डेयरी और विकल्प": [
-            "आप दूध कितनी बार पीते हैं? प्रकार निर्दिष्ट करें (जैसे गाय का दूध, बादाम का दूध):",
-            "आप पनीर कितनी बार खाते हैं?",
-            "आप दही कितनी बार खाते हैं? प्रकार निर्दिष्ट करें (जैसे ग्रीक, लो-फैट):",
-            "आप डेयरी-मुक्त विकल्प (जैसे सोया दूध, ओट दूध) कितनी बार पीते हैं?"
-        ],
-        "नाश्ता और पेय": [
-            "आप नमकीन नाश्ता (जैसे चिप्स, प्रेट्ज़ल्स) कितनी बार खाते हैं?",
-            "आप मीठा नाश्ता (जैसे चॉकलेट, कैंडी) कितनी बार खाते हैं?",
-            "आप मीठे पेय (जैसे सोडा, जूस) कितनी बार पीते हैं?",
-            "आप कैफीन युक्त पेय (जैसे कॉफी, चाय) कितनी बार पीते हैं?",
-            "आप शराब कितनी बार पीते हैं? प्रकार निर्दिष्ट करें:"
-        ],
-        "वसा और तेल": [
-            "आप मक्खन या मार्जरीन कितनी बार उपयोग करते हैं?",
-            "आप खाना पकाने के तेल कितनी बार उपयोग करते हैं? प्रकार निर्दिष्ट करें (जैसे जैतून का तेल, नारियल का तेल):",
-            "आप उच्च वसा वाले मसाले (जैसे मेयोनेज़, सलाद ड्रेसिंग्स) कितनी बार खाते हैं?"
-        ],
-        "खान-पान की आदतें": [
-            "आप घर पर बना खाना कितनी बार खाते हैं?",
-            "आप रेस्त्रां या टेकअवे का खाना कितनी बार खाते हैं?",
-            "आप नाश्ता कितनी बार छोड़ते हैं?",
-            "आप भोजन के बीच नाश्ता कितनी बार करते हैं?"
-        ],
-        "विशेष खाद्य पदार्थ": [
-            "आप जैविक खाद्य पदार्थ कितनी बार खाते हैं?",
-            "आप फोर्टिफाइड खाद्य पदार्थ (जैसे विटामिन डी युक्त दूध) कितनी बार खाते हैं?",
-            "आप फास्ट फूड (जैसे बर्गर, पिज्जा) कितनी बार खाते हैं?",
-            "आप सांस्कृतिक या पारंपरिक व्यंजन कितनी बार खाते हैं? निर्दिष्ट करें:"
-        ],
-        "पूरक आहार": [
-            "आप मल्टीविटामिन्स कितनी बार लेते हैं?",
-            "आप ओमेगा-3 या फिश ऑयल सप्लीमेंट्स कितनी बार लेते हैं?",
-            "आप प्रोटीन सप्लीमेंट्स (जैसे व्हे, प्लांट प्रोटीन) कितनी बार लेते हैं?",
-            "क्या आप मील रिप्लेसमेंट उत्पादों (जैसे शेक्स, बार्स) का उपयोग करते हैं? कितनी बार?"
-        ]
-    }
-
+    answers, remarks = render_form(instrument, language="hi")
+    labels = instrument.option_labels("hi")
     responses = {}
-    for section, questions in sections.items():
-        st.header(section)
-        responses[section] = []
-        for question in questions:
-            response = st.radio(
-                question,
-                ("कभी नहीं", "कभी-कभार", "कभी-कभी", "अक्सर", "हमेशा", "अन्य"),
-                index=0
-            )
-            remark = ""
-            if response == "अन्य":
-                remark = st.text_input(f"'{question}' के लिए टिप्पणी दर्ज करें:", "")
-            responses[section].append({"प्रश्न": question, "उत्तर": response, "टिप्पणी": remark})
+    for section in instrument.sections:
+        responses[localized(section["title"], "hi")] = [
+            {"प्रश्न": localized(item["text"], "hi"), "उत्तर": labels[answers[item["id"]]], "टिप्पणी": remarks.get(item["id"], "")}
+            for item in section["items"]
+        ]
 
     if st.button("जमा करें"):
+        section_scores, overall_score, _, _ = instrument.score(answers, language="hi")
+        submit("ffq", answers, section_scores=section_scores, overall=overall_score, remarks=remarks,
+               language="hi", **respondent)
         st.success("प्रश्नावली पूरा करने के लिए धन्यवाद!")
         st.write("आपके उत्तर:")
         st.json(responses)
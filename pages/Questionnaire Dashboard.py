@@ -0,0 +1,101 @@
+import streamlit as st
+import pandas as pd
+from panini.questionnaire_engine import load_instrument, localized
+from score_cubes import DIMENSIONS, cube_metrics, cube_summary, dimension_values
+from submission_store import IPAQ, get_connection, rebuild_cubes, stored_instruments
+from startup import start_services
+from tracing import set_page, span
+
+set_page(__file__)
+start_services()
+
+DIMENSION_LABELS = {"month": "Month", "age_band": "Age band", "sex": "Sex", "site": "Site"}
+IPAQ_METRIC_LABELS = {
+    "overall": "Total (MET-minutes/week)",
+    "vigorous": "Vigorous (MET-minutes/week)",
+    "moderate": "Moderate (MET-minutes/week)",
+    "walking": "Walking (MET-minutes/week)",
+    "sitting": "Sitting (minutes/day)",
+}
+
+
+def instrument_title(name):
+    return "International Physical Activity Questionnaire (IPAQ)" if name == IPAQ else load_instrument(name).title()
+
+
+def metric_labels(name):
+    if name == IPAQ:
+        return IPAQ_METRIC_LABELS
+    labels = {"overall": "Overall"}
+    labels.update({section["id"]: localized(section["title"]) for section in load_instrument(name).sections})
+    return labels
+
+
+def dashboard(conn):
+    """
+    Score selection, filters and summaries for one questionnaire, read from the summary tables.
+    """
+    name = st.selectbox("Questionnaire", stored_instruments(), format_func=instrument_title)
+    labels = metric_labels(name)
+    metrics = [metric for metric in labels if metric in cube_metrics(conn, name)]
+
+    if not metrics:
+        st.info("No submissions stored for this questionnaire yet.")
+        return
+
+    metric = st.selectbox("Score", metrics, format_func=labels.get)
+    values = dimension_values(conn, name)
+
+    st.sidebar.header("Filters")
+    filters = {
+        dimension: st.sidebar.multiselect(DIMENSION_LABELS[dimension], values[dimension])
+        for dimension in DIMENSIONS
+    }
+    group_by = st.multiselect("Break down by", DIMENSIONS, default=["age_band"], format_func=DIMENSION_LABELS.get,
+                              max_selections=2)
+
+    with span("filter"):
+        overall = cube_summary(conn, name, metric, filters=filters)
+        summary = pd.DataFrame(cube_summary(conn, name, metric, group_by, filters))
+
+    if not overall:
+        st.warning("No submissions match the filters.")
+        return
+
+    st.subheader(labels[metric])
+    total = overall[0]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Submissions", f"{total['count']:,}")
+    col2.metric("Mean", f"{total['mean']:.2f}")
+    col3.metric("Standard deviation", f"{total['std']:.2f}")
+
+    if group_by:
+        summary = summary.rename(columns=DIMENSION_LABELS)
+        groups = [DIMENSION_LABELS[dimension] for dimension in group_by]
+        st.dataframe(summary.rename(columns={"count": "Submissions", "mean": "Mean", "std": "SD"}), hide_index=True)
+        if len(groups) == 1:
+            st.bar_chart(summary.set_index(groups[0])["mean"])
+        else:
+            st.bar_chart(summary.pivot(index=groups[0], columns=groups[1], values="mean"))
+
+    with st.expander("Maintenance"):
+        st.write("Recompute the summary tables from the stored submissions, e.g. after restoring a backup.")
+        if st.button("Rebuild Summaries"):
+            with span("compute"):
+                rebuild_cubes(conn)
+            st.success("Summaries rebuilt.")
+
+
+st.title("Questionnaire Cohort Dashboard")
+st.markdown("""
+**Purpose:**
+Compare stored questionnaire scores across age bands, sex, sites and months. Figures come from summary
+tables that are updated as each submission is saved, so filtering stays instant however many submissions there are.
+""")
+
+# One connection per rerun, as every filter change reruns the page
+conn = get_connection()
+try:
+    dashboard(conn)
+finally:
+    conn.close()
@@ -1,17 +1,25 @@
 import streamlit as st
 import pandas as pd
 import os
+from pathlib import Path
+from dataset_registry import RECIPE_CHUNK_COUNT, load_dataset
+from startup import start_services
+from tracing import set_page, span
+
+set_page(__file__)
+start_services()
 
 # Function to load data from selected files
 @st.cache_data
 def load_data(file_list):
-    # Combine all selected CSV files into one DataFrame
-    data = pd.concat([pd.read_csv(file) for file in file_list], ignore_index=True)
+    # Combine all selected CSV files into one DataFrame, cached per selection so "All" is not re-concatenated
+    # on every rerun; each chunk is parsed once per server process
+    data = pd.concat([load_dataset(Path(file).stem) for file in file_list], ignore_index=True)
     return data
 
 # Function to get all file paths
 def get_file_paths():
-    file_paths = [f"data/recipechunk_{i}.csv" for i in range(1, 36)]
+    file_paths = [f"data/recipechunk_{i}.csv" for i in range(1, RECIPE_CHUNK_COUNT + 1)]
     return file_paths
 
 # App title
@@ -19,7 +27,7 @@ st.title("Recipe Explorer")
 
 # Sidebar - File Selection
 st.sidebar.header("Select Files")
-file_options = ["All"] + [f"recipechunk_{i}.csv" for i in range(1, 36)]
+file_options = ["All"] + [f"recipechunk_{i}.csv" for i in range(1, RECIPE_CHUNK_COUNT + 1)]
 selected_files = st.sidebar.multiselect("Choose files to load:", file_options, default="recipechunk_2.csv")
 
 # Determine files to load
@@ -31,7 +39,8 @@ else:
 
 # Load data
 if selected_file_paths:
-    data = load_data(selected_file_paths)
+    with span("load_data"):
+        data = load_data(selected_file_paths)
 
     # Sidebar filters
     st.sidebar.header("Filter Recipes")
@@ -58,11 +67,12 @@ if selected_file_paths:
     )
 
     # Filter data
-    filtered_data = data[
-        (data['Cuisine'].isin(cuisines)) &
-        (data['Course'].isin(courses)) &
-        (data['Diet'].isin(diets))
-    ]
+    with span("filter"):
+        filtered_data = data[
+            (data['Cuisine'].isin(cuisines)) &
+            (data['Course'].isin(courses)) &
+            (data['Diet'].isin(diets))
+        ]
 
     # Display filtered recipes
     st.subheader(f"Showing {len(filtered_data)} Recipes")
@@ -85,7 +95,8 @@ if selected_file_paths:
     search_term = st.sidebar.text_input("Search by Recipe Name")
 
     if search_term:
-        search_results = data[data['RecipeName'].str.contains(search_term, case=False, na=False)]
+        with span("search"):
+            search_results = data[data['RecipeName'].str.contains(search_term, case=False, na=False)]
         st.subheader(f"Search Results for '{search_term}': {len(search_results)} Recipes Found")
         for index, row in search_results.iterrows():
             with st.expander(f"{row['RecipeName']}"):
@@ -0,0 +1,158 @@
+import streamlit as st
+from collections import Counter
+from io import BytesIO
+import pandas as pd
+from dataset_registry import load_dataset
+from panini.cohort import (
+    ENERGY_METRICS,
+    REQUIRED_COLUMNS,
+    cohort_to_csv,
+    compute_cohort_energy,
+    read_cohort,
+    summarize_cohort,
+)
+from panini.diet_planner import (
+    MEAL_CALORIE_SHARES,
+    MEAL_SECTIONS,
+    MEAL_STRUCTURE,
+    OUR_DIET_MEAL_SECTIONS,
+    OUR_DIET_MEAL_STRUCTURE,
+    batch_chart_table,
+    generate_batch_charts,
+    prepare_diet_data,
+)
+from panini.energy import GOALS, ICMR_ACTIVITY_LEVELS
+from panini.reports import create_batch_diet_chart_zip
+from startup import start_services
+from tracing import set_page, span
+
+set_page(__file__)
+start_services()
+
+# Diet table -> (meal structure, PDF sections, scale items to the calorie target)
+DIET_TABLES = {
+    "mydiet": (MEAL_STRUCTURE, MEAL_SECTIONS, False),
+    "our_diet": (OUR_DIET_MEAL_STRUCTURE, OUR_DIET_MEAL_SECTIONS, True),
+}
+
+# Column used as the person id when present; row numbers otherwise
+ID_COLUMNS = ["id", "patient_id", "name"]
+
+
+@st.cache_data(show_spinner=False)
+def process_upload(data, file_name, default_activity_level, default_goal):
+    # Cached on the file contents and defaults, so other widgets do not recompute the cohort
+    with span("compute"):
+        return compute_cohort_energy(read_cohort(BytesIO(data), file_name), default_activity_level, default_goal)
+
+
+def _id_text(value):
+    # Blank ids are None; whole-number floats (ids read from a column with blanks) lose their ".0"
+    if pd.isna(value) or not str(value).strip():
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def person_ids(results):
+    """
+    One unique key per row for the diet charts, so no person's chart replaces another's.
+    Returns:
+        tuple: (ids as a list, ids given to more than one row). Blank ids become "row<n>" and repeated
+        ids "<id>_row<n>", n being the row number.
+    """
+    rows = range(1, len(results) + 1)
+    column = next((column for column in ID_COLUMNS if column in results.columns), None)
+    if column is None:
+        return [str(row) for row in rows], []
+    values = [_id_text(value) for value in results[column]]
+    counts = Counter(value for value in values if value is not None)
+    repeated = [value for value, count in counts.items() if count > 1]
+    ids = [
+        f"row{row}" if value is None else f"{value}_row{row}" if counts[value] > 1 else value
+        for value, row in zip(values, rows)
+    ]
+    return ids, repeated
+
+
+st.title("Energy Requirements and Diet Charts for a Cohort")
+st.markdown("""
+**Purpose:**
+Upload a patient table to compute BMR (Mifflin-St Jeor), energy expenditure, calorie targets, macronutrients and
+ICMR RDAs for everyone at once, then generate a diet chart for each person from their calorie target.
+""")
+st.markdown(
+    f"**Required columns:** {', '.join(REQUIRED_COLUMNS)} (weight in kg, height in cm, sex as Male/Female, M/F or 1/0).  \n"
+    "**Optional columns:** id, activity_level, goal, pregnant, lactating and veg_only (Yes/No)."
+)
+
+uploaded_file = st.file_uploader("Upload patient table", type=["csv", "parquet"])
+default_activity_level = st.selectbox("Activity level where not given", list(ICMR_ACTIVITY_LEVELS.keys()))
+default_goal = st.selectbox("Goal where not given", GOALS, index=GOALS.index("Maintenance"))
+
+if uploaded_file is not None:
+    try:
+        results = process_upload(uploaded_file.getvalue(), uploaded_file.name, default_activity_level, default_goal)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    st.header("Results")
+    invalid = results["bmr"].isna().sum()
+    st.write(f"{len(results)} people processed.")
+    if invalid:
+        st.warning(f"{invalid} row(s) have missing or invalid weight, height, age or sex and were left blank.")
+    st.dataframe(results)
+    st.download_button(
+        "Download Results (CSV)",
+        cohort_to_csv(results),
+        file_name="energy_requirements_cohort.csv",
+        mime="text/csv",
+    )
+
+    st.header("Summary")
+    st.dataframe(summarize_cohort(results, ENERGY_METRICS))
+    st.write("RDA groups: " + ", ".join(f"{group}: {count}" for group, count in results["rda_group"].value_counts().items()))
+
+    st.header("Diet Charts")
+    st.write("Each person's calorie target is split across meals as " +
+             ", ".join(f"{meal} {share:.0%}" for meal, share in MEAL_CALORIE_SHARES.items()) + ".")
+    diet_table = st.selectbox("Food table", list(DIET_TABLES))
+    days = st.number_input("Number of days", min_value=1, max_value=30, value=7)
+    veg_only_default = st.radio("Vegetarian-only where not given", options=[True, False], format_func=lambda x: "Yes" if x else "No")
+    seed = st.number_input("Random seed (same seed, same charts)", min_value=0, value=0)
+    include_pdfs = st.checkbox("Also build one PDF per person (slower)")
+
+    if st.button("Generate Diet Charts"):
+        meal_structure, meal_sections, scale_items = DIET_TABLES[diet_table]
+        ids, repeated = person_ids(results)
+        if repeated:
+            st.warning("These ids are used by more than one row, so their charts are labelled with the row number: "
+                       + ", ".join(repeated))
+        calorie_targets = dict(zip(ids, results["calorie_target"]))
+        if "veg_only" in results.columns:
+            veg_only = {
+                person: veg_only_default if pd.isna(value) else str(value).strip()[:1].upper() in ("Y", "T", "1")
+                for person, value in zip(ids, results["veg_only"])
+            }
+        else:
+            veg_only = veg_only_default
+
+        with span("generate_plan"):
+            batch = generate_batch_charts(
+                prepare_diet_data(load_dataset(diet_table)), calorie_targets, veg_only,
+                days=days, meal_structure=meal_structure, scale_items=scale_items, seed=seed,
+            )
+        st.success(f"Diet charts generated for {len(batch)} people.")
+        st.download_button(
+            "Download Diet Charts (CSV)",
+            cohort_to_csv(batch_chart_table(batch)),
+            file_name="diet_charts_cohort.csv",
+            mime="text/csv",
+        )
+        if include_pdfs:
+            with span("report"):
+                archive = create_batch_diet_chart_zip(batch, meal_sections)
+            st.download_button("Download Diet Chart PDFs (ZIP)", archive, file_name="diet_charts_cohort.zip",
+                               mime="application/zip")
@@ -1,80 +1,27 @@
 import streamlit as st
-import matplotlib.pyplot as plt
+from lazy_imports import lazy_import
 import numpy as np
 from math import pi
-from docx import Document
-from docx.shared import Inches
-import tempfile
-
-# Constants
-activity_levels = {
-    "Sedentary": 1.2,
-    "Lightly Active": 1.375,
-    "Moderately Active": 1.55,
-    "Very Active": 1.725,
-    "Extra Active": 1.9
-}
-
-icmr_rda = {
-    "Male": {"Energy": 2425, "Protein (g)": 60, "Fat (g)": 25, "Carbohydrates (g)": 364, "Iron (mg)": 17,
-             "Calcium (mg)": 600, "Sodium (mg)": 2000, "Potassium (mg)": 3500},
-    "Female": {"Energy": 1875, "Protein (g)": 50, "Fat (g)": 20, "Carbohydrates (g)": 281, "Iron (mg)": 21,
-               "Calcium (mg)": 600, "Sodium (mg)": 2000, "Potassium (mg)": 3500},
-    "Pregnant": {"Energy": 350 + 1875, "Protein (g)": 65, "Fat (g)": 25, "Carbohydrates (g)": 300, "Iron (mg)": 35,
-                 "Calcium (mg)": 1200, "Sodium (mg)": 2000, "Potassium (mg)": 3500},
-    "Lactating": {"Energy": 600 + 1875, "Protein (g)": 75, "Fat (g)": 30, "Carbohydrates (g)": 325, "Iron (mg)": 21,
-                  "Calcium (mg)": 1200, "Sodium (mg)": 2000, "Potassium (mg)": 3500}
-}
-
-
-def calculate_bmr(age, gender, weight, height):
-    if gender == "Male":
-        return 10 * weight + 6.25 * height - 5 * age + 5  # Mifflin-St Jeor
-    else:
-        return 10 * weight + 6.25 * height - 5 * age - 161  # Mifflin-St Jeor
-
-
-def calculate_energy_expenditure(bmr, activity_level):
-    return bmr * activity_levels[activity_level]
-
-
-def macronutrient_distribution(total_energy, protein_g, fat_g):
-    protein_cal = protein_g * 4
-    fat_cal = fat_g * 9
-    carb_cal = total_energy - (protein_cal + fat_cal)
-    return {
-        "Protein": protein_cal,
-        "Fat": fat_cal,
-        "Carbohydrates": carb_cal
-    }
-
-
-def generate_word_report(inputs, rda, energy_expenditure, macronutrients, images):
-    doc = Document()
-    doc.add_heading('Personalized Diet Recommendation', level=1)
-    doc.add_heading('User Details', level=2)
-    for key, value in inputs.items():
-        doc.add_paragraph(f"{key}: {value}")
-
-    doc.add_heading('Energy Expenditure and RDA', level=2)
-    for key, value in rda.items():
-        doc.add_paragraph(f"{key}: {value}")
-    doc.add_paragraph(f"Energy Expenditure: {energy_expenditure:.2f} kcal/day")
-
-    doc.add_heading('Macronutrient Distribution', level=2)
-    for key, value in macronutrients.items():
-        doc.add_paragraph(f"{key}: {value:.2f} kcal")
-
-    doc.add_heading('Visualizations', level=2)
-    for title, image_path in images.items():
-        doc.add_heading(title, level=3)
-        doc.add_picture(image_path, width=Inches(5.0))
-
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".docx")
-    doc.save(temp_file.name)
-    return temp_file.name
-
-
+from panini.charts import figure_to_png
+from panini.energy import (
+    ICMR_ACTIVITY_LEVELS,
+    calculate_bmr,
+    calculate_tdee,
+    macronutrient_distribution,
+    select_icmr_rda,
+)
+from report_downloads import report_download, request_report
+from startup import start_services
+from tracing import set_page, span, traced
+
+set_page(__file__)
+start_services()
+
+# Heavy libraries are imported on first use
+plt = lazy_import("matplotlib.pyplot")
+
+
+@traced("render_charts")
 def plot_visualizations(rda, macronutrients):
     # Bar Chart
     categories = list(rda.keys())
@@ -84,8 +31,8 @@ def plot_visualizations(rda, macronutrients):
     ax1.set_title('RDA Breakdown', fontsize=14)
     ax1.set_ylabel('Amount', fontsize=12)
     ax1.set_xticklabels(categories, rotation=45, ha='right', fontsize=10)
-    st.pyplot(fig1)
-    bar_chart_path = save_plot_as_image(fig1)
+    bar_chart_png = figure_to_png(fig1)
+    st.image(bar_chart_png)
 
     # Pie Chart
     macronutrient_labels = macronutrients.keys()
@@ -93,15 +40,15 @@ def plot_visualizations(rda, macronutrients):
     fig2, ax2 = plt.subplots()
     ax2.pie(macronutrient_values, labels=macronutrient_labels, autopct='%1.1f%%', startangle=140)
     ax2.set_title('Macronutrient Composition', fontsize=14)
-    st.pyplot(fig2)
-    pie_chart_path = save_plot_as_image(fig2)
+    pie_chart_png = figure_to_png(fig2)
+    st.image(pie_chart_png)
 
     # Radar Chart
     fig3 = radar_chart(rda)
-    st.pyplot(fig3)
-    radar_chart_path = save_plot_as_image(fig3)
+    radar_chart_png = figure_to_png(fig3)
+    st.image(radar_chart_png)
 
-    return bar_chart_path, pie_chart_path, radar_chart_path
+    return bar_chart_png, pie_chart_png, radar_chart_png
 
 
 def radar_chart(rda):
@@ -122,12 +69,6 @@ def radar_chart(rda):
     return fig
 
 
-def save_plot_as_image(fig):
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-    fig.savefig(temp_file.name, bbox_inches="tight")
-    return temp_file.name
-
-
 def main():
     st.title("Personalized Diet Recommendation")
     st.markdown("""
@@ -141,21 +82,16 @@ def main():
     gender = st.selectbox("Gender", ["Male", "Female"])
     weight = st.number_input("Weight (kg)", min_value=1.0, max_value=200.0, value=70.0)
     height = st.number_input("Height (cm)", min_value=50.0, max_value=250.0, value=170.0)
-    activity_level = st.selectbox("Activity Level", list(activity_levels.keys()))
+    activity_level = st.selectbox("Activity Level", list(ICMR_ACTIVITY_LEVELS.keys()))
     is_pregnant = st.checkbox("Pregnant") if gender == "Female" else False
     is_lactating = st.checkbox("Lactating") if gender == "Female" else False
 
     # BMR and Energy Expenditure
-    bmr = calculate_bmr(age, gender, weight, height)
-    energy_expenditure = calculate_energy_expenditure(bmr, activity_level)
+    bmr = calculate_bmr(gender, weight, height, age)
+    energy_expenditure = calculate_tdee(bmr, activity_level, ICMR_ACTIVITY_LEVELS)
 
     # RDA Selection
-    if is_pregnant:
-        rda = icmr_rda["Pregnant"]
-    elif is_lactating:
-        rda = icmr_rda["Lactating"]
-    else:
-        rda = icmr_rda[gender]
+    rda = select_icmr_rda(gender, is_pregnant, is_lactating)
 
     # Macronutrient Distribution
     macronutrients = macronutrient_distribution(rda["Energy"], rda["Protein (g)"], rda["Fat (g)"])
@@ -173,10 +109,10 @@ def main():
 
     # Visualizations
     st.subheader("Visualizations")
-    bar_chart_path, pie_chart_path, radar_chart_path = plot_visualizations(rda, macronutrients)
+    bar_chart_png, pie_chart_png, radar_chart_png = plot_visualizations(rda, macronutrients)
 
     # Generate Word Report
-    if st.button("Download Report"):
+    if st.button("Generate Report"):
         inputs = {
             "Age": age,
             "Gender": gender,
@@ -187,13 +123,13 @@ def main():
             "Lactating": is_lactating
         }
         images = {
-            "Bar Chart": bar_chart_path,
-            "Pie Chart": pie_chart_path,
-            "Radar Chart": radar_chart_path
+            "Bar Chart": bar_chart_png,
+            "Pie Chart": pie_chart_png,
+            "Radar Chart": radar_chart_png
         }
-        word_file = generate_word_report(inputs, rda, energy_expenditure, macronutrients, images)
-        with open(word_file, "rb") as file:
-            st.download_button("Download Report", file, file_name="Personalized_Diet_Report.docx")
+        with span("report"):
+            request_report("rda", "rda", inputs, rda, energy_expenditure, macronutrients, images)
+    report_download("rda", "Personalized_Diet_Report.docx")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,17 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+from lazy_imports import lazy_import
+from dataset_registry import load_dataset
+from startup import start_services
+from tracing import set_page, span
+
+set_page(__file__)
+start_services()
+
+# Heavy libraries are imported on first use
+plt = lazy_import("matplotlib.pyplot")
 
 # Load the cleaned dataset
-data_path = 'data/cleaned_food_data.csv'
-food_data = pd.read_csv(data_path)
+food_data = load_dataset("cleaned_food_data")
 
 # Streamlit app title
 st.title("Food Nutrient Explorer")
@@ -22,12 +29,13 @@ st.header("Filter Food Items")
 energy_range = st.slider("Select Energy Range (kcal)", 0, int(food_data['energy_kcal'].max()), (0, 500))
 protein_range = st.slider("Select Protein Range (g)", 0, int(food_data['protein'].max()), (0, 50))
 
-filtered_data = food_data[
-    (food_data['energy_kcal'] >= energy_range[0]) &
-    (food_data['energy_kcal'] <= energy_range[1]) &
-    (food_data['protein'] >= protein_range[0]) &
-    (food_data['protein'] <= protein_range[1])
-]
+with span("filter"):
+    filtered_data = food_data[
+        (food_data['energy_kcal'] >= energy_range[0]) &
+        (food_data['energy_kcal'] <= energy_range[1]) &
+        (food_data['protein'] >= protein_range[0]) &
+        (food_data['protein'] <= protein_range[1])
+    ]
 st.write("Filtered Data:", filtered_data)
 
 # Visualization: Nutrient Distribution
@@ -39,8 +47,9 @@ st.bar_chart(food_data.groupby('food_group')[nutrient].mean())
 st.header("Search Food Items")
 search_query = st.text_input("Enter food name or group:")
 if search_query:
-    search_results = food_data[
-        food_data['food_name'].str.contains(search_query, case=False, na=False) |
-        food_data['food_group'].str.contains(search_query, case=False, na=False)
-    ]
+    with span("search"):
+        search_results = food_data[
+            food_data['food_name'].str.contains(search_query, case=False, na=False) |
+            food_data['food_group'].str.contains(search_query, case=False, na=False)
+        ]
     st.write("Search Results:", search_results)
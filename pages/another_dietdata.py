@@ -1,20 +1,20 @@
 import streamlit as st
+from lazy_imports import lazy_import
+from dataset_registry import load_dataset
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from startup import start_services
 
-# Load the CSV data
-@st.cache_data
-def load_data():
-    # Replace with your CSV file path
-    data = pd.read_csv("data/newdatadiet.csv")
-    return data
+start_services()
+
+# Heavy libraries are imported on first use
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 # App title
 st.title("Nutrition Data Analysis")
 
 # Load data
-data = load_data()
+data = load_dataset("newdatadiet")
 numeric_columns = [
     "energy_kcal", "protein_g", "carb_g", "fat_g", "fibre_g", "sfa_mg", "mufa_mg",
     "pufa_mg", "cholesterol_mg", "calcium_mg", "phosphorus_mg", "magnesium_mg",
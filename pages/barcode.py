@@ -1,60 +1,131 @@
 import streamlit as st
-import requests
-import json
+import pandas as pd
+from lazy_imports import lazy_import
+from indb import products_to_indb
+from product_store import lookup_products, parse_barcode_list, product_details
+from startup import start_services
 
-# Function to fetch food details from OpenFoodFacts API
+start_services()
+
+# OpenCV, Pillow and pyzbar load only when an image is decoded
+barcode_decoder = lazy_import("barcode_decoder")
+
+# Function to fetch food details, from the local product store first and OpenFoodFacts on a miss
 def fetch_food_details(barcode):
-    url = f"https://world.openfoodfacts.org/api/v0/product/{barcode}.json"
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        product_data = response.json()
-        if product_data.get("status") == 1:  # Product found
-            product = product_data.get("product", {})
-            details = {
-                "Product Name": product.get("product_name", "N/A"),
-                "Brand": product.get("brands", "N/A"),
-                "Calories (kcal)": product.get("nutriments", {}).get("energy-kcal_100g", "N/A"),
-                "Protein (g)": product.get("nutriments", {}).get("proteins_100g", "N/A"),
-                "Fat (g)": product.get("nutriments", {}).get("fat_100g", "N/A"),
-                "Carbohydrates (g)": product.get("nutriments", {}).get("carbohydrates_100g", "N/A"),
-                "Fiber (g)": product.get("nutriments", {}).get("fiber_100g", "N/A"),
-                "Sugars (g)": product.get("nutriments", {}).get("sugars_100g", "N/A"),
-            }
-            return details
-        else:
-            return None  # Product not found
-    else:
-        return None  # API error
+    products, failed = lookup_products([barcode], max_workers=1)
+    product = next(iter(products.values()), None)
+    if product is None:
+        return None  # Product not found or API error
+    return product_details(product)
 
 # Main Function
 def main():
     st.title("Food Barcode Scanner")
     st.markdown("""
-    Use this tool to scan food barcodes and fetch nutritional information.  
+    Use this tool to scan food barcodes and fetch nutritional information.
     Data is sourced from **OpenFoodFacts**, a free and open database of food products.
     """)
 
-    # Input barcode manually
-    barcode = st.text_input("Enter Barcode Number:")
-    if st.button("Fetch Food Details"):
-        if barcode:
-            food_details = fetch_food_details(barcode)
-            if food_details:
-                st.success("Product Found!")
-                st.json(food_details)
+    single_tab, bulk_tab, image_tab = st.tabs(["Single Barcode", "Bulk Lookup", "Scan Images"])
+
+    with single_tab:
+        # Input barcode manually
+        barcode = st.text_input("Enter Barcode Number:")
+        if st.button("Fetch Food Details"):
+            if barcode:
+                food_details = fetch_food_details(barcode)
+                if food_details:
+                    st.success("Product Found!")
+                    st.json(food_details)
+                else:
+                    st.error("Product not found. Please try another barcode.")
+            else:
+                st.warning("Please enter a valid barcode.")
+
+    with bulk_tab:
+        # Resolve a list of barcodes (e.g. a patient's pantry) in one go
+        st.markdown("Paste barcodes (one per line, or separated by commas), or upload a CSV with a `barcode` column.")
+        pasted = st.text_area("Barcodes:", height=150)
+        uploaded_file = st.file_uploader("Or upload a CSV", type=["csv"])
+
+        if st.button("Look Up All"):
+            barcodes = parse_barcode_list(pasted)
+            if uploaded_file:
+                df = pd.read_csv(uploaded_file, dtype=str)
+                columns = [col for col in df.columns if col.strip().lower() == "barcode"]
+                values = df[columns[0]] if columns else df.iloc[:, 0]
+                barcodes = list(dict.fromkeys(barcodes + parse_barcode_list("\n".join(values.dropna()))))
+
+            if not barcodes:
+                st.warning("Please enter at least one barcode.")
+            else:
+                with st.spinner(f"Looking up {len(barcodes)} barcodes..."):
+                    products, failed = lookup_products(barcodes)
+
+                found = [product_details(product) for product in products.values() if product]
+                not_found = [barcode for barcode, product in products.items() if product is None]
+                st.success(f"Found {len(found)} of {len(barcodes)} products.")
+                if not_found:
+                    st.warning(f"Not found: {', '.join(not_found)}")
+                if failed:
+                    st.error(f"Lookup failed (try again later): {', '.join(failed)}")
+
+                show_product_table(found, "barcode_products.csv")
+                show_indb_vectors([product for product in products.values() if product])
+
+    with image_tab:
+        # Decode barcodes from photos on the server (CPU only), then look the products up
+        uploaded_images = st.file_uploader(
+            "Upload barcode photos", type=["jpg", "jpeg", "png"], accept_multiple_files=True
+        )
+        camera_image = st.camera_input("Or take a photo")
+        images = [(f.name, f.getvalue()) for f in uploaded_images or []]
+        if camera_image:
+            images.append(("Camera", camera_image.getvalue()))
+
+        if images and st.button("Decode Barcodes"):
+            with st.spinner(f"Decoding {len(images)} images..."):
+                decoded = barcode_decoder.decode_images([data for _, data in images])
+            st.table([
+                {"Image": name, "Barcodes": ", ".join(codes) or "None detected"}
+                for (name, _), codes in zip(images, decoded)
+            ])
+
+            barcodes = list(dict.fromkeys(code for codes in decoded for code in codes))
+            if barcodes:
+                products, failed = lookup_products(barcodes)
+                found = [product_details(product) for product in products.values() if product]
+                if failed:
+                    st.error(f"Lookup failed (try again later): {', '.join(failed)}")
+                show_product_table(found, "scanned_products.csv")
+                show_indb_vectors([product for product in products.values() if product])
             else:
-                st.error("Product not found. Please try another barcode.")
-        else:
-            st.warning("Please enter a valid barcode.")
+                st.warning("No barcodes detected. Try a sharper, well-lit photo of the barcode.")
 
-    # Upload barcode image (Future Enhancement)
-    #st.markdown("### Barcode Image (Optional)")
-    #st.markdown("*This feature requires a barcode recognition API or library.*")
+# Display a nutrient table with a CSV download
+def show_product_table(found, file_name):
+    if found:
+        table = pd.DataFrame(found)
+        st.dataframe(table)
+        st.download_button(
+            label="Download Nutrient Table",
+            data=table.to_csv(index=False).encode("utf-8"),
+            file_name=file_name,
+            mime="text/csv",
+        )
 
-    #uploaded_file = st.file_uploader("Upload a Barcode Image (Optional)", type=["jpg", "jpeg", "png"])
-   # if uploaded_file:
-        #st.error("Barcode image scanning is currently unavailable. Please enter the barcode manually.")
+# Packaged products in the INDB nutrient schema, ready for the food analysis and diet pages
+def show_indb_vectors(products):
+    if products:
+        with st.expander("Nutrients in INDB format (per 100 g)"):
+            indb_rows = products_to_indb(products).dropna(axis=1, how="all")
+            st.dataframe(indb_rows)
+            st.download_button(
+                label="Download INDB-Format Table",
+                data=indb_rows.to_csv(index=False).encode("utf-8"),
+                file_name="products_indb_format.csv",
+                mime="text/csv",
+            )
 
 if __name__ == "__main__":
     main()
@@ -1,101 +1,78 @@
 import streamlit as st
-import requests
-from docx import Document
-import tempfile
-import matplotlib.pyplot as plt
-import networkx as nx
-
-# RxNorm and OpenFDA API URLs
-RXNORM_BASE_URL = "https://rxnav.nlm.nih.gov/REST"
-OPENFDA_URL = "https://api.fda.gov/drug/label.json"
-
-
-# Function to fetch RxCUI (RxNorm Concept Unique Identifier) for a drug
-def get_rxcui(drug_name):
-    url = f"{RXNORM_BASE_URL}/rxcui.json"
-    response = requests.get(url, params={"name": drug_name})
-    if response.status_code == 200:
-        data = response.json()
-        return data.get("idGroup", {}).get("rxnormId", [None])[0]
-    return None
-
-
-# Function to check interactions between drugs using RxNorm
-def check_interactions(rxcuis):
-    url = f"{RXNORM_BASE_URL}/interaction/list.json"
-    response = requests.get(url, params={"rxcuis": "+".join(rxcuis)})
-    if response.status_code == 200:
-        data = response.json()
-        interactions = data.get("fullInteractionTypeGroup", [])
-        return interactions
-    return None
-
-
-# Fallback: Fetch drug warnings using OpenFDA
-def fetch_drug_warnings(drug_name):
-    response = requests.get(OPENFDA_URL, params={"search": f"active_ingredient:{drug_name}", "limit": 1})
-    if response.status_code == 200:
-        data = response.json()
-        results = data.get("results", [])
-        if results:
-            return results[0].get("warnings", ["No warnings found"])
-    return None
-
-
-# Plot Interaction Network
-def plot_interaction_network(interactions):
-    graph = nx.Graph()
-    for interaction in interactions:
-        drugs = interaction.get("minConcept", [])
-        for i, drug1 in enumerate(drugs):
-            for j, drug2 in enumerate(drugs):
-                if i < j:
-                    graph.add_edge(drug1["name"], drug2["name"])
-
-    # Plot the graph
-    plt.figure(figsize=(10, 10))
-    pos = nx.spring_layout(graph)
-    nx.draw_networkx_nodes(graph, pos, node_size=500, node_color='lightblue')
-    nx.draw_networkx_edges(graph, pos, width=1.5)
-    nx.draw_networkx_labels(graph, pos, font_size=10)
-    plt.title("Drug Interaction Network", fontsize=16)
-
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-    plt.savefig(temp_file.name, bbox_inches='tight')
-    return temp_file.name
-
-
-# Generate Word Report
-def generate_word_report(drug_names, interactions, warnings, interaction_graph_path):
-    doc = Document()
-    doc.add_heading("Drug Interaction Report", level=1)
-
-    # Drug Names
-    doc.add_heading("Drugs Checked", level=2)
-    for drug in drug_names:
-        doc.add_paragraph(f"- {drug}")
-
-    # Interaction Details
-    doc.add_heading("Interactions", level=2)
-    if interactions:
-        for interaction in interactions:
-            doc.add_paragraph(interaction)
-    else:
-        doc.add_paragraph("No significant interactions found.")
+from lazy_imports import lazy_import
+from drug_interactions import run_interaction_check
+from dataset_registry import load_dataset
+from interaction_kb import check_food_interactions
+from panini.charts import figure_to_png
+from report_downloads import report_download, request_report
+from startup import start_services
+
+start_services()
+
+# Heavy libraries are imported on first use
+plt = lazy_import("matplotlib.pyplot")
+nx = lazy_import("networkx")
+go = lazy_import("plotly.graph_objects")
+
+# Edges of the interaction network, sorted so the same drug set always gives the same cache key
+def interaction_edges(interactions):
+    return tuple(sorted({tuple(sorted(interaction["drugs"])) for interaction in interactions}))
 
-    # Warnings
-    doc.add_heading("Drug Warnings (Fallback)", level=2)
-    for drug, warning in warnings.items():
-        doc.add_paragraph(f"{drug}: {warning}")
 
-    # Add Interaction Graph
-    if interaction_graph_path:
-        doc.add_heading("Interaction Network Graph", level=2)
-        doc.add_picture(interaction_graph_path)
+# Compute the network layout once per drug set
+@st.cache_data
+def compute_network_layout(edges):
+    graph = nx.Graph()
+    graph.add_edges_from(edges)
+    pos = nx.spring_layout(graph, seed=42)
+    return {node: (float(x), float(y)) for node, (x, y) in pos.items()}
+
 
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".docx")
-    doc.save(temp_file.name)
-    return temp_file.name
+# Plot Interaction Network as PNG bytes, cached per drug set
+@st.cache_data
+def plot_interaction_network(edges):
+    graph = nx.Graph()
+    graph.add_edges_from(edges)
+    pos = compute_network_layout(edges)
+
+    fig, ax = plt.subplots(figsize=(10, 10))
+    nx.draw_networkx_nodes(graph, pos, node_size=500, node_color='lightblue', ax=ax)
+    nx.draw_networkx_edges(graph, pos, width=1.5, ax=ax)
+    nx.draw_networkx_labels(graph, pos, font_size=10, ax=ax)
+    ax.set_title("Drug Interaction Network", fontsize=16)
+    ax.axis("off")
+    return figure_to_png(fig)
+
+
+# Interactive network built from the cached layout, without a matplotlib render
+def build_interactive_network(edges):
+    pos = compute_network_layout(edges)
+    edge_x, edge_y = [], []
+    for drug1, drug2 in edges:
+        edge_x += [pos[drug1][0], pos[drug2][0], None]
+        edge_y += [pos[drug1][1], pos[drug2][1], None]
+    fig = go.Figure(
+        data=[
+            go.Scatter(x=edge_x, y=edge_y, mode="lines", line=dict(width=1.5, color="#888"), hoverinfo="none"),
+            go.Scatter(
+                x=[xy[0] for xy in pos.values()],
+                y=[xy[1] for xy in pos.values()],
+                mode="markers+text",
+                text=list(pos.keys()),
+                textposition="top center",
+                marker=dict(size=20, color="lightblue", line=dict(width=1, color="#333")),
+                hoverinfo="text",
+            ),
+        ]
+    )
+    fig.update_layout(
+        title="Drug Interaction Network",
+        showlegend=False,
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        margin=dict(l=10, r=10, t=40, b=10),
+    )
+    return fig
 
 
 # Main App
@@ -104,59 +81,70 @@ def main():
     st.markdown("Enter drug names to check for potential interactions.")
 
     # User Input
-    drug_names = st.text_area("Enter drug names (one per line):").splitlines()
+    drug_names = [name.strip() for name in st.text_area("Enter drug names (one per line):").splitlines() if name.strip()]
 
     if st.button("Check Interactions"):
         if not drug_names:
             st.error("Please enter at least two drugs to check interactions.")
             return
 
-        # Fetch RxCUIs
-        rxcuis = []
-        for drug in drug_names:
-            rxcui = get_rxcui(drug)
-            if rxcui:
-                rxcuis.append(rxcui)
-            else:
-                st.error(f"Unable to find RxCUI for drug: {drug}")
-
-        # Check Interactions
-        interactions_data = check_interactions(rxcuis)
-        interactions = []
-        if interactions_data:
-            for group in interactions_data:
-                for interaction in group.get("fullInteractionType", []):
-                    description = interaction.get("interactionPair", [{}])[0].get("description", "No description")
-                    interactions.append(description)
-
-        # Fallback to OpenFDA if no interactions found
-        warnings = {}
-        if not interactions:
-            st.warning("No interactions found. Checking for drug warnings...")
-            for drug in drug_names:
-                warning = fetch_drug_warnings(drug)
-                warnings[drug] = warning
-
-        # Display Results
-        if interactions:
-            st.subheader("Interaction Results")
-            st.write(interactions)
-
-            # Plot Network Graph
-            interaction_graph_path = plot_interaction_network(interactions)
-            st.image(interaction_graph_path, caption="Interaction Network Graph", use_column_width=True)
+        # Resolve RxCUIs, interactions and fallback warnings once; reruns reuse the stored result
+        with st.spinner("Checking interactions..."):
+            result = run_interaction_check(drug_names)
+        result["edges"] = interaction_edges(result["interactions"])
+        result["graph_png"] = plot_interaction_network(result["edges"]) if result["edges"] else None
+        request_report(
+            "drug_interaction", "drug_interaction",
+            result["drugs"], result["interactions"], result["warnings"], result["graph_png"], result["food_rules"],
+            lookup_failed=result["lookup_failed"],
+        )
+        st.session_state["interaction_result"] = result
+
+    result = st.session_state.get("interaction_result")
+    if not result or result["drugs"] != list(dict.fromkeys(drug_names)):
+        return
+
+    for drug in result["unresolved"]:
+        st.error(f"Unable to find RxCUI for drug: {drug}")
+    if result["lookup_failed"]:
+        st.error(
+            "The interaction service could not be reached, so some drug pairs were not checked. "
+            "Please try again later."
+        )
+
+    # Display Results
+    interactions = result["interactions"]
+    warnings = result["warnings"]
+    if interactions:
+        st.subheader("Interaction Results" + (" (incomplete)" if result["lookup_failed"] else ""))
+        st.table([
+            {"Drugs": " + ".join(i["drugs"]), "Severity": i["severity"], "Description": i["description"]}
+            for i in interactions
+        ])
+        view = st.radio("Network View", ["Interactive", "Static Image"], horizontal=True)
+        if view == "Interactive":
+            st.plotly_chart(build_interactive_network(result["edges"]), use_container_width=True)
+        else:
+            st.image(result["graph_png"], caption="Interaction Network Graph", use_column_width=True)
+    else:
+        if result["lookup_failed"]:
+            st.warning("Interactions unknown: they could not be checked. Showing drug warnings instead.")
         else:
-            st.subheader("Drug Warnings (Fallback)")
-            st.json(warnings)
-
-        # Generate Report
-        if st.button("Download Report"):
-            interaction_graph_path = None
-            if interactions:
-                interaction_graph_path = plot_interaction_network(interactions)
-            report = generate_word_report(drug_names, interactions, warnings, interaction_graph_path)
-            with open(report, "rb") as file:
-                st.download_button("Download Report", file, file_name="Drug_Interaction_Report.docx")
+            st.warning("No interactions found. Showing drug warnings instead.")
+        st.subheader("Drug Warnings (Fallback)")
+        st.json(warnings)
+
+    # Drug-food interactions against INDB foods
+    food_interactions = check_food_interactions(result["food_rules"], load_dataset("indb"))
+    if not food_interactions.empty:
+        st.subheader("Drug-Food Interactions (INDB Foods)")
+        drug_filter = st.multiselect("Filter by drug", sorted(food_interactions["Drug"].unique()))
+        if drug_filter:
+            food_interactions = food_interactions[food_interactions["Drug"].isin(drug_filter)]
+        st.dataframe(food_interactions)
+
+    # Report is built in the background from the stored result, so downloading does not refetch anything
+    report_download("drug_interaction", "Drug_Interaction_Report.docx")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
 import streamlit as st
 import requests
 import pandas as pd
+from abstract_index import index_efetch_response
 import urllib.parse
+from startup import start_services
+
+start_services()
 
 # PubMed API URLs
 PUBMED_SEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
@@ -42,6 +46,7 @@ def fetch_article_details(pmids):
     if response.status_code == 200:
         from xml.etree import ElementTree as ET
         root = ET.fromstring(response.content)
+        index_efetch_response(root)  # Keep a local searchable copy
         articles = []
         for article in root.findall(".//PubmedArticle"):
             title = article.find(".//ArticleTitle").text or "No Title Available"
@@ -0,0 +1,62 @@
+import streamlit as st
+import pandas as pd
+from abstract_index import count_articles, get_index_connection, list_journals, search_abstracts
+from startup import start_services
+
+start_services()
+
+
+# Streamlit App
+def main():
+    st.title("Local Literature Library")
+    st.markdown("""
+    Search titles, abstracts and MeSH terms of every article previously retrieved by the PubMed pages.
+    Results come from the local index, so no request is sent to NCBI.
+    Use `*` at the end of a word for prefix search (e.g. `hypocal*`).
+    """)
+
+    conn = get_index_connection()
+    try:
+        st.sidebar.header("Filters")
+        st.sidebar.write(f"Articles in library: **{count_articles(conn)}**")
+        journal = st.sidebar.selectbox("Journal", ["All Journals"] + list_journals(conn))
+        year_from = st.sidebar.number_input("From Year", min_value=0, max_value=2100, value=0, step=1)
+        year_to = st.sidebar.number_input("To Year", min_value=0, max_value=2100, value=0, step=1)
+        limit = st.sidebar.number_input("Maximum Results", min_value=10, max_value=1000, value=50, step=10)
+
+        query = st.text_input("Search the library:", placeholder="e.g., hypoparathyroidism calcium")
+        if query:
+            results, elapsed_ms = search_abstracts(
+                conn,
+                query,
+                journal=None if journal == "All Journals" else journal,
+                year_from=year_from or None,
+                year_to=year_to or None,
+                limit=int(limit),
+            )
+            if results:
+                st.success(f"Found {len(results)} articles in {elapsed_ms:.1f} ms.")
+                for result in results:
+                    with st.expander(f"{result['title']} ({result['journal']}, {result['pubdate']})"):
+                        st.markdown(result["snippet"] or "No Abstract Available")
+                        if result["mesh_terms"]:
+                            st.write(f"**MeSH Terms**: {result['mesh_terms']}")
+                        if result["doi"]:
+                            st.write(f"**DOI**: {result['doi']}")
+                        st.markdown(f"[PubMed Link](https://pubmed.ncbi.nlm.nih.gov/{result['pmid']}/)")
+
+                csv_data = pd.DataFrame(results).drop(columns=["snippet", "score"]).to_csv(index=False).encode("utf-8")
+                st.download_button(
+                    label="Download Results as CSV",
+                    data=csv_data,
+                    file_name="local_library_results.csv",
+                    mime="text/csv",
+                )
+            else:
+                st.warning("No matching articles in the local library.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 import streamlit as st
 import requests
 import pandas as pd
+from abstract_index import index_efetch_response
+from systematic_search import parse_keyword_groups, prisma_summary, run_systematic_search
+from startup import start_services
+
+start_services()
 
 # PubMed API URLs
 PUBMED_SEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
@@ -43,6 +48,7 @@ def fetch_pubmed_details(pmids):
     if response.status_code == 200:
         from xml.etree import ElementTree as ET
         root = ET.fromstring(response.content)
+        index_efetch_response(root)  # Keep a local searchable copy
         articles = []
         for article in root.findall(".//PubmedArticle"):
             title = article.find(".//ArticleTitle").text or "No Title Available"
@@ -103,6 +109,11 @@ def main():
     keywords = [kw.strip() for kw in keywords_input.split(",")]
 
     database = st.sidebar.radio("Select Database", ["PubMed (Default)", "Embase (Coming Soon)", "Cochrane CENTRAL (Coming Soon)"])
+    search_mode = st.sidebar.radio("Search Mode", ["Single Query", "Systematic (Keyword Groups)"])
+
+    if search_mode == "Systematic (Keyword Groups)":
+        run_systematic_mode()
+        return
 
     if st.sidebar.button("Search"):
         if database == "PubMed (Default)":
@@ -110,27 +121,83 @@ def main():
                 articles = fetch_pubmed_articles(keywords)
                 if articles:
                     st.success(f"Found {len(articles)} articles!")
-                    # Display articles
-                    for article in articles:
-                        with st.expander(article["Title"]):
-                            st.write(f"**Publication Date**: {article['Publication Date']}")
-                            st.write(f"**Abstract**: {article['Abstract']}")
-                            st.markdown(f"[PubMed Link]({article['PubMed Link']})")
-                            st.markdown(f"[Full-Text Link]({article['Full-Text Link']})")
-
-                    # Downloadable CSV
-                    df = pd.DataFrame(articles)
-                    csv_data = df.to_csv(index=False).encode("utf-8")
-                    st.download_button(
-                        label="Download CSV",
-                        data=csv_data,
-                        file_name="articles_with_full_text.csv",
-                        mime="text/csv",
-                    )
+                    display_articles(articles)
                 else:
                     st.warning("No articles found.")
         else:
             st.warning(f"{database} is not yet supported. Stay tuned!")
 
+# Display article expanders and a CSV download
+def display_articles(articles, file_name="articles_with_full_text.csv"):
+    for article in articles:
+        with st.expander(article["Title"]):
+            st.write(f"**Publication Date**: {article['Publication Date']}")
+            st.write(f"**Abstract**: {article['Abstract']}")
+            st.markdown(f"[PubMed Link]({article['PubMed Link']})")
+            st.markdown(f"[Full-Text Link]({article['Full-Text Link']})")
+
+    # Downloadable CSV
+    df = pd.DataFrame(articles)
+    csv_data = df.to_csv(index=False).encode("utf-8")
+    st.download_button(
+        label="Download CSV",
+        data=csv_data,
+        file_name=file_name,
+        mime="text/csv",
+    )
+
+# Systematic search: every combination of keyword groups, deduplicated across queries
+def run_systematic_mode():
+    st.subheader("Systematic Search")
+    st.markdown("""
+    Enter one concept group per line, with synonyms separated by commas.
+    Every combination (one term from each group, joined with AND) is searched; results are deduplicated
+    and cached, so adding a keyword only runs the new combinations.
+    """)
+    groups_input = st.text_area(
+        "Keyword groups (one group per line):",
+        "hypoparathyroidism, hypocalcemia, hypocal*, hypoPT\n"
+        "parathyroid hormone, PTH, rhPTH, teriparatide, TransCon PTH\n"
+        "random*",
+    )
+    max_details = st.number_input("Articles to fetch details for", min_value=1, max_value=200, value=50, step=10)
+
+    if st.button("Run Systematic Search"):
+        groups = parse_keyword_groups(groups_input)
+        if not groups:
+            st.warning("Please enter at least one keyword.")
+            return
+
+        with st.spinner("Running keyword combinations..."):
+            unique_pmids, count_rows, failed = run_systematic_search(groups)
+
+        if failed:
+            st.error(f"{len(failed)} queries failed and will be retried on the next run.")
+
+        st.subheader("Identification Counts (PRISMA)")
+        st.table(pd.DataFrame([prisma_summary(count_rows, unique_pmids)]))
+        counts_df = pd.DataFrame(count_rows)
+        st.dataframe(counts_df)
+        st.download_button(
+            label="Download Query Counts",
+            data=counts_df.to_csv(index=False).encode("utf-8"),
+            file_name="systematic_search_counts.csv",
+            mime="text/csv",
+        )
+        st.download_button(
+            label="Download Unique PMIDs",
+            data="\n".join(unique_pmids).encode("utf-8"),
+            file_name="systematic_search_pmids.txt",
+            mime="text/plain",
+        )
+
+        if unique_pmids:
+            with st.spinner("Fetching article details..."):
+                articles = fetch_pubmed_details(unique_pmids[:int(max_details)])
+            if articles:
+                display_articles(articles, file_name="systematic_search_articles.csv")
+        else:
+            st.warning("No articles found.")
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,11 @@
 import streamlit as st
 import requests
 import pandas as pd
+from journal_sync import CLINICAL_JOURNALS, ENDOCRINOLOGY_JOURNALS, start_background_sync
+from pubmed_cache import count_journal_articles, get_connection, get_journal_articles, get_last_sync
+from startup import start_services
+
+start_services()
 
 # PubMed API Base URL
 PUBMED_SEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
@@ -9,33 +14,6 @@ PUBMED_FETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
 # NCBI API Key (optional for higher rate limits)
 API_KEY = None  # Replace with your API Key if available
 
-# Journal Options
-CLINICAL_JOURNALS = [
-    "N Engl J Med",
-    "Lancet",
-    "JAMA",
-    "BMJ",
-    "Ann Intern Med",
-    "PLOS Medicine",
-    "J Clin Invest",
-    "JAMA Intern Med",
-    "Am J Med",
-    "CMAJ"
-]
-
-ENDOCRINOLOGY_JOURNALS = [
-    "J Clin Endocrinol Metab",
-    "Diabetes Care",
-    "Endocrinology",
-    "Diabetologia",
-    "Lancet Diabetes Endocrinol",
-    "Thyroid",
-    "Endocrine Reviews",
-    "Bone",
-    "Horm Metab Res",
-    "Nature Rev Endocrinol"
-]
-
 # Fetch PMIDs from PubMed
 def fetch_pmids(journal, start, end):
     params = {
@@ -80,8 +58,36 @@ def fetch_article_details(pmids):
         st.error("Failed to fetch article details from PubMed. Please try again later.")
         return []
 
+# Start the journal refresh thread once per server process
+@st.cache_resource
+def ensure_background_sync():
+    return start_background_sync()
+
+# Serve articles from the local journal cache when it covers the requested range
+def load_cached_articles(journal, start, end):
+    conn = get_connection()
+    try:
+        if get_last_sync(conn, journal) is None or count_journal_articles(conn, journal) < end:
+            return None
+        rows = get_journal_articles(conn, journal, start, end)
+    finally:
+        conn.close()
+    articles = []
+    for row in rows:
+        doi = row["doi"]
+        articles.append({
+            "Title": row["title"],
+            "Publication Date": row["pubdate"],
+            "DOI": doi,
+            "PubMed Link": f"https://pubmed.ncbi.nlm.nih.gov/{row['pmid']}/",
+            "Sci-Hub Link": f"https://sci-hub.se/{doi}" if "10." in doi else "No Sci-Hub Link Available",
+        })
+    return articles
+
 # Streamlit App
 def main():
+    ensure_background_sync()
+
     st.title("PubMed Article Finder with DOI and Sci-Hub Links")
     st.markdown("""
     This app retrieves the latest articles from PubMed for selected clinical or endocrinology journals, including DOIs and Sci-Hub links.
@@ -100,36 +106,37 @@ def main():
 
     if st.sidebar.button("Fetch Articles"):
         with st.spinner("Fetching articles..."):
-            pmids = fetch_pmids(journal, start_index, end_index)
-            if pmids:
-                articles = fetch_article_details(pmids)
-                if articles:
-                    st.success(f"Fetched {len(articles)} articles from {journal}!")
-                    df = pd.DataFrame(articles)
+            articles = load_cached_articles(journal, start_index, end_index)
+            if articles is None:
+                pmids = fetch_pmids(journal, start_index, end_index)
+                articles = fetch_article_details(pmids) if pmids else []
+            if articles:
+                st.success(f"Fetched {len(articles)} articles from {journal}!")
+                df = pd.DataFrame(articles)
 
-                    # Make links clickable in the Streamlit DataFrame
-                    df['PubMed Link'] = df['PubMed Link'].apply(
-                        lambda x: f'<a href="{x}" target="_blank">PubMed Link</a>'
-                    )
-                    df['Sci-Hub Link'] = df['Sci-Hub Link'].apply(
-                        lambda x: f'<a href="{x}" target="_blank">Sci-Hub Link</a>' if "sci-hub" in x else x
-                    )
-                    df['DOI'] = df['DOI'].apply(
-                        lambda x: f'<a href="https://doi.org/{x}" target="_blank">{x}</a>' if "10." in x else x
-                    )
-                    st.write(df.to_html(escape=False, index=False), unsafe_allow_html=True)
+                # Make links clickable in the Streamlit DataFrame
+                df['PubMed Link'] = df['PubMed Link'].apply(
+                    lambda x: f'<a href="{x}" target="_blank">PubMed Link</a>'
+                )
+                df['Sci-Hub Link'] = df['Sci-Hub Link'].apply(
+                    lambda x: f'<a href="{x}" target="_blank">Sci-Hub Link</a>' if "sci-hub" in x else x
+                )
+                df['DOI'] = df['DOI'].apply(
+                    lambda x: f'<a href="https://doi.org/{x}" target="_blank">{x}</a>' if "10." in x else x
+                )
+                st.write(df.to_html(escape=False, index=False), unsafe_allow_html=True)
 
-                    # Prepare a downloadable CSV with links
-                    csv_data = pd.DataFrame(articles)  # Original DataFrame for CSV
-                    csv_data = csv_data.to_csv(index=False).encode("utf-8")
-                    st.download_button(
-                        label="Download CSV with Links and DOIs",
-                        data=csv_data,
-                        file_name=f"{journal}_articles_{start_index}_to_{end_index}.csv",
-                        mime="text/csv",
-                    )
-                else:
-                    st.warning("No articles found.")
+                # Prepare a downloadable CSV with links
+                csv_data = pd.DataFrame(articles)  # Original DataFrame for CSV
+                csv_data = csv_data.to_csv(index=False).encode("utf-8")
+                st.download_button(
+                    label="Download CSV with Links and DOIs",
+                    data=csv_data,
+                    file_name=f"{journal}_articles_{start_index}_to_{end_index}.csv",
+                    mime="text/csv",
+                )
+            else:
+                st.warning("No articles found.")
 
 if __name__ == "__main__":
     main()
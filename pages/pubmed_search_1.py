@@ -1,6 +1,9 @@
 import streamlit as st
 import requests
 import pandas as pd
+from startup import start_services
+
+start_services()
 
 # PubMed API Base URL
 PUBMED_SEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
@@ -0,0 +1,3 @@
+# Computational core of the app: calculators, planners, scorers, data access and report builders.
+# Nothing in this package imports streamlit, so every function can be imported, cached, benchmarked
+# or run in a worker process; the scripts in pages/ collect inputs and render the results.
@@ -0,0 +1,157 @@
+# Body composition equations (sex: 1 = male, 0 = female)
+
+FORMULAS = [
+    "Fat Mass (FM): (1.2 * BMI) + (0.23 * Age) - (10.8 * Sex) - 5.4",
+    "Fat-Free Mass Index (FFMI): FFM / Height^2",
+    "Body Fat Percentage (Siri Equation): (4.95 / Density - 4.50) * 100",
+    "Body Density (3-Site): See Jackson-Pollock Equations",
+]
+
+REFERENCES = [
+    "1. Deurenberg et al., 1991. BMI as a measure of fatness.",
+    "2. Siri, W.E., 1956. Body composition from fluid spaces.",
+    "3. Jackson & Pollock, 1978. Generalized equations for predicting body density.",
+]
+
+# Skinfold sites measured for each Jackson-Pollock method
+SKINFOLD_SITES = {
+    "3-Site": {
+        "Male": ["Chest", "Abdomen", "Thigh"],
+        "Female": ["Triceps", "Suprailiac", "Thigh"],
+    },
+    "7-Site": {
+        "Male": ["Chest", "Midaxillary", "Triceps", "Subscapular", "Abdomen", "Suprailiac", "Thigh"],
+        "Female": ["Chest", "Midaxillary", "Triceps", "Subscapular", "Abdomen", "Suprailiac", "Thigh"],
+    },
+}
+
+
+def calculate_bmi(weight, height_cm):
+    return weight / ((height_cm / 100) ** 2)
+
+def calculate_fat_mass(bmi, age, sex):
+    return (1.2 * bmi) + (0.23 * age) - (10.8 * sex) - 5.4
+
+def calculate_fat_free_mass(body_weight, fat_mass):
+    return body_weight - fat_mass
+
+def calculate_ffmi(fat_free_mass, height_m):
+    return fat_free_mass / (height_m ** 2)
+
+def calculate_body_fat_percentage(bmi, age, sex):
+    if sex == 1:  # Male
+        return (1.20 * bmi) + (0.23 * age) - 16.2
+    else:  # Female
+        return (1.20 * bmi) + (0.23 * age) - 5.4
+
+def calculate_body_fat_siri(density):
+    return (4.95 / density - 4.50) * 100
+
+def calculate_body_density_3_site(sex, sum_skinfolds, age):
+    if sex == 1:  # Male
+        return 1.10938 - (0.0008267 * sum_skinfolds) + (0.0000016 * sum_skinfolds**2) - (0.0002574 * age)
+    else:
+        return 1.0994921 - (0.0009929 * sum_skinfolds) + (0.0000023 * sum_skinfolds**2) - (0.0001392 * age)
+
+def calculate_body_density_7_site(sex, sum_skinfolds, age):
+    return calculate_body_density_3_site(sex, sum_skinfolds, age)
+
+
+def compute_body_composition(weight, height, age, sex, method="None", skinfolds=None, density=0.0):
+    """
+    Compute every body composition metric for one person.
+    Args:
+        weight (float): Body weight in kg.
+        height (float): Height in cm.
+        age (int): Age in years.
+        sex (str): "Male" or "Female".
+        method (str): Jackson-Pollock method, "None", "3-Site" or "7-Site".
+        skinfolds (dict, optional): Skinfold site -> thickness in mm.
+        density (float): Measured body density in g/cm³ for the Siri equation (0 to skip).
+    Returns:
+        dict: weight, height, bmi, fat_mass, fat_free_mass, ffmi, body_fat_percentage, siri_body_fat,
+        body_density, jackson_pollock_body_fat and sum_skinfolds (None where not applicable).
+    """
+    skinfolds = skinfolds or {}
+    sex_value = 1 if sex == "Male" else 0
+    bmi = calculate_bmi(weight, height)
+    fat_mass = calculate_fat_mass(bmi, age, sex_value)
+    fat_free_mass = calculate_fat_free_mass(weight, fat_mass)
+    sum_skinfolds = sum(skinfolds.values())
+
+    body_density = jackson_pollock_body_fat = None
+    if method != "None" and sum_skinfolds > 0:
+        if method == "3-Site":
+            body_density = calculate_body_density_3_site(sex_value, sum_skinfolds, age)
+        else:
+            body_density = calculate_body_density_7_site(sex_value, sum_skinfolds, age)
+        jackson_pollock_body_fat = calculate_body_fat_siri(body_density)
+
+    return {
+        "weight": weight,
+        "height": height,
+        "bmi": bmi,
+        "fat_mass": fat_mass,
+        "fat_free_mass": fat_free_mass,
+        "ffmi": calculate_ffmi(fat_free_mass, height / 100),
+        "body_fat_percentage": calculate_body_fat_percentage(bmi, age, sex_value),
+        "siri_body_fat": calculate_body_fat_siri(density) if density > 0 else None,
+        "body_density": body_density,
+        "jackson_pollock_body_fat": jackson_pollock_body_fat,
+        "sum_skinfolds": sum_skinfolds,
+    }
+
+
+def format_results(metrics, skinfolds=None):
+    """
+    Format computed metrics as the labelled strings shown on the page and in the PDF report.
+    Args:
+        metrics (dict): Output of compute_body_composition.
+        skinfolds (dict, optional): Skinfold site -> thickness in mm.
+    Returns:
+        dict: Label -> formatted value.
+    """
+    results = {
+        "Weight": f"{metrics['weight']:.2f} kg",
+        "Height": f"{metrics['height']:.2f} cm",
+        "BMI": f"{metrics['bmi']:.2f}",
+        "Fat Mass (FM)": f"{metrics['fat_mass']:.2f} kg",
+        "Fat-Free Mass (FFM)": f"{metrics['fat_free_mass']:.2f} kg",
+        "Fat-Free Mass Index (FFMI)": f"{metrics['ffmi']:.2f}",
+        "Body Fat Percentage (BMI Method)": f"{metrics['body_fat_percentage']:.2f} %",
+    }
+    if metrics["siri_body_fat"] is not None:
+        results["Body Fat Percentage (Siri Equation)"] = f"{metrics['siri_body_fat']:.2f} %"
+    if metrics["body_density"] is not None:
+        results["Body Density (Jackson-Pollock)"] = f"{metrics['body_density']:.4f} g/cm³"
+        results["Body Fat Percentage (Jackson-Pollock)"] = f"{metrics['jackson_pollock_body_fat']:.2f} %"
+        results["Sum of Skinfolds"] = f"{metrics['sum_skinfolds']:.2f} mm"
+    for site, thickness in (skinfolds or {}).items():
+        results[f"Skinfold Thickness ({site})"] = f"{thickness:.2f} mm"
+    return results
+
+
+# Metric labels and keys for the charts, in display order
+CHART_METRICS = [
+    ("Weight (kg)", "weight"),
+    ("Height (cm)", "height"),
+    ("BMI", "bmi"),
+    ("Fat Mass (kg)", "fat_mass"),
+    ("Fat-Free Mass (kg)", "fat_free_mass"),
+    ("FFMI", "ffmi"),
+    ("Body Fat Percentage (BMI Method)", "body_fat_percentage"),
+    ("Body Fat Percentage (Siri Equation)", "siri_body_fat"),
+    ("Body Density (Jackson-Pollock)", "body_density"),
+    ("Sum of Skinfolds (mm)", "sum_skinfolds"),
+]
+
+
+def chart_values(metrics):
+    """
+    Chart labels and values, with metrics that were not computed shown as 0.
+    Returns:
+        tuple: (list of labels, list of values).
+    """
+    labels = [label for label, _ in CHART_METRICS]
+    values = [metrics[key] if metrics[key] is not None else 0 for _, key in CHART_METRICS]
+    return labels, values
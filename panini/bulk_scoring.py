@@ -0,0 +1,264 @@
+# Bulk scoring of questionnaire answers collected on paper forms or in spreadsheets, instead of re-entering
+# them one form at a time. An export (CSV or XLSX, e.g. a Google Sheets or Google Forms download) has one
+# row per respondent; its columns are matched to the instrument's items by item id or question text, answer
+# labels in any of the instrument's languages are mapped to option values, and every respondent is scored
+# in one vectorized pass. IPAQ exports carry numeric days/hours/minutes columns instead.
+import re
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from panini.questionnaire_engine import list_instruments, load_instrument, localized
+from panini.questionnaires import IPAQ_HIGH_ACTIVITY, IPAQ_MET_VALUES, IPAQ_MODERATE_ACTIVITY, ipaq_badge
+
+IPAQ = "ipaq"
+IPAQ_COLUMNS = [
+    f"{activity}_{unit}" for activity in IPAQ_MET_VALUES for unit in ("days", "hours", "minutes")
+] + ["sitting_hours", "sitting_minutes"]
+
+
+def scorable_instruments():
+    """
+    Returns:
+        list: Instrument names accepted by score_export: the spec instruments and "ipaq".
+    """
+    return list_instruments() + [IPAQ]
+
+
+def read_export(file, file_name=None):
+    """
+    Read a response export from CSV or XLSX.
+    Args:
+        file (str, Path or file-like): The table, e.g. a Streamlit upload.
+        file_name (str, optional): Name used to pick the format; defaults to file.name or the path.
+    Returns:
+        pd.DataFrame: The table with stripped column names (question texts keep their case).
+    Raises:
+        ValueError: If the file is a legacy .xls workbook or cannot be read as CSV or XLSX.
+    """
+    suffix = Path(file_name or getattr(file, "name", str(file))).suffix.lower()
+    if suffix == ".xls":
+        raise ValueError("Legacy .xls workbooks are not supported. Save the sheet as .xlsx or CSV and upload it again.")
+    try:
+        df = pd.read_excel(file) if suffix == ".xlsx" else pd.read_csv(file)
+    except Exception as e:
+        # Corrupt workbooks raise zipfile/openpyxl errors, bad CSVs parser or decoding errors
+        raise ValueError(f"Could not read the file as {'XLSX' if suffix == '.xlsx' else 'CSV'}: {e}") from e
+    df.columns = [str(column).strip() for column in df.columns]
+    return df
+
+
+def _normalize(text):
+    # Case, spacing and trailing punctuation differ between paper transcriptions and form exports
+    return re.sub(r"\s+", " ", str(text)).strip().rstrip(":?.").casefold()
+
+
+def match_columns(instrument, columns):
+    """
+    Match export columns to an instrument's items.
+    Args:
+        instrument (Instrument): Compiled instrument.
+        columns (list): Export column names.
+    Returns:
+        dict: Column name -> item id, for the columns that are item ids or question texts in any language.
+    """
+    lookup = {}
+    for item in instrument.items:
+        lookup[_normalize(item["id"])] = item["id"]
+        for language in instrument.languages:
+            lookup[_normalize(localized(item["text"], language))] = item["id"]
+    matched = {}
+    for column in columns:
+        item_id = lookup.get(_normalize(column))
+        if item_id is not None and item_id not in matched.values():
+            matched[column] = item_id
+    return matched
+
+
+def _answer_lookup(instrument):
+    # Normalized option value or label (any language) -> option value
+    lookup = {}
+    for option in instrument.options:
+        lookup[_normalize(option["value"])] = option["value"]
+        for language in instrument.languages:
+            lookup[_normalize(localized(option.get("label", option["value"]), language))] = option["value"]
+    return lookup
+
+
+def map_answers(instrument, responses, matched):
+    """
+    Translate answer labels to option values.
+    Args:
+        instrument (Instrument): Compiled instrument.
+        responses (pd.DataFrame): The export.
+        matched (dict): Column name -> item id, from match_columns.
+    Returns:
+        tuple: (pd.DataFrame of option values with item id columns, number of non-empty answers that
+        are not options of the instrument).
+    """
+    lookup = _answer_lookup(instrument)
+    numeric = all(isinstance(value, (int, float)) for value in instrument.values)
+    answers = pd.DataFrame(index=responses.index)
+    invalid = 0
+    for column, item_id in matched.items():
+        raw = responses[column]
+        # Map each distinct answer once; exports repeat a handful of labels thousands of times
+        distinct = {value: lookup.get(_normalize(value)) for value in raw.dropna().unique()}
+        if numeric:
+            for value in distinct:
+                if distinct[value] is None and isinstance(value, (int, float, np.number)) and value in instrument.codes:
+                    distinct[value] = value
+        mapped = raw.map(distinct)
+        invalid += int((mapped.isna() & raw.notna()).sum())
+        answers[item_id] = mapped
+    return answers, invalid
+
+
+def score_export(name, responses):
+    """
+    Score every respondent of an export.
+    Args:
+        name (str): Instrument name, from scorable_instruments.
+        responses (pd.DataFrame): The export, from read_export.
+    Returns:
+        tuple: (results, report). results keeps the columns that are not items (names, ids, timestamps)
+        and adds one column per section score plus overall, badge, message, answered (items answered) and
+        complete (every item answered). Rows without any answer have no scores or badge.
+        report is a dict with matched (item ids found), missing (item ids not in the export), invalid
+        (answers that are not options, or not numbers for IPAQ), blank (rows without any answer) and
+        partial (rows with some items unanswered).
+    Raises:
+        ValueError: If no column of the export matches the instrument.
+    """
+    if name == IPAQ:
+        return score_ipaq_export(responses)
+
+    instrument = load_instrument(name)
+    matched = match_columns(instrument, responses.columns)
+    if not matched:
+        raise ValueError(
+            f"No column matches a question of {instrument.title()}. Use the question texts or item ids as headers."
+        )
+    answers, invalid = map_answers(instrument, responses, matched)
+    scores = instrument.score_many(answers)
+    scores["answered"] = answers.notna().sum(axis=1)
+    scores["complete"] = scores["answered"] == len(instrument.item_ids)
+
+    results = pd.concat([responses.drop(columns=list(matched)), scores], axis=1)
+    report = {
+        "matched": list(matched.values()),
+        "missing": [item_id for item_id in instrument.item_ids if item_id not in matched.values()],
+        "invalid": invalid,
+        **_completeness(scores),
+    }
+    return results, report
+
+
+def _completeness(scores):
+    blank = scores["answered"] == 0
+    return {"blank": int(blank.sum()), "partial": int((~blank & ~scores["complete"]).sum())}
+
+
+def scored_rows(results):
+    """
+    Returns:
+        pd.DataFrame: The rows of score_export results with at least one answer.
+    """
+    return results[results["answered"] > 0]
+
+
+def score_ipaq_export(responses):
+    """
+    Score an IPAQ export with the IPAQ_COLUMNS (days per week, hours and minutes per day for each activity;
+    hours and minutes of sitting per day). Values that are not numbers are reported as invalid and count as
+    unanswered. In a row with some answers, unanswered values count as 0; a row without any answer has no
+    scores.
+    Returns:
+        tuple: (results, report), as for score_export; results has one MET-minutes/week column per activity,
+        sitting minutes, overall (total MET-minutes/week), activity_level, badge, message, answered and
+        complete.
+    Raises:
+        ValueError: If none of the IPAQ_COLUMNS is in the export.
+    """
+    columns = {_normalize(column).replace(" ", "_"): column for column in responses.columns}
+    matched = [column for column in IPAQ_COLUMNS if column in columns]
+    if not matched:
+        raise ValueError(f"No IPAQ column found. Expected: {', '.join(IPAQ_COLUMNS)}.")
+
+    # Parse each column once; non-empty cells that are not numbers (e.g. "x", "2 days") are invalid
+    parsed = {}
+    invalid = 0
+    for column in matched:
+        raw = responses[columns[column]]
+        filled = raw.notna() & (raw.astype(str).str.strip() != "")
+        parsed[column] = pd.to_numeric(raw.where(filled), errors="coerce")
+        invalid += int((filled & parsed[column].isna()).sum())
+
+    def values(column):
+        if column not in parsed:
+            return pd.Series(0.0, index=responses.index)
+        return parsed[column].fillna(0.0)
+
+    scores = pd.DataFrame(index=responses.index)
+    for activity, met in IPAQ_MET_VALUES.items():
+        minutes = values(f"{activity}_hours") * 60 + values(f"{activity}_minutes")
+        scores[activity] = values(f"{activity}_days") * minutes * met
+    scores["sitting"] = values("sitting_hours") * 60 + values("sitting_minutes")
+    scores["overall"] = scores[list(IPAQ_MET_VALUES)].sum(axis=1)
+    scores["activity_level"] = np.select(
+        [scores["overall"] >= IPAQ_HIGH_ACTIVITY, scores["overall"] >= IPAQ_MODERATE_ACTIVITY],
+        ["High", "Moderate"],
+        default="Low",
+    )
+    badges = [ipaq_badge(total) for total in scores["overall"]]
+    scores["badge"] = [badge for badge, _ in badges]
+    scores["message"] = [message for _, message in badges]
+    scores["answered"] = pd.DataFrame(parsed).notna().sum(axis=1)
+    scores["complete"] = scores["answered"] == len(IPAQ_COLUMNS)
+    blank = scores["answered"] == 0
+    scores.loc[blank, list(IPAQ_MET_VALUES) + ["sitting", "overall"]] = np.nan
+    scores.loc[blank, ["activity_level", "badge", "message"]] = None
+
+    results = pd.concat([responses.drop(columns=[columns[column] for column in matched]), scores], axis=1)
+    report = {
+        "matched": matched,
+        "missing": [column for column in IPAQ_COLUMNS if column not in matched],
+        "invalid": invalid,
+        **_completeness(scores),
+    }
+    return results, report
+
+
+def summarize_scores(results, name):
+    """
+    Per-section and overall aggregates across respondents with at least one answer.
+    Args:
+        results (pd.DataFrame): From score_export.
+        name (str): Instrument name.
+    Returns:
+        tuple: (pd.DataFrame with count, mean, std, min, quartiles and max per score, pd.Series of badge counts).
+    """
+    if name == IPAQ:
+        columns = list(IPAQ_MET_VALUES) + ["sitting", "overall"]
+    else:
+        columns = load_instrument(name).section_titles() + ["overall"]
+    results = scored_rows(results)
+    return results[columns].describe().T, results["badge"].value_counts()
+
+
+def response_template(name, language="en"):
+    """
+    Empty export with the headers score_export expects, to hand to field staff.
+    Returns:
+        bytes: UTF-8 CSV with a respondent_id column and one column per question.
+    """
+    if name == IPAQ:
+        headers = IPAQ_COLUMNS
+    else:
+        instrument = load_instrument(name)
+        headers = [localized(item["text"], language) for item in instrument.items]
+    buffer = BytesIO()
+    pd.DataFrame(columns=["respondent_id"] + headers).to_csv(buffer, index=False)
+    return buffer.getvalue()
@@ -0,0 +1,110 @@
+# Chart rendering for pages that redraw on every widget change. Charts are drawn on standalone
+# matplotlib Figures (not pyplot, so nothing is kept in pyplot's figure registry), returned as PNG bytes,
+# cleared right after saving, and cached by their inputs.
+from functools import lru_cache
+from io import BytesIO
+
+from lazy_imports import lazy_import
+
+# matplotlib and numpy are imported on first render
+mpl_figure = lazy_import("matplotlib.figure")
+plt = lazy_import("matplotlib.pyplot")
+np = lazy_import("numpy")
+
+# Rendered charts kept per process; each entry is one PNG
+CHART_CACHE_SIZE = 64
+
+BAR_COLORS = ['#6A5ACD', '#6495ED', '#87CEFA', '#ADD8E6', '#D3D3D3', '#FFA07A', '#F08080', '#FF6347', '#E9967A', '#DC143C']
+
+
+def figure_to_png(fig, dpi=100):
+    """
+    Save a figure as PNG and release its artists. Figures created through pyplot are also closed, so
+    pyplot's figure registry does not grow with every render. The same bytes can be shown on the page
+    and embedded in a report.
+    Returns:
+        bytes: The PNG image.
+    """
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    finally:
+        fig.clear()
+        if fig.canvas.manager is not None:
+            plt.close(fig)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def render_body_composition_panels(labels, values, fat_mass, fat_free_mass):
+    """
+    Radar, line, pie, bar and heatmap panels of the body composition metrics in one figure.
+    Args:
+        labels (tuple): Metric labels, from panini.body_composition.chart_values.
+        values (tuple): Metric values in the same order.
+        fat_mass (float): Fat mass in kg, for the pie chart.
+        fat_free_mass (float): Fat-free mass in kg, for the pie chart.
+    Returns:
+        bytes: PNG image.
+    """
+    fig = mpl_figure.Figure(figsize=(18, 11))
+    grid = fig.add_gridspec(2, 3, width_ratios=[1, 1, 0.8])
+    positions = range(len(labels))
+
+    # Radar chart
+    ax = fig.add_subplot(grid[0, 0], polar=True)
+    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+    radar_values = list(values) + list(values[:1])  # Repeat the first value to close the circle
+    angles += angles[:1]
+    ax.fill(angles, radar_values, color='blue', alpha=0.25)
+    ax.plot(angles, radar_values, color='blue', linewidth=2)
+    ax.set_yticks([])
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(labels, fontsize=8)
+    ax.set_title("Radar Chart of Metrics", fontsize=14, pad=20)
+
+    # Line chart
+    ax = fig.add_subplot(grid[0, 1])
+    ax.plot(positions, values, marker='o', color='green', linewidth=2)
+    ax.set_title("Body Composition Trends", fontsize=14)
+    ax.set_ylabel("Values", fontsize=10)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=8)
+
+    # Pie chart
+    ax = fig.add_subplot(grid[0, 2])
+    ax.pie(
+        [fat_mass, fat_free_mass],
+        labels=["Fat Mass", "Fat-Free Mass"],
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=['#89CFF0', '#FFA07A'],
+        explode=(0.1, 0),
+    )
+    ax.set_title("Fat vs. Fat-Free Mass", fontsize=14)
+
+    # Bar chart
+    ax = fig.add_subplot(grid[1, 0:2])
+    ax.bar(positions, values, color=BAR_COLORS[:len(labels)])
+    ax.set_title("Body Composition Metrics", fontsize=14)
+    ax.set_ylabel("Values", fontsize=10)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=8)
+
+    # Heatmap
+    ax = fig.add_subplot(grid[1, 2])
+    column = np.array(values, dtype=float).reshape(-1, 1)
+    image = ax.imshow(column, cmap="coolwarm", aspect="auto")
+    low, high = column.min(), column.max()
+    for row, value in enumerate(column[:, 0]):
+        # Dark text on the pale middle of the colour map, white on the saturated ends
+        middle = high == low or abs((value - low) / (high - low) - 0.5) < 0.3
+        ax.text(0, row, f"{value:.2f}", ha="center", va="center", fontsize=9, color="black" if middle else "white")
+    ax.set_xticks([])
+    ax.set_yticks(positions)
+    ax.set_yticklabels(labels, fontsize=8)
+    ax.set_title("Heatmap of Body Composition Metrics", fontsize=14)
+    fig.colorbar(image, ax=ax, label="Value")
+
+    fig.tight_layout()
+    return figure_to_png(fig)
@@ -0,0 +1,279 @@
+# Per-person calculators applied to a whole cohort (screening camps, patient registers) in one vectorized pass.
+# Tables need weight (kg), height (cm), age and sex columns. Body composition also reads optional skinfold
+# columns (mm) named after the Jackson-Pollock sites and a measured density column (g/cm³); energy
+# requirements read optional activity_level, goal, pregnant and lactating columns.
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from panini.body_composition import (
+    SKINFOLD_SITES,
+    calculate_body_fat_siri,
+    calculate_bmi,
+    calculate_fat_free_mass,
+    calculate_fat_mass,
+    calculate_ffmi,
+)
+from panini.energy import (
+    ADA_ACTIVITY_LEVELS,
+    GOAL_ADJUSTMENT_KCAL,
+    GOALS,
+    ICMR_ACTIVITY_LEVELS,
+    ICMR_RDA,
+    MACRONUTRIENT_RATIOS,
+    VLCD_CALORIES,
+)
+
+REQUIRED_COLUMNS = ["weight", "height", "age", "sex"]
+SKINFOLD_COLUMNS = [site.lower() for site in SKINFOLD_SITES["7-Site"]["Male"]]
+DENSITY_COLUMN = "density"
+
+# Metric column -> label used in the summary table and plots
+COHORT_METRICS = {
+    "bmi": "BMI",
+    "fat_mass": "Fat Mass (kg)",
+    "fat_free_mass": "Fat-Free Mass (kg)",
+    "ffmi": "FFMI",
+    "body_fat_percentage": "Body Fat Percentage (BMI Method)",
+    "siri_body_fat": "Body Fat Percentage (Siri Equation)",
+    "body_density": "Body Density (Jackson-Pollock)",
+    "jackson_pollock_body_fat": "Body Fat Percentage (Jackson-Pollock)",
+    "sum_skinfolds": "Sum of Skinfolds (mm)",
+}
+
+
+def read_cohort(file, file_name=None):
+    """
+    Read a cohort table from CSV or Parquet.
+    Args:
+        file (str, Path or file-like): The table, e.g. a Streamlit upload.
+        file_name (str, optional): Name used to pick the format; defaults to file.name or the path.
+    Returns:
+        pd.DataFrame: The table with lower-cased, stripped column names.
+    """
+    suffix = Path(file_name or getattr(file, "name", str(file))).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        df = pd.read_parquet(file)
+    else:
+        df = pd.read_csv(file)
+    df.columns = [str(column).strip().lower() for column in df.columns]
+    return df
+
+
+def sex_codes(sex):
+    """
+    Map a sex column ("Male"/"Female", "M"/"F" or 1/0) to 1 = male, 0 = female, NaN if unrecognised.
+    """
+    if pd.api.types.is_numeric_dtype(sex):
+        return sex.where(sex.isin([0, 1])).astype(float)
+    first = sex.astype(str).str.strip().str[:1].str.upper()
+    return first.map({"M": 1.0, "F": 0.0})
+
+
+def compute_cohort_body_composition(df):
+    """
+    Compute every body composition metric for each row with array expressions, no per-row Python loop.
+    The Jackson-Pollock method is picked per row: 7-Site when all seven skinfolds are present,
+    otherwise 3-Site when the three sex-specific sites are, otherwise none.
+    Args:
+        df (pd.DataFrame): Cohort table, see read_cohort.
+    Returns:
+        pd.DataFrame: The input columns followed by jackson_pollock_method and the COHORT_METRICS columns.
+        Metrics that do not apply to a row, or rows with invalid inputs, are NaN.
+    Raises:
+        ValueError: If a required column is missing.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    weight = pd.to_numeric(df["weight"], errors="coerce")
+    height = pd.to_numeric(df["height"], errors="coerce")
+    age = pd.to_numeric(df["age"], errors="coerce")
+    sex = sex_codes(df["sex"])
+    is_male = sex == 1
+    weight = weight.where(weight > 0)
+    height = height.where(height > 0)
+
+    bmi = calculate_bmi(weight, height)
+    fat_mass = calculate_fat_mass(bmi, age, sex)
+    fat_free_mass = calculate_fat_free_mass(weight, fat_mass)
+    body_fat_percentage = (1.20 * bmi) + (0.23 * age) - np.where(is_male, 16.2, 5.4)
+    body_fat_percentage = body_fat_percentage.where(sex.notna())
+
+    if DENSITY_COLUMN in df.columns:
+        density = pd.to_numeric(df[DENSITY_COLUMN], errors="coerce")
+        siri_body_fat = calculate_body_fat_siri(density.where(density > 0))
+    else:
+        siri_body_fat = pd.Series(np.nan, index=df.index)
+
+    skinfolds = pd.DataFrame(
+        {column: pd.to_numeric(df[column], errors="coerce") if column in df.columns else np.nan
+         for column in SKINFOLD_COLUMNS},
+        index=df.index,
+    )
+    sum_7_site = skinfolds.sum(axis=1, min_count=len(SKINFOLD_COLUMNS))
+    male_sites = [site.lower() for site in SKINFOLD_SITES["3-Site"]["Male"]]
+    female_sites = [site.lower() for site in SKINFOLD_SITES["3-Site"]["Female"]]
+    sum_3_site = pd.Series(
+        np.where(is_male, skinfolds[male_sites].sum(axis=1, min_count=3), skinfolds[female_sites].sum(axis=1, min_count=3)),
+        index=df.index,
+    )
+    has_7_site = sum_7_site.notna() & (sum_7_site > 0)
+    has_3_site = ~has_7_site & sum_3_site.notna() & (sum_3_site > 0)
+    sum_skinfolds = sum_7_site.where(has_7_site, sum_3_site.where(has_3_site))
+    method = np.select([has_7_site, has_3_site], ["7-Site", "3-Site"], default="None")
+
+    # Jackson-Pollock density; the 7-site method uses the 3-site coefficients, as in calculate_body_density_7_site
+    body_density = np.where(
+        is_male,
+        1.10938 - (0.0008267 * sum_skinfolds) + (0.0000016 * sum_skinfolds**2) - (0.0002574 * age),
+        1.0994921 - (0.0009929 * sum_skinfolds) + (0.0000023 * sum_skinfolds**2) - (0.0001392 * age),
+    )
+    body_density = pd.Series(body_density, index=df.index).where(sex.notna())
+
+    results = df.copy()
+    results["jackson_pollock_method"] = method
+    results["bmi"] = bmi
+    results["fat_mass"] = fat_mass
+    results["fat_free_mass"] = fat_free_mass
+    results["ffmi"] = calculate_ffmi(fat_free_mass, height / 100)
+    results["body_fat_percentage"] = body_fat_percentage
+    results["siri_body_fat"] = siri_body_fat
+    results["body_density"] = body_density
+    results["jackson_pollock_body_fat"] = calculate_body_fat_siri(body_density)
+    results["sum_skinfolds"] = sum_skinfolds
+    return results
+
+
+# First word of an ADA or ICMR activity level -> multiplier, so either calculator's labels are accepted
+ACTIVITY_MULTIPLIERS = {
+    label.split()[0].lower(): multiplier
+    for levels in (ADA_ACTIVITY_LEVELS, ICMR_ACTIVITY_LEVELS)
+    for label, multiplier in levels.items()
+}
+DEFAULT_ACTIVITY_LEVEL = "Sedentary"
+DEFAULT_GOAL = "Maintenance"
+
+# ICMR RDA columns, e.g. "Protein (g)" -> "rda_protein_g"
+RDA_COLUMNS = {
+    nutrient: "rda_" + nutrient.lower().replace(" (", "_").replace(")", "")
+    for nutrient in ICMR_RDA["Male"]
+}
+
+# Energy metric column -> label used in the summary table and plots
+ENERGY_METRICS = {
+    "bmr": "BMR (kcal/day)",
+    "tdee": "Energy Expenditure (kcal/day)",
+    "calorie_target": "Calorie Target (kcal/day)",
+    "protein_g": "Protein (g)",
+    "fat_g": "Fat (g)",
+    "carbohydrates_g": "Carbohydrates (g)",
+}
+
+
+def _flag(values):
+    # Yes/No, True/False or 1/0 column -> bool
+    if pd.api.types.is_bool_dtype(values):
+        return values.fillna(False)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0) != 0
+    return values.astype(str).str.strip().str[:1].str.upper().isin(["Y", "T", "1"])
+
+
+def compute_cohort_energy(df, default_activity_level=DEFAULT_ACTIVITY_LEVEL, default_goal=DEFAULT_GOAL):
+    """
+    Compute Mifflin-St Jeor BMR, energy expenditure, goal calorie targets with their macronutrient grams,
+    and the ICMR RDA row with its calorie split, for every row at once.
+    Args:
+        df (pd.DataFrame): Cohort table, see read_cohort.
+        default_activity_level (str): Used where the activity_level column is missing or unrecognised.
+        default_goal (str): One of GOALS, used where the goal column is missing or unrecognised.
+    Returns:
+        pd.DataFrame: The input columns followed by the ENERGY_METRICS columns, rda_group, the RDA_COLUMNS
+        and the RDA calorie split (rda_protein_kcal, rda_fat_kcal, rda_carbohydrates_kcal).
+    Raises:
+        ValueError: If a required column is missing.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    weight = pd.to_numeric(df["weight"], errors="coerce")
+    height = pd.to_numeric(df["height"], errors="coerce")
+    age = pd.to_numeric(df["age"], errors="coerce")
+    sex = sex_codes(df["sex"])
+    is_male = sex == 1
+
+    bmr = 10 * weight.where(weight > 0) + 6.25 * height.where(height > 0) - 5 * age + np.where(is_male, 5, -161)
+    bmr = bmr.where(sex.notna())
+
+    default_multiplier = ACTIVITY_MULTIPLIERS[default_activity_level.split()[0].lower()]
+    if "activity_level" in df.columns:
+        multiplier = df["activity_level"].astype(str).str.strip().str.split().str[0].str.lower()
+        multiplier = multiplier.map(ACTIVITY_MULTIPLIERS).fillna(default_multiplier)
+    else:
+        multiplier = default_multiplier
+    tdee = bmr * multiplier
+
+    # Goal adjustment, as adjust_for_goal
+    goals = df["goal"].where(df["goal"].isin(GOALS), default_goal) if "goal" in df.columns else pd.Series(default_goal, index=df.index)
+    adjustment = goals.map({"Weight Loss": -GOAL_ADJUSTMENT_KCAL, "Weight Gain": GOAL_ADJUSTMENT_KCAL}).fillna(0)
+    calorie_target = (tdee + adjustment).where(goals != "Very Low-Calorie Diet (VLCD)", VLCD_CALORIES)
+    calorie_target = calorie_target.where(tdee.notna())
+
+    # RDA group, as select_icmr_rda: pregnancy and lactation take precedence over sex
+    pregnant = _flag(df["pregnant"]) if "pregnant" in df.columns else False
+    lactating = _flag(df["lactating"]) if "lactating" in df.columns else False
+    rda_group = pd.Series(
+        np.select([~is_male & pregnant, ~is_male & lactating, is_male], ["Pregnant", "Lactating", "Male"], default="Female"),
+        index=df.index,
+    ).where(sex.notna())
+    rda_table = pd.DataFrame(ICMR_RDA).T.rename(columns=RDA_COLUMNS)
+    rda = rda_table.reindex(rda_group)
+    rda.index = df.index
+
+    results = df.copy()
+    results["bmr"] = bmr
+    results["tdee"] = tdee
+    results["goal"] = goals
+    results["calorie_target"] = calorie_target
+    # Macronutrient grams, as calculate_macronutrients
+    results["protein_g"] = calorie_target * MACRONUTRIENT_RATIOS["Protein"] / 100 / 4
+    results["fat_g"] = calorie_target * MACRONUTRIENT_RATIOS["Fat"] / 100 / 9
+    results["carbohydrates_g"] = calorie_target * MACRONUTRIENT_RATIOS["Carbohydrates"] / 100 / 4
+    results["rda_group"] = rda_group
+    results = pd.concat([results, rda], axis=1)
+    # RDA calorie split, as macronutrient_distribution
+    results["rda_protein_kcal"] = results[RDA_COLUMNS["Protein (g)"]] * 4
+    results["rda_fat_kcal"] = results[RDA_COLUMNS["Fat (g)"]] * 9
+    results["rda_carbohydrates_kcal"] = (
+        results[RDA_COLUMNS["Energy"]] - results["rda_protein_kcal"] - results["rda_fat_kcal"]
+    )
+    return results
+
+
+def summarize_cohort(results, metrics=COHORT_METRICS):
+    """
+    Distribution summary (count, mean, std, min, quartiles, max) of each metric.
+    Args:
+        metrics (dict): Metric column -> label, COHORT_METRICS or ENERGY_METRICS.
+    Returns:
+        pd.DataFrame: One row per metric, indexed by its label.
+    """
+    summary = results[list(metrics)].describe().T
+    summary.index = [metrics[metric] for metric in summary.index]
+    return summary
+
+
+def cohort_to_csv(results):
+    """
+    Encode a results table for download.
+    Returns:
+        bytes: UTF-8 CSV.
+    """
+    buffer = BytesIO()
+    results.to_csv(buffer, index=False, float_format="%.4f")
+    return buffer.getvalue()
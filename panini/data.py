@@ -0,0 +1,43 @@
+import pandas as pd
+
+from config import BASE_DIR
+
+DATA_DIR = BASE_DIR / "data"
+
+# Number of recipe chunk files (data/recipechunk_1.csv ... recipechunk_35.csv)
+RECIPE_CHUNK_COUNT = 35
+
+# Dataset name -> (CSV path, pd.read_csv keyword arguments)
+DATASETS = {
+    "indb": (DATA_DIR / "INDB_my.csv", {"encoding": "utf-8-sig"}),
+    "mydiet": (DATA_DIR / "mydiet.csv", {}),
+    "our_diet": (DATA_DIR / "our_diet.csv", {}),
+    "our_diet11": (DATA_DIR / "our_diet11.csv", {}),
+    "newdatadiet": (DATA_DIR / "newdatadiet.csv", {}),
+    "cleaned_food_data": (DATA_DIR / "cleaned_food_data.csv", {}),
+    "recipe_links": (DATA_DIR / "recipe_links.csv", {}),
+    "food_index": (DATA_DIR / "index.csv", {}),
+}
+DATASETS.update(
+    {f"recipechunk_{i}": (DATA_DIR / f"recipechunk_{i}.csv", {}) for i in range(1, RECIPE_CHUNK_COUNT + 1)}
+)
+
+
+def dataset_path(name):
+    """
+    Location of a registered dataset.
+    """
+    return DATASETS[name][0]
+
+
+def read_dataset(name):
+    """
+    Read a registered dataset from disk.
+    Args:
+        name (str): Key of DATASETS.
+    Returns:
+        pd.DataFrame: The dataset.
+    """
+    path, read_kwargs = DATASETS[name]
+    return pd.read_csv(path, **read_kwargs)
+
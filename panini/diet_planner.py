@@ -0,0 +1,248 @@
+import random
+
+import pandas as pd
+
+# Meal type -> (mandatory subcodes, optional subcodes, probability of adding one optional item)
+MEAL_STRUCTURE = {
+    "A": (["A1", "A2"], ["A3"], 0.3),  # Breakfast
+    "B": (["B1", "B2"], None, None),   # Morning Snack
+    "C": (["C1", "C2", "C3", "C4"], None, None),  # Lunch
+    "D": (["D1", "D2"], ["D3"], 0.1),  # Evening Snack
+    "E": (["E1", "E2", "E3"], ["E4", "E5"], 0.5),  # Dinner
+    "F": (["F1"], None, None)         # Bedtime Snack
+}
+
+# The our_diet tables have fewer evening snack and dinner subcodes
+OUR_DIET_MEAL_STRUCTURE = {
+    "A": (["A1", "A2"], ["A3"], 0.3),  # Breakfast
+    "B": (["B1", "B2"], None, None),   # Morning Snack
+    "C": (["C1", "C2", "C3", "C4"], None, None),  # Lunch
+    "D": (["D1"], ["D3"], 0.1),  # Evening Snack
+    "E": (["E1"], ["E3"], 0.5),  # Dinner
+    "F": (["F1"], None, None)         # Bedtime Snack
+}
+
+# PDF section -> subcodes listed under it
+MEAL_SECTIONS = {
+    "Breakfast": ["A1", "A2", "A3"],
+    "Morning Snacks": ["B1", "B2"],
+    "Lunch": ["C1", "C2", "C3", "C4"],
+    "Evening Snacks": ["D1", "D2", "D3"],
+    "Dinner": ["E1", "E2", "E3", "E4", "E5"],
+    "Bedtime": ["F1"]
+}
+
+OUR_DIET_MEAL_SECTIONS = {
+    "Breakfast": ["A1", "A2", "A3"],
+    "Morning Snacks": ["B1", "B2"],
+    "Lunch": ["C1", "C2", "C3", "C4"],
+    "Evening Snacks": ["D1", "D3"],
+    "Dinner": ["E1", "E3"],
+    "Bedtime": ["F1"]
+}
+
+
+def prepare_diet_data(diet_data):
+    """
+    Coerce the calorie and protein columns of a diet table to numbers.
+    """
+    diet_data = diet_data.copy()
+    diet_data["Kcal"] = pd.to_numeric(diet_data["Kcal"], errors="coerce")
+    diet_data["Protein Content (g)"] = pd.to_numeric(diet_data["Protein Content (g)"], errors="coerce")
+    return diet_data
+
+
+def group_by_subcode(diet_data):
+    """
+    Split a diet table into its subcodes once, so batch planning does not rescan the table for every meal.
+    The result can be passed anywhere a diet_data argument is expected.
+    Returns:
+        dict: Subcode -> rows.
+    """
+    return {subcode: rows for subcode, rows in diet_data.groupby("subcode")}
+
+
+def _subtype_choices(diet_data, subtype, veg_only):
+    if isinstance(diet_data, dict):
+        choices = diet_data.get(subtype)
+        if choices is None:
+            return None
+    else:
+        choices = diet_data[diet_data["subcode"] == subtype]
+    if veg_only:
+        choices = choices[choices["Veg/Non_Veg"] == "Veg"]
+    return choices
+
+
+# Function to select food items for a meal type based on subtypes and preferences
+def select_items(diet_data, meal_type, mandatory_subtypes, optional_subtypes=None, prob_random=None, veg_only=False,
+                 calorie_distribution=None, rng=random):
+    items = []
+
+    # Skip this meal type if its calorie allocation is 0
+    if calorie_distribution and calorie_distribution.get(meal_type, 0) == 0:
+        return items  # Return an empty list
+
+    # Select one item from each mandatory subtype
+    for subtype in mandatory_subtypes:
+        choices = _subtype_choices(diet_data, subtype, veg_only)
+        if choices is not None and not choices.empty:
+            items.append(choices.sample(1, random_state=rng.randrange(2**32)).to_dict('records')[0])
+
+    # Optionally select one item from optional subtypes based on probability
+    if optional_subtypes and prob_random and rng.random() < prob_random:
+        random_subtype = rng.choice(optional_subtypes)
+        random_choice = _subtype_choices(diet_data, random_subtype, veg_only)
+        if random_choice is not None and not random_choice.empty:
+            items.append(random_choice.sample(1, random_state=rng.randrange(2**32)).to_dict('records')[0])
+
+    return items
+
+
+def generate_daily_chart(diet_data, total_calories, calorie_distribution, veg_only, meal_structure=MEAL_STRUCTURE,
+                         scale_items=False, rng=random):
+    """
+    Pick one day's foods.
+    Args:
+        diet_data (pd.DataFrame or dict): Diet table prepared with prepare_diet_data, or its group_by_subcode.
+        total_calories (float): Daily calorie target.
+        calorie_distribution (dict): Meal type -> calories; meals with 0 are skipped.
+        veg_only (bool): Only pick vegetarian items.
+        meal_structure (dict): MEAL_STRUCTURE or OUR_DIET_MEAL_STRUCTURE.
+        scale_items (bool): Scale each item's calories and protein so the day meets total_calories.
+        rng (random.Random): Source of randomness; pass a seeded instance for reproducible charts.
+    Returns:
+        tuple: (list of item dicts, day's calories, day's protein, adjustment factor).
+    """
+    daily_chart = []
+    total_calories_calculated = 0
+    total_protein_calculated = 0
+
+    for meal_type, (mandatory_subtypes, optional_subtypes, prob_random) in meal_structure.items():
+        items = select_items(diet_data, meal_type, mandatory_subtypes, optional_subtypes, prob_random, veg_only,
+                             calorie_distribution, rng)
+        for item in items:
+            daily_chart.append(item)
+            total_calories_calculated += item["Kcal"]
+            total_protein_calculated += item["Protein Content (g)"]
+
+    # Calculate adjustment factor to scale quantities
+    adjustment_factor = total_calories / total_calories_calculated if total_calories_calculated > 0 else 1
+    if not scale_items:
+        return daily_chart, total_calories_calculated, total_protein_calculated, adjustment_factor
+
+    # Scale items based on adjustment factor
+    for item in daily_chart:
+        item["Kcal"] = round(item["Kcal"] * adjustment_factor, 2)
+        item["Protein Content (g)"] = round(item["Protein Content (g)"] * adjustment_factor, 2)
+
+    # Recalculate total calories and protein after adjustment
+    total_calories_adjusted = sum(item["Kcal"] for item in daily_chart)
+    total_protein_adjusted = sum(item["Protein Content (g)"] for item in daily_chart)
+
+    return daily_chart, total_calories_adjusted, total_protein_adjusted, adjustment_factor
+
+
+def generate_monthly_chart(diet_data, total_calories, calorie_distribution, veg_only, days=7,
+                           meal_structure=MEAL_STRUCTURE, scale_items=False, seed=None):
+    """
+    Generate a multi-day diet chart.
+    Args:
+        days (int): Number of days.
+        seed (int, optional): Seed for a reproducible chart; None uses the global random state.
+        Other arguments are passed to generate_daily_chart.
+    Returns:
+        list: One dict per day with daily_chart, daily_calories, daily_protein and adjustment_factor.
+    """
+    rng = random if seed is None else random.Random(seed)
+    monthly_chart = []
+    for _ in range(days):
+        daily_chart, daily_calories, daily_protein, factor = generate_daily_chart(
+            diet_data, total_calories, calorie_distribution, veg_only, meal_structure, scale_items, rng
+        )
+        monthly_chart.append({
+            "daily_chart": daily_chart,
+            "daily_calories": daily_calories,
+            "daily_protein": daily_protein,
+            "adjustment_factor": factor
+        })
+    return monthly_chart
+
+
+# Share of the daily calories per meal type, from the diet pages' default split (200/0/300/100/200/0 kcal)
+MEAL_CALORIE_SHARES = {"A": 0.25, "B": 0.0, "C": 0.375, "D": 0.125, "E": 0.25, "F": 0.0}
+
+
+def distribute_calories(total_calories, shares=MEAL_CALORIE_SHARES):
+    """
+    Split a daily calorie target across meal types.
+    Returns:
+        dict: Meal type -> kcal, rounded.
+    """
+    return {meal_type: round(total_calories * share) for meal_type, share in shares.items()}
+
+
+def generate_batch_charts(diet_data, calorie_targets, veg_only=False, days=7, meal_structure=MEAL_STRUCTURE,
+                          scale_items=False, shares=MEAL_CALORIE_SHARES, seed=None):
+    """
+    Generate a multi-day chart for each person in a batch, e.g. the calorie targets from
+    panini.cohort.compute_cohort_energy.
+    Args:
+        diet_data (pd.DataFrame): Diet table prepared with prepare_diet_data.
+        calorie_targets (dict or pd.Series): Person id -> daily calorie target; missing targets are skipped.
+        veg_only (bool or dict): One preference for everyone, or person id -> bool.
+        days (int): Number of days per chart.
+        shares (dict): Meal type -> share of the daily target, see distribute_calories.
+        seed (int, optional): Base seed; person i uses seed + i, so charts are reproducible.
+        Other arguments are passed to generate_daily_chart.
+    Returns:
+        dict: Person id -> {"total_calories", "calorie_distribution", "veg_only", "monthly_chart"}.
+    """
+    grouped = group_by_subcode(diet_data)
+    batch = {}
+    for i, (person, total_calories) in enumerate(dict(calorie_targets).items()):
+        if total_calories is None or total_calories != total_calories or total_calories <= 0:
+            continue
+        total_calories = round(total_calories)
+        calorie_distribution = distribute_calories(total_calories, shares)
+        person_veg_only = veg_only.get(person, False) if isinstance(veg_only, dict) else veg_only
+        monthly_chart = generate_monthly_chart(
+            grouped, total_calories, calorie_distribution, person_veg_only, days, meal_structure, scale_items,
+            seed=None if seed is None else seed + i,
+        )
+        batch[person] = {
+            "total_calories": total_calories,
+            "calorie_distribution": calorie_distribution,
+            "veg_only": person_veg_only,
+            "monthly_chart": monthly_chart,
+        }
+    return batch
+
+
+def batch_chart_table(batch):
+    """
+    Flatten a generate_batch_charts result to one row per person, day and food item.
+    Returns:
+        pd.DataFrame: person, day, calorie_target, subcode, Name, Quantities, Kcal and Protein Content (g).
+    """
+    rows = [
+        {
+            "person": person,
+            "day": day,
+            "calorie_target": plan["total_calories"],
+            "subcode": item["subcode"],
+            "Name": item["Name"],
+            "Quantities": item["Quantities"],
+            "Kcal": item["Kcal"],
+            "Protein Content (g)": item["Protein Content (g)"],
+        }
+        for person, plan in batch.items()
+        for day, daily_data in enumerate(plan["monthly_chart"], start=1)
+        for item in daily_data["daily_chart"]
+    ]
+    return pd.DataFrame(rows)
+
+
+# Calculate calorie surplus or deficit
+def calculate_calorie_surplus_deficit(daily_calories, total_calories):
+    return daily_calories - total_calories
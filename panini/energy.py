@@ -0,0 +1,117 @@
+# Energy requirement calculators: Mifflin-St Jeor BMR, activity multipliers, goal adjustments
+# and macronutrient splits, plus the ICMR recommended dietary allowances.
+
+# Activity level multipliers (ADA calculator)
+ADA_ACTIVITY_LEVELS = {
+    "Sedentary (little or no exercise)": 1.2,
+    "Lightly Active (light exercise/sports 1-3 days/week)": 1.375,
+    "Moderately Active (moderate exercise/sports 3-5 days/week)": 1.55,
+    "Very Active (hard exercise/sports 6-7 days/week)": 1.725,
+    "Super Active (very hard exercise, physical job, or training)": 1.9
+}
+
+# Macronutrient recommendations, as percentage of total calories
+MACRONUTRIENT_RATIOS = {
+    "Protein": 30,
+    "Fat": 25,
+    "Carbohydrates": 45
+}
+
+GOALS = ["Very Low-Calorie Diet (VLCD)", "Weight Loss", "Maintenance", "Weight Gain"]
+
+# Fixed intake for a very low-calorie diet, and the daily deficit/surplus for weight loss/gain
+VLCD_CALORIES = 800
+GOAL_ADJUSTMENT_KCAL = 500
+
+# Activity level multipliers (ICMR calculator)
+ICMR_ACTIVITY_LEVELS = {
+    "Sedentary": 1.2,
+    "Lightly Active": 1.375,
+    "Moderately Active": 1.55,
+    "Very Active": 1.725,
+    "Extra Active": 1.9
+}
+
+ICMR_RDA = {
+    "Male": {"Energy": 2425, "Protein (g)": 60, "Fat (g)": 25, "Carbohydrates (g)": 364, "Iron (mg)": 17,
+             "Calcium (mg)": 600, "Sodium (mg)": 2000, "Potassium (mg)": 3500},
+    "Female": {"Energy": 1875, "Protein (g)": 50, "Fat (g)": 20, "Carbohydrates (g)": 281, "Iron (mg)": 21,
+               "Calcium (mg)": 600, "Sodium (mg)": 2000, "Potassium (mg)": 3500},
+    "Pregnant": {"Energy": 350 + 1875, "Protein (g)": 65, "Fat (g)": 25, "Carbohydrates (g)": 300, "Iron (mg)": 35,
+                 "Calcium (mg)": 1200, "Sodium (mg)": 2000, "Potassium (mg)": 3500},
+    "Lactating": {"Energy": 600 + 1875, "Protein (g)": 75, "Fat (g)": 30, "Carbohydrates (g)": 325, "Iron (mg)": 21,
+                  "Calcium (mg)": 1200, "Sodium (mg)": 2000, "Potassium (mg)": 3500}
+}
+
+
+def calculate_bmr(gender, weight, height, age):
+    if gender == "Male":
+        return 10 * weight + 6.25 * height - 5 * age + 5  # Mifflin-St Jeor Equation for Men
+    else:
+        return 10 * weight + 6.25 * height - 5 * age - 161  # Mifflin-St Jeor Equation for Women
+
+
+def calculate_tdee(bmr, activity_level, activity_levels=ADA_ACTIVITY_LEVELS):
+    return bmr * activity_levels[activity_level]
+
+
+def adjust_for_goal(tdee, goal):
+    """
+    Daily calorie target for a goal in GOALS.
+    """
+    if goal == "Very Low-Calorie Diet (VLCD)":
+        return VLCD_CALORIES
+    elif goal == "Weight Loss":
+        return tdee - GOAL_ADJUSTMENT_KCAL
+    elif goal == "Weight Gain":
+        return tdee + GOAL_ADJUSTMENT_KCAL
+    return tdee
+
+
+def calculate_macronutrients(total_calories):
+    """
+    Grams of each macronutrient for the MACRONUTRIENT_RATIOS split of total_calories.
+    """
+    protein_cal = (MACRONUTRIENT_RATIOS["Protein"] / 100) * total_calories
+    fat_cal = (MACRONUTRIENT_RATIOS["Fat"] / 100) * total_calories
+    carb_cal = (MACRONUTRIENT_RATIOS["Carbohydrates"] / 100) * total_calories
+
+    return {
+        "Protein (g)": protein_cal / 4,  # 1 gram of protein = 4 kcal
+        "Fat (g)": fat_cal / 9,  # 1 gram of fat = 9 kcal
+        "Carbohydrates (g)": carb_cal / 4  # 1 gram of carbs = 4 kcal
+    }
+
+
+def calorie_badge(total_calories):
+    if total_calories < 1200:
+        return "Bronze", "Consider increasing your calorie intake to avoid nutritional deficiencies."
+    elif total_calories < 2000:
+        return "Silver", "You’re on track to maintaining a healthy diet!"
+    else:
+        return "Gold", "Excellent balance of energy and nutrients!"
+
+
+def select_icmr_rda(gender, is_pregnant=False, is_lactating=False):
+    """
+    ICMR RDA for a person; pregnancy and lactation take precedence over gender.
+    """
+    if is_pregnant:
+        return ICMR_RDA["Pregnant"]
+    elif is_lactating:
+        return ICMR_RDA["Lactating"]
+    return ICMR_RDA[gender]
+
+
+def macronutrient_distribution(total_energy, protein_g, fat_g):
+    """
+    Calories from protein and fat, with carbohydrates making up the rest of total_energy.
+    """
+    protein_cal = protein_g * 4
+    fat_cal = fat_g * 9
+    carb_cal = total_energy - (protein_cal + fat_cal)
+    return {
+        "Protein": protein_cal,
+        "Fat": fat_cal,
+        "Carbohydrates": carb_cal
+    }
@@ -0,0 +1,278 @@
+# Declarative questionnaires. Each instrument (items, sections, answer options, points, reverse-scored items,
+# section/overall aggregation and badge bands) is a YAML or JSON spec in panini/instruments/, compiled once
+# into lookup tables. The same Instrument renders the form (questionnaire_forms), scores one submission
+# and scores a whole table of submissions in one vectorized pass.
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from lazy_imports import lazy_import
+
+# Only needed for YAML specs and bulk scoring
+yaml = lazy_import("yaml")
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+INSTRUMENTS_DIR = Path(__file__).resolve().parent / "instruments"
+SPEC_SUFFIXES = (".yaml", ".yml", ".json")
+DEFAULT_LANGUAGE = "en"
+AGGREGATIONS = ("sum", "mean")
+
+
+def localized(value, language=DEFAULT_LANGUAGE):
+    """
+    Text in the requested language; specs give either a plain string or a {language: text} mapping.
+    """
+    if isinstance(value, dict):
+        return value.get(language) or value.get(DEFAULT_LANGUAGE) or next(iter(value.values()))
+    return value
+
+
+def _aggregate(values, method):
+    # values: answered item points (None for unanswered or unscored answers). Nothing answered scores None
+    # for either method, as in score_many.
+    answered = [value for value in values if value is not None]
+    if not answered:
+        return None
+    if method == "sum":
+        return sum(answered)
+    return sum(answered) / len(answered)
+
+
+class Instrument:
+    """
+    A compiled questionnaire spec.
+    Args:
+        spec (dict): Parsed instrument spec.
+    Raises:
+        ValueError: If the spec is missing required keys or uses an unknown aggregation.
+    """
+
+    def __init__(self, spec):
+        for key in ("id", "title", "options", "sections"):
+            if key not in spec:
+                raise ValueError(f"Instrument spec is missing '{key}'")
+        scoring = spec.get("scoring", {})
+        self.section_method = scoring.get("section", "sum")
+        self.overall_method = scoring.get("overall", "sum")
+        if self.section_method not in AGGREGATIONS or self.overall_method not in AGGREGATIONS:
+            raise ValueError(f"Instrument '{spec['id']}': scoring must be one of {', '.join(AGGREGATIONS)}")
+
+        self.spec = spec
+        self.id = spec["id"]
+        self.input = spec.get("input", "radio")
+        self.languages = spec.get("languages", [DEFAULT_LANGUAGE])
+        self.options = spec["options"]
+        self.values = [option["value"] for option in self.options]
+        self.default = spec.get("default")
+        self.bands = spec.get("bands", [])
+        self.suggestions = spec.get("suggestions", {})
+        self.sections = spec["sections"]
+        self.items = [item for section in self.sections for item in section["items"]]
+        self.item_ids = [item["id"] for item in self.items]
+        self.remark_values = {option["value"] for option in self.options if option.get("remark")}
+
+        # Option value -> column of the points table; reverse-scored items map a point p to (min + max - p)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+        points = [option.get("points") for option in self.options]
+        scored = [p for p in points if p is not None]
+        low, high = min(scored), max(scored)
+        self.points = [
+            [None if p is None else (low + high - p if item.get("reverse") else p) for p in points]
+            for item in self.items
+        ]
+        # Section id -> (first item index, last item index + 1)
+        self.section_slices = {}
+        start = 0
+        for section in self.sections:
+            self.section_slices[section["id"]] = (start, start + len(section["items"]))
+            start += len(section["items"])
+
+    def title(self, language=DEFAULT_LANGUAGE):
+        return localized(self.spec["title"], language)
+
+    def section_titles(self, language=DEFAULT_LANGUAGE):
+        return [localized(section["title"], language) for section in self.sections]
+
+    def questionnaire(self, language=DEFAULT_LANGUAGE):
+        """
+        Returns:
+            dict: Section title -> list of question texts, the shape the report builders take.
+        """
+        return {
+            localized(section["title"], language): [localized(item["text"], language) for item in section["items"]]
+            for section in self.sections
+        }
+
+    def option_labels(self, language=DEFAULT_LANGUAGE):
+        """
+        Returns:
+            dict: Option value -> label shown to the respondent.
+        """
+        return {option["value"]: localized(option.get("label", option["value"]), language) for option in self.options}
+
+    def remark_prompt(self, question, language=DEFAULT_LANGUAGE):
+        prompt = localized(self.spec.get("remark_prompt", "Remarks for '{question}':"), language)
+        return prompt.format(question=question)
+
+    def answers_by_section(self, answers, language=DEFAULT_LANGUAGE):
+        """
+        Args:
+            answers (dict): Item id -> answer.
+        Returns:
+            dict: Section title -> list of answers in question order.
+        """
+        return {
+            localized(section["title"], language): [answers.get(item["id"]) for item in section["items"]]
+            for section in self.sections
+        }
+
+    def answers_from_sections(self, responses, language=DEFAULT_LANGUAGE):
+        """
+        The inverse of answers_by_section.
+        Args:
+            responses (dict): Section title -> answers in question order, as a list or a {question: answer} dict.
+        Returns:
+            dict: Item id -> answer.
+        """
+        answers = {}
+        for section in self.sections:
+            section_answers = responses.get(localized(section["title"], language), [])
+            if isinstance(section_answers, dict):
+                section_answers = list(section_answers.values())
+            for item, answer in zip(section["items"], section_answers):
+                answers[item["id"]] = answer
+        return answers
+
+    def item_points(self, answers):
+        """
+        Args:
+            answers (dict): Item id -> answer.
+        Returns:
+            list: Points per item in spec order; None for unanswered items and unscored answers.
+        """
+        points = []
+        for row, item_id in zip(self.points, self.item_ids):
+            code = self.codes.get(answers.get(item_id))
+            points.append(None if code is None else row[code])
+        return points
+
+    def score(self, answers, language=DEFAULT_LANGUAGE):
+        """
+        Score one submission.
+        Args:
+            answers (dict): Item id -> answer.
+            language (str): Language of the section titles in the result.
+        Returns:
+            tuple: (section title -> score, overall score, badge, message). A section without any answered
+            item scores None, and so does the overall score when no section was scored; badge and message
+            are None then, and for instruments without bands. Matches score_many row by row.
+        """
+        points = self.item_points(answers)
+        section_scores = {}
+        for section in self.sections:
+            start, end = self.section_slices[section["id"]]
+            section_scores[localized(section["title"], language)] = _aggregate(points[start:end], self.section_method)
+        overall = _aggregate(list(section_scores.values()), self.overall_method)
+        badge, message = self.band(overall)
+        return section_scores, overall, badge, message
+
+    def band(self, score):
+        """
+        Returns:
+            tuple: (badge, message) of the first band whose bound the score meets, or (None, None).
+        """
+        if score is None:
+            return None, None
+        for band in self.bands:
+            if "max" in band and score > band["max"]:
+                continue
+            if "min" in band and score < band["min"]:
+                continue
+            return band["badge"], band["message"]
+        return None, None
+
+    def flagged_tags(self, answers):
+        """
+        Tags of the items that scored points, in question order without repeats (e.g. the nutrients of
+        the deficiency symptoms answered "Yes").
+        """
+        tags = []
+        for item, points in zip(self.items, self.item_points(answers)):
+            if points and item.get("tag") and item["tag"] not in tags:
+                tags.append(item["tag"])
+        return tags
+
+    def score_many(self, responses, language=DEFAULT_LANGUAGE):
+        """
+        Score a table of submissions in one pass.
+        Args:
+            responses (pd.DataFrame): One row per submission, one column per item id. Missing columns and
+            cells, and answers that are not options, count as unanswered.
+            language (str): Language of the section titles in the result.
+        Returns:
+            pd.DataFrame: Section scores, overall, badge and message per row, on the input index. A section
+            without any answered item scores NaN, and a row without any answers has no overall or badge.
+        """
+        n_items = len(self.items)
+        codes = np.full((len(responses), n_items), -1, dtype=np.int64)
+        numeric = all(isinstance(value, (int, float)) for value in self.values)
+        for column, item_id in enumerate(self.item_ids):
+            if item_id not in responses.columns:
+                continue
+            answers = responses[item_id]
+            if numeric:
+                answers = pd.to_numeric(answers, errors="coerce")
+            codes[:, column] = answers.map(self.codes).fillna(-1).to_numpy(dtype=np.int64)
+
+        table = np.array([[np.nan if p is None else p for p in row] for row in self.points], dtype=float)
+        points = np.where(codes >= 0, table[np.arange(n_items), codes.clip(min=0)], np.nan)
+        answered = ~np.isnan(points)
+        filled = np.where(answered, points, 0.0)
+
+        section_scores = {}
+        for section in self.sections:
+            start, end = self.section_slices[section["id"]]
+            total = filled[:, start:end].sum(axis=1)
+            count = answered[:, start:end].sum(axis=1)
+            score = total if self.section_method == "sum" else total / np.maximum(count, 1)
+            section_scores[localized(section["title"], language)] = np.where(count > 0, score, np.nan)
+
+        result = pd.DataFrame(section_scores, index=responses.index)
+        sections = result.to_numpy(dtype=float)
+        total = np.nansum(sections, axis=1)
+        count = (~np.isnan(sections)).sum(axis=1)
+        overall = total if self.overall_method == "sum" else total / np.maximum(count, 1)
+        result["overall"] = np.where(count > 0, overall, np.nan)
+        bands = [self.band(None if score != score else score) for score in result["overall"]]
+        result["badge"] = [badge for badge, _ in bands]
+        result["message"] = [message for _, message in bands]
+        return result
+
+
+def list_instruments():
+    """
+    Returns:
+        list: Names of the instrument specs in INSTRUMENTS_DIR.
+    """
+    return sorted(path.stem for path in INSTRUMENTS_DIR.iterdir() if path.suffix in SPEC_SUFFIXES)
+
+
+@lru_cache(maxsize=None)
+def load_instrument(name):
+    """
+    Load and compile an instrument spec; compiled once per process.
+    Args:
+        name (str): Spec file name without suffix, e.g. "dgai".
+    Returns:
+        Instrument: The compiled instrument.
+    Raises:
+        FileNotFoundError: If there is no spec with that name.
+    """
+    for suffix in SPEC_SUFFIXES:
+        path = INSTRUMENTS_DIR / f"{name}{suffix}"
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                spec = json.load(f) if suffix == ".json" else yaml.safe_load(f)
+            return Instrument(spec)
+    raise FileNotFoundError(f"No instrument spec named '{name}' in {INSTRUMENTS_DIR}")
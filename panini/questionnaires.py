@@ -0,0 +1,106 @@
+# Scoring for the questionnaire pages. DSQOLS, DGAI and Mindful Eating are declarative instruments
+# (panini/instruments/, scored by panini.questionnaire_engine); these functions keep the section-shaped
+# interface the pages and report builders use. IPAQ takes numeric durations rather than option answers,
+# so it stays hand-coded here.
+from panini.questionnaire_engine import load_instrument
+
+# International Physical Activity Questionnaire (IPAQ) MET values per activity
+IPAQ_MET_VALUES = {
+    "vigorous": 8,
+    "moderate": 4,
+    "walking": 3.3
+}
+
+# IPAQ activity levels, by total MET-minutes/week
+IPAQ_HIGH_ACTIVITY = 3000
+IPAQ_MODERATE_ACTIVITY = 600
+
+
+def calculate_dsqols_scores(responses):
+    """
+    Args:
+        responses (dict): Section -> {question: score 1-5}.
+    Returns:
+        tuple: (section -> average score, overall average score).
+    """
+    instrument = load_instrument("dsqols")
+    section_scores, overall_score, _, _ = instrument.score(instrument.answers_from_sections(responses))
+    return section_scores, overall_score
+
+
+def dsqols_badge(overall_score):
+    return load_instrument("dsqols").band(overall_score)
+
+
+def calculate_dgai_scores(responses):
+    """
+    Args:
+        responses (dict): Section -> list of answers ("Always" ... "Never").
+    Returns:
+        tuple: (total points, section -> points).
+    """
+    instrument = load_instrument("dgai")
+    section_scores, total_score, _, _ = instrument.score(instrument.answers_from_sections(responses))
+    return total_score, section_scores
+
+
+def dgai_badge(total_score):
+    return load_instrument("dgai").band(total_score)
+
+
+def calculate_mindful_eating_scores(responses):
+    """
+    Number of "Always"/"Often" answers per section.
+    """
+    instrument = load_instrument("mindful_eating")
+    section_scores, _, _, _ = instrument.score(instrument.answers_from_sections(responses))
+    return section_scores
+
+
+def calculate_activity_score(days, hours, minutes, met):
+    """
+    MET-minutes per week for one activity.
+    """
+    total_minutes = (hours * 60) + minutes
+    return days * total_minutes * met
+
+
+def calculate_ipaq_scores(responses):
+    """
+    Args:
+        responses (dict): "Vigorous Physical Activity", "Moderate Physical Activity" and "Walking" ->
+        {"Days", "Hours", "Minutes"}, and "Sitting" -> {"Hours", "Minutes"}.
+    Returns:
+        tuple: (activity -> score, total MET-minutes/week, activity level "High"/"Moderate"/"Low").
+    """
+    sections = {
+        "vigorous": "Vigorous Physical Activity",
+        "moderate": "Moderate Physical Activity",
+        "walking": "Walking",
+    }
+    scores = {}
+    for activity, section in sections.items():
+        answer = responses[section]
+        scores[activity] = calculate_activity_score(
+            answer["Days"], answer["Hours"], answer["Minutes"], IPAQ_MET_VALUES[activity]
+        )
+    scores["sitting"] = (responses["Sitting"]["Hours"] * 60) + responses["Sitting"]["Minutes"]
+
+    total_score = scores["vigorous"] + scores["moderate"] + scores["walking"]
+    activity_level = (
+        "High" if total_score >= IPAQ_HIGH_ACTIVITY else "Moderate" if total_score >= IPAQ_MODERATE_ACTIVITY else "Low"
+    )
+    return scores, total_score, activity_level
+
+
+def ipaq_badge(total_score):
+    if total_score >= 3000:
+        badge = "Gold"
+        message = "Excellent activity levels! Keep up the great work!"
+    elif total_score >= 1500:
+        badge = "Silver"
+        message = "Good job! Consider increasing your activity slightly for additional health benefits."
+    else:
+        badge = "Bronze"
+        message = "Let's work on improving your activity levels for better health."
+    return badge, message
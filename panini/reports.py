@@ -0,0 +1,507 @@
+# Word and PDF report builders. The Word builders and the diet chart PDFs return the document as bytes and
+# embed charts from PNG bytes, so nothing is written to disk; the body composition PDF is returned as an
+# in-memory buffer. They only take picklable arguments, so report_jobs can run them in worker processes.
+import zipfile
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from config import BASE_DIR
+from lazy_imports import lazy_import
+from panini.diet_planner import MEAL_SECTIONS, calculate_calorie_surplus_deficit
+
+# Report libraries are imported when the first report is built
+docx = lazy_import("docx")
+docx_shared = lazy_import("docx.shared")
+fpdf = lazy_import("fpdf")
+pagesizes = lazy_import("reportlab.lib.pagesizes")
+canvas = lazy_import("reportlab.pdfgen.canvas")
+
+HINDI_FONT_FILE = BASE_DIR / "NotoSansDevanagari-Regular.ttf"
+
+
+# Multi-day diet chart PDF
+def create_diet_chart_pdf(monthly_chart, total_calories, calorie_distribution, veg_only, meal_sections=MEAL_SECTIONS):
+    pdf = fpdf.FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+
+    def add_wrapped_cell(pdf, width, height, text, border=1, align='L', fill=False):
+        """
+        Adds a wrapped cell using MultiCell if the text is too long.
+        """
+        x, y = pdf.get_x(), pdf.get_y()
+        pdf.multi_cell(width, height, text, border=border, align=align, fill=fill)
+        pdf.set_xy(x + width, y)  # Reset cursor to the right of the cell
+
+    # Add First Page: User Inputs
+    pdf.add_page()
+    pdf.set_font("Arial", size=10, style="B")
+    pdf.set_fill_color(173, 216, 230)  # Light blue
+    pdf.cell(0, 10, "Monthly Diet Chart - User Inputs", ln=True, align='C', fill=True)
+    pdf.set_font("Arial", size=10)
+    pdf.ln(10)
+    pdf.cell(0, 10, f"Total Daily Calorie Requirement: {total_calories} kcal", ln=True)
+    pdf.cell(0, 10, "Calorie Distribution:", ln=True)
+    for meal, calories in calorie_distribution.items():
+        pdf.cell(0, 10, f"  - {meal}: {calories} kcal", ln=True)
+    pdf.cell(0, 10, f"Diet Preference: {'Vegetarian' if veg_only else 'Mixed (Veg + Non-Veg)'}", ln=True)
+
+    # Add a blank line
+    pdf.ln(5)
+
+    # Add summary for daily calorie surplus or deficit and multiplication factor
+    pdf.set_font("Arial", size=10, style="B")
+    pdf.cell(0, 10, "Daily Calorie Surplus or Deficit and Multiplication Factor:", ln=True)
+    pdf.set_font("Arial", size=10)
+    for day, daily_data in enumerate(monthly_chart, start=1):
+        surplus_deficit = calculate_calorie_surplus_deficit(daily_data["daily_calories"], total_calories)
+        multiplication_factor = total_calories / daily_data["daily_calories"] if daily_data["daily_calories"] > 0 else 1
+        if surplus_deficit > 0:
+            pdf.cell(0, 10,
+                     f"Day {day}: Surplus of {surplus_deficit:.2f} kcal, Multiplication Factor: {multiplication_factor:.2f}",
+                     ln=True)
+        elif surplus_deficit < 0:
+            pdf.cell(0, 10,
+                     f"Day {day}: Deficit of {abs(surplus_deficit):.2f} kcal, Multiplication Factor: {multiplication_factor:.2f}",
+                     ln=True)
+        else:
+            pdf.cell(0, 10,
+                     f"Day {day}: Balanced at {total_calories} kcal, Multiplication Factor: {multiplication_factor:.2f}",
+                     ln=True)
+
+    # Individual daily charts
+    for day, daily_data in enumerate(monthly_chart, start=1):
+        pdf.add_page()
+        pdf.set_font("Arial", size=10, style="B")
+        pdf.set_fill_color(144, 238, 144)  # Light green
+
+        start_date = datetime.now()
+        current_date = start_date + timedelta(days=day - 1)
+        pdf.cell(0, 10, f"{current_date.strftime('%A, %d %B %Y')} - Diet Chart", ln=True, fill=True)
+        pdf.set_font("Arial", size=10)
+        pdf.cell(0, 10, f"Daily Calories: {daily_data['daily_calories']:.2f} kcal", ln=True)
+        pdf.cell(0, 10, f"Daily Protein: {daily_data['daily_protein']:.2f} g", ln=True)
+
+        # Calculate and include multiplication factor
+        multiplication_factor = total_calories / daily_data["daily_calories"] if daily_data["daily_calories"] > 0 else 1
+        pdf.cell(0, 10, f"Multiplication Factor: {multiplication_factor:.2f}", ln=True)
+
+        surplus_deficit = calculate_calorie_surplus_deficit(daily_data["daily_calories"], total_calories)
+        if surplus_deficit > 0:
+            pdf.set_text_color(0, 128, 0)  # Green for surplus
+            pdf.cell(0, 10, f"Calorie Surplus: {surplus_deficit:.2f} kcal", ln=True)
+        elif surplus_deficit < 0:
+            pdf.set_text_color(255, 0, 0)  # Red for deficit
+            pdf.cell(0, 10, f"Calorie Deficit: {abs(surplus_deficit):.2f} kcal", ln=True)
+        else:
+            pdf.set_text_color(0, 0, 0)  # Black for balanced
+            pdf.cell(0, 10, f"Calories Balanced at {total_calories} kcal", ln=True)
+        pdf.set_text_color(0, 0, 0)
+
+
+        # Dynamically adjust column widths
+        col_widths = [70, 40, 40, 40]
+        row_height = 8  # Dynamic row height to ensure no overlap
+
+        for section, subcodes in meal_sections.items():
+            # Check if there's enough space for the section header and rows
+            if pdf.get_y() > 260:  # Adjust threshold based on page height
+                pdf.add_page()
+
+            pdf.set_font("Arial", size=12, style="B")
+            pdf.set_fill_color(255, 222, 173)  # Light orange
+            pdf.cell(0, 10, section, ln=True, fill=True)
+            pdf.set_font("Arial", size=10)
+            pdf.set_fill_color(230, 230, 250)  # Light lavender for table headers
+            pdf.cell(col_widths[0], row_height, "Food Item", border=1, fill=True, align='C')
+            pdf.cell(col_widths[1], row_height, "Quantity", border=1, fill=True, align='C')
+            pdf.cell(col_widths[2], row_height, "Calories (kcal)", border=1, fill=True, align='C')
+            pdf.cell(col_widths[3], row_height, "Protein (g)", border=1, fill=True, align='C')
+            pdf.ln()
+
+            # Add items for the section
+            for item in daily_data["daily_chart"]:
+                if item["subcode"] in subcodes:
+                    add_wrapped_cell(pdf, col_widths[0], row_height, item["Name"], border=1, align='L')
+                    pdf.cell(col_widths[1], row_height, item["Quantities"], border=1, align='L')
+                    pdf.cell(col_widths[2], row_height, f"{item['Kcal']:.2f}", border=1, align='R')
+                    pdf.cell(col_widths[3], row_height, f"{item['Protein Content (g)']:.2f}", border=1, align='R')
+                    pdf.ln()
+
+    return _pdf_bytes(pdf)
+
+
+def _pdf_bytes(pdf):
+    # PyFPDF returns the document as a latin-1 str, fpdf2 as a bytearray
+    data = pdf.output(dest="S")
+    return data.encode("latin-1") if isinstance(data, str) else bytes(data)
+
+
+def create_batch_diet_chart_zip(batch, meal_sections=MEAL_SECTIONS):
+    """
+    One diet chart PDF per person, zipped.
+    Args:
+        batch (dict): Output of panini.diet_planner.generate_batch_charts.
+        meal_sections (dict): MEAL_SECTIONS or OUR_DIET_MEAL_SECTIONS.
+    Returns:
+        bytes: ZIP archive with diet_chart_<person>.pdf entries.
+    """
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for person, plan in batch.items():
+            archive.writestr(f"diet_chart_{person}.pdf", create_diet_chart_pdf(
+                plan["monthly_chart"], plan["total_calories"], plan["calorie_distribution"], plan["veg_only"],
+                meal_sections,
+            ))
+    return buffer.getvalue()
+
+
+# Custom Hindi PDF class, defined on first use so fpdf is only imported when a PDF is generated
+def create_hindi_pdf():
+    class HindiPDF(fpdf.FPDF):
+        def __init__(self):
+            super().__init__()
+            font_path = HINDI_FONT_FILE
+
+            # Check if the font file exists
+            if not font_path.exists():
+                raise FileNotFoundError(f"{font_path} font file not found! Please ensure it is in the correct folder.")
+
+            # Add the DejaVu font for use in PDF
+            self.add_font("DejaVu", style="", fname=str(font_path), uni=True)
+
+        def add_wrapped_cell(self, width, height, text, border=1, align="L", fill=False):
+            """
+            Adds a wrapped cell using MultiCell if the text is too long.
+            """
+            x, y = self.get_x(), self.get_y()
+            self.multi_cell(width, height, text, border=border, align=align, fill=fill)
+            self.set_xy(x + width, y)
+
+    return HindiPDF()
+
+
+# Multi-day diet chart PDF in Hindi
+def create_hindi_diet_chart_pdf(monthly_chart, total_calories, calorie_distribution, veg_only):
+    # Initialize HindiPDF class
+    pdf = create_hindi_pdf()
+    pdf.set_auto_page_break(auto=True, margin=15)
+
+    # First Page: User Inputs Summary
+    pdf.add_page()
+    pdf.set_font("DejaVu", size=12)
+    pdf.cell(0, 10, "मासिक आहार चार्ट - उपयोगकर्ता इनपुट", ln=True, align="C", border=0)
+
+    pdf.set_font("DejaVu", size=10)
+    pdf.ln(5)  # Add a blank line
+    pdf.cell(0, 10, f"कुल दैनिक कैलोरी आवश्यकता: {total_calories} kcal", ln=True, border=0)
+    pdf.cell(0, 10, "कैलोरी वितरण:", ln=True, border=0)
+
+    # List the calorie distribution for each meal
+    for meal, calories in calorie_distribution.items():
+        pdf.cell(0, 10, f"  - {meal}: {calories} kcal", ln=True, border=0)
+
+    pdf.cell(0, 10, f"आहार वरीयता: {'शाकाहारी' if veg_only else 'मिश्रित'}", ln=True, border=0)
+
+    # Daily Diet Charts
+    for day, daily_data in enumerate(monthly_chart, start=1):
+        pdf.add_page()
+        pdf.set_font("DejaVu", size=12)
+        pdf.cell(0, 10, f"दिन {day}: आहार चार्ट", ln=True, border=0)
+
+        # Add details for each meal
+        pdf.set_font("DejaVu", size=10)
+        pdf.ln(5)  # Add some spacing
+        pdf.set_fill_color(230, 230, 250)  # Light lavender for table headers
+        pdf.cell(70, 10, "भोजन का नाम", border=1, fill=True, align="C")
+        pdf.cell(40, 10, "मात्रा", border=1, fill=True, align="C")
+        pdf.cell(40, 10, "कैलोरी (kcal)", border=1, fill=True, align="C")
+        pdf.cell(40, 10, "प्रोटीन (g)", border=1, fill=True, align="C")
+        pdf.ln()
+
+        # Loop through food items and add them
+        for item in daily_data["daily_chart"]:
+            pdf.cell(70, 10, item["Name"], border=1, align="L")
+            pdf.cell(40, 10, item["Quantities"], border=1, align="L")
+            pdf.cell(40, 10, f"{item['Kcal']:.2f}", border=1, align="R")
+            pdf.cell(40, 10, f"{item['Protein Content (g)']:.2f}", border=1, align="R")
+            pdf.ln()
+
+    return _pdf_bytes(pdf)
+
+
+def _add_images(doc, images, level, width=5.0):
+    # images: title -> PNG bytes, as rendered for the page by panini.charts.figure_to_png
+    for title, png in images.items():
+        doc.add_heading(title, level=level)
+        doc.add_picture(BytesIO(png), width=docx_shared.Inches(width))
+
+
+def _docx_bytes(doc):
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+# Body composition results as a PDF
+def create_body_composition_pdf(data, formulas, references):
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=pagesizes.letter)
+    c.setFont("Helvetica", 12)
+    c.drawString(100, 750, "Body Composition Report")
+    c.line(100, 745, 500, 745)
+
+    y = 720
+    c.drawString(100, y, "Results:")
+    y -= 20
+    for key, value in data.items():
+        c.drawString(100, y, f"{key}: {value}")
+        y -= 20
+
+    y -= 20
+    c.drawString(100, y, "Formulas:")
+    y -= 20
+    for formula in formulas:
+        c.drawString(100, y, formula)
+        y -= 20
+
+    y -= 20
+    c.drawString(100, y, "References:")
+    y -= 20
+    for ref in references:
+        c.drawString(100, y, ref)
+        y -= 20
+
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+
+def dsqols_word_report(responses, section_scores, overall_score, badge, message, images):
+    doc = docx.Document()
+    doc.add_heading('Diabetes-Specific Quality of Life Scale (DSQOLS) Report', level=1)
+    doc.add_paragraph(f"Overall Score: {overall_score:.2f}")
+    doc.add_paragraph(f"Awarded Badge: {badge}")
+    doc.add_paragraph(f"Message: {message}")
+
+    doc.add_heading('Section-wise Scores', level=2)
+    for section, score in section_scores.items():
+        doc.add_paragraph(f"{section}: {score:.2f}")
+
+    doc.add_heading('Your Responses', level=2)
+    for section, questions in responses.items():
+        doc.add_heading(section, level=3)
+        for question, score in questions.items():
+            doc.add_paragraph(f"{question}: {score}")
+
+    doc.add_heading('Visualizations', level=2)
+    _add_images(doc, images, level=3)
+
+    return _docx_bytes(doc)
+
+
+def dgai_word_report(responses, total_score, section_scores, badge, message, images, questionnaire):
+    doc = docx.Document()
+    doc.add_heading('Dietary Guidelines Adherence Index (DGAI) Report', 0)
+    doc.add_paragraph(f"Total Score: {total_score}")
+    doc.add_paragraph(f"Awarded Badge: {badge}")
+    doc.add_paragraph(f"Message: {message}")
+
+    doc.add_heading('Section-wise Scores', level=1)
+    for section, score in section_scores.items():
+        doc.add_paragraph(f"{section}: {score} points")
+
+    doc.add_heading('Visualizations', level=1)
+    _add_images(doc, images, level=2, width=6.0)
+
+    doc.add_heading('Your Responses', level=1)
+    for section, answers in responses.items():
+        doc.add_heading(section, level=2)
+        for question, answer in zip(questionnaire[section], answers):
+            doc.add_paragraph(f"{question}\nYour Answer: {answer}")
+
+    return _docx_bytes(doc)
+
+
+def ipaq_word_report(responses, activity_levels, scores, badge, message, images):
+    doc = docx.Document()
+    doc.add_heading('International Physical Activity Questionnaire (IPAQ) Report', level=1)
+
+    doc.add_paragraph(f"Activity Level: {activity_levels}")
+    doc.add_paragraph(f"Awarded Badge: {badge}")
+    doc.add_paragraph(f"Message: {message}")
+
+    doc.add_heading('Your Scores', level=2)
+    for activity, score in scores.items():
+        doc.add_paragraph(f"{activity.capitalize()} Activity Score: {score} MET-minutes/week")
+
+    doc.add_heading('Your Responses', level=2)
+    for section, response in responses.items():
+        doc.add_heading(section, level=3)
+        for question, answer in response.items():
+            doc.add_paragraph(f"{question}: {answer}")
+
+    doc.add_heading('Visualizations', level=2)
+    _add_images(doc, images, level=3)
+
+    return _docx_bytes(doc)
+
+
+def mindful_eating_word_report(responses, section_scores, radar_chart_png, questionnaire):
+    doc = docx.Document()
+    doc.add_heading("Mindful Eating Questionnaire (MEQ) Results", level=1)
+    doc.add_paragraph("Below are your responses and a radar chart visualization based on the MEQ.")
+
+    # Add responses
+    doc.add_heading("Your Responses", level=2)
+    for section, answers in responses.items():
+        doc.add_heading(section, level=3)
+        for question, answer in zip(questionnaire[section], answers):
+            doc.add_paragraph(f"{question}: {answer}")
+
+    # Add radar chart
+    doc.add_heading("Radar Chart", level=2)
+    doc.add_picture(BytesIO(radar_chart_png), width=docx_shared.Inches(4.0))
+
+    return _docx_bytes(doc)
+
+
+def calorie_needs_word_report(inputs, total_calories, macronutrients, images):
+    doc = docx.Document()
+    doc.add_heading("Daily Calorie Needs and Macronutrient Distribution Report", level=1)
+
+    doc.add_heading("User Details", level=2)
+    for key, value in inputs.items():
+        doc.add_paragraph(f"{key}: {value}")
+
+    doc.add_heading("Daily Calorie Needs", level=2)
+    doc.add_paragraph(f"Total Calories: {total_calories:.2f} kcal/day")
+
+    doc.add_heading("Macronutrient Distribution", level=2)
+    for key, value in macronutrients.items():
+        doc.add_paragraph(f"{key}: {value:.2f} g")
+
+    doc.add_heading("Visualizations", level=2)
+    _add_images(doc, images, level=3)
+
+    return _docx_bytes(doc)
+
+
+def rda_word_report(inputs, rda, energy_expenditure, macronutrients, images):
+    doc = docx.Document()
+    doc.add_heading('Personalized Diet Recommendation', level=1)
+    doc.add_heading('User Details', level=2)
+    for key, value in inputs.items():
+        doc.add_paragraph(f"{key}: {value}")
+
+    doc.add_heading('Energy Expenditure and RDA', level=2)
+    for key, value in rda.items():
+        doc.add_paragraph(f"{key}: {value}")
+    doc.add_paragraph(f"Energy Expenditure: {energy_expenditure:.2f} kcal/day")
+
+    doc.add_heading('Macronutrient Distribution', level=2)
+    for key, value in macronutrients.items():
+        doc.add_paragraph(f"{key}: {value:.2f} kcal")
+
+    doc.add_heading('Visualizations', level=2)
+    _add_images(doc, images, level=3)
+
+    return _docx_bytes(doc)
+
+
+def food_diary_word_report(data, notes, rewards):
+    doc = docx.Document()
+    doc.add_heading("Food Diary Summary", level=1)
+
+    # Add food diary data
+    for day, meals in data.items():
+        doc.add_heading(f"{day}", level=2)
+        for meal in meals:
+            doc.add_heading(meal["Meal Time"], level=3)
+            for key, value in meal.items():
+                if key != "Meal Time":
+                    doc.add_paragraph(f"{key}: {value}")
+
+    # Add additional notes
+    doc.add_heading("Additional Notes", level=2)
+    for key, value in notes.items():
+        doc.add_paragraph(f"{key}: {value}")
+
+    # Add rewards
+    doc.add_heading("Rewards", level=2)
+    if rewards:
+        for reward in rewards:
+            doc.add_paragraph(f"- {reward}")
+    else:
+        doc.add_paragraph("No rewards earned.")
+
+    return _docx_bytes(doc)
+
+
+def nutrient_deficiency_word_report(user_answers, deficiencies, suggestions, images):
+    doc = docx.Document()
+    doc.add_heading("Nutrient Deficiency Analysis Report", level=1)
+
+    # User Responses
+    doc.add_heading("User Responses", level=2)
+    for question, answer in user_answers.items():
+        doc.add_paragraph(f"{question}: {answer}")
+
+    # Identified Deficiencies
+    doc.add_heading("Identified Deficiencies", level=2)
+    for nutrient in deficiencies:
+        doc.add_paragraph(f"- {nutrient}")
+
+    # Food Suggestions
+    doc.add_heading("Suggested Foods", level=2)
+    for nutrient, foods in suggestions.items():
+        doc.add_paragraph(f"{nutrient}: {', '.join(foods)}")
+
+    # Visualizations
+    doc.add_heading("Visualizations", level=2)
+    _add_images(doc, images, level=3)
+
+    return _docx_bytes(doc)
+
+
+def drug_interaction_word_report(drug_names, interactions, warnings, interaction_graph_png, food_rules=None,
+                                 lookup_failed=False):
+    doc = docx.Document()
+    doc.add_heading("Drug Interaction Report", level=1)
+
+    # Drug Names
+    doc.add_heading("Drugs Checked", level=2)
+    for drug in drug_names:
+        doc.add_paragraph(f"- {drug}")
+
+    # Interaction Details
+    doc.add_heading("Interactions", level=2)
+    if lookup_failed:
+        doc.add_paragraph(
+            "The interaction service could not be reached, so some drug pairs were not checked; "
+            "interactions not listed here are unknown, not absent."
+        )
+    if interactions:
+        for interaction in interactions:
+            doc.add_paragraph(
+                f"{' + '.join(interaction['drugs'])} ({interaction['severity']}): {interaction['description']}"
+            )
+    elif not lookup_failed:
+        doc.add_paragraph("No significant interactions found.")
+
+    # Warnings
+    doc.add_heading("Drug Warnings (Fallback)", level=2)
+    for drug, warning in warnings.items():
+        doc.add_paragraph(f"{drug}: {warning}")
+
+    # Drug-Food Interactions
+    if food_rules:
+        doc.add_heading("Drug-Food Interactions", level=2)
+        for rule in food_rules:
+            doc.add_paragraph(f"{rule['drug']}: {rule['effect']} {rule['advice']}")
+
+    # Add Interaction Graph
+    if interaction_graph_png:
+        doc.add_heading("Interaction Network Graph", level=2)
+        doc.add_picture(BytesIO(interaction_graph_png))
+
+    return _docx_bytes(doc)
@@ -0,0 +1,268 @@
+# Local store of packaged food products keyed by barcode.
+# Populated from OpenFoodFacts lookups, or in bulk from the OpenFoodFacts CSV export:
+#   python product_store.py en.openfoodfacts.org.products.csv.gz --country India
+import argparse
+import csv
+import gzip
+import json
+import re
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from config import OPENFOODFACTS_REQUESTS_PER_MINUTE, PRODUCT_DB
+from http_utils import DEFAULT_TIMEOUT, RateLimiter, create_session
+
+OPENFOODFACTS_URL = "https://world.openfoodfacts.org/api/v0/product/{barcode}.json"
+OPENFOODFACTS_LIMITER = RateLimiter(OPENFOODFACTS_REQUESTS_PER_MINUTE / 60)
+
+# Barcodes not found on OpenFoodFacts are retried after this many days
+MISSING_RETRY_DAYS = 7
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    barcode TEXT PRIMARY KEY,
+    product_name TEXT,
+    brands TEXT,
+    nutriments TEXT NOT NULL,
+    source TEXT,
+    fetched_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS missing_barcodes (
+    barcode TEXT PRIMARY KEY,
+    checked_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def normalize_barcode(barcode):
+    """
+    Keep only the digits of a barcode.
+    """
+    return re.sub(r"\D", "", str(barcode))
+
+
+def parse_barcode_list(text):
+    """
+    Extract unique barcodes from pasted text (one per line, or separated by commas/spaces).
+    """
+    return list(dict.fromkeys(b for b in (normalize_barcode(t) for t in re.split(r"[\s,;]+", text)) if b))
+
+
+def get_connection(db_path=PRODUCT_DB):
+    """
+    Open the product store, creating tables if needed.
+    Args:
+        db_path (Path): Location of the SQLite database file.
+    Returns:
+        sqlite3.Connection: Open connection.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get_stored_products(conn, barcodes):
+    """
+    Read products from the local store.
+    Returns:
+        tuple: (mapping of barcode -> product dict, set of barcodes recently confirmed missing).
+    """
+    found = {}
+    missing = set()
+    retry_after = (datetime.now() - timedelta(days=MISSING_RETRY_DAYS)).isoformat(timespec="seconds")
+    for barcode in barcodes:
+        row = conn.execute(
+            "SELECT product_name, brands, nutriments FROM products WHERE barcode = ?", (barcode,)
+        ).fetchone()
+        if row:
+            found[barcode] = {"code": barcode, "product_name": row[0], "brands": row[1], "nutriments": json.loads(row[2])}
+        elif conn.execute(
+            "SELECT 1 FROM missing_barcodes WHERE barcode = ? AND checked_at > ?", (barcode, retry_after)
+        ).fetchone():
+            missing.add(barcode)
+    return found, missing
+
+
+def get_all_products(conn):
+    """
+    Read every product in the local store.
+    Returns:
+        list: Product dicts with code, product_name, brands and nutriments.
+    """
+    return [
+        {"code": row[0], "product_name": row[1], "brands": row[2], "nutriments": json.loads(row[3])}
+        for row in conn.execute("SELECT barcode, product_name, brands, nutriments FROM products ORDER BY barcode")
+    ]
+
+
+def save_products(conn, products, source="openfoodfacts_api"):
+    """
+    Store products in the local store.
+    Args:
+        conn (sqlite3.Connection): Open product store connection.
+        products (dict): Mapping of barcode -> OpenFoodFacts product dict.
+        source (str): Where the products came from.
+    """
+    fetched_at = datetime.now().isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO products (barcode, product_name, brands, nutriments, source, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (barcode, product.get("product_name", ""), product.get("brands", ""),
+                 json.dumps(product.get("nutriments", {})), source, fetched_at)
+                for barcode, product in products.items()
+            ],
+        )
+        conn.executemany("DELETE FROM missing_barcodes WHERE barcode = ?", [(b,) for b in products])
+
+
+def save_missing(conn, barcodes):
+    """
+    Remember barcodes that OpenFoodFacts does not know.
+    """
+    checked_at = datetime.now().isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO missing_barcodes (barcode, checked_at) VALUES (?, ?)",
+            [(barcode, checked_at) for barcode in barcodes],
+        )
+
+
+def fetch_product(session, barcode):
+    """
+    Fetch one product from the OpenFoodFacts API.
+    Returns:
+        dict or None: The OpenFoodFacts product, or None if the barcode is unknown.
+    """
+    OPENFOODFACTS_LIMITER.wait()
+    response = session.get(OPENFOODFACTS_URL.format(barcode=barcode), timeout=DEFAULT_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") != 1:
+        return None
+    product = data.get("product", {})
+    return {
+        "code": barcode,
+        "product_name": product.get("product_name", ""),
+        "brands": product.get("brands", ""),
+        "nutriments": product.get("nutriments", {}),
+    }
+
+
+def lookup_products(barcodes, max_workers=8):
+    """
+    Resolve barcodes from the local store first and fetch the misses concurrently.
+    Args:
+        barcodes (list): Barcodes to resolve.
+        max_workers (int): Number of concurrent OpenFoodFacts requests.
+    Returns:
+        tuple: (mapping of barcode -> product dict or None if unknown, list of barcodes that failed).
+    """
+    barcodes = list(dict.fromkeys(normalize_barcode(b) for b in barcodes if normalize_barcode(b)))
+    conn = get_connection()
+    try:
+        products, missing = get_stored_products(conn, barcodes)
+        pending = [b for b in barcodes if b not in products and b not in missing]
+        fetched = {}
+        not_found = []
+        failed = []
+        if pending:
+            session = create_session(pool_size=max_workers)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {b: executor.submit(fetch_product, session, b) for b in pending}
+                for barcode, future in futures.items():
+                    try:
+                        product = future.result()
+                    except Exception:
+                        failed.append(barcode)
+                        continue
+                    if product is None:
+                        not_found.append(barcode)
+                    else:
+                        fetched[barcode] = product
+            save_products(conn, fetched)
+            save_missing(conn, not_found)
+    finally:
+        conn.close()
+
+    products.update(fetched)
+    return {b: products.get(b) for b in barcodes if b not in failed}, failed
+
+
+def product_details(product):
+    """
+    Summarise a product's per-100 g nutrients for display.
+    """
+    nutriments = product.get("nutriments", {})
+    return {
+        "Barcode": product.get("code", ""),
+        "Product Name": product.get("product_name") or "N/A",
+        "Brand": product.get("brands") or "N/A",
+        "Calories (kcal)": nutriments.get("energy-kcal_100g", "N/A"),
+        "Protein (g)": nutriments.get("proteins_100g", "N/A"),
+        "Fat (g)": nutriments.get("fat_100g", "N/A"),
+        "Carbohydrates (g)": nutriments.get("carbohydrates_100g", "N/A"),
+        "Fiber (g)": nutriments.get("fiber_100g", "N/A"),
+        "Sugars (g)": nutriments.get("sugars_100g", "N/A"),
+    }
+
+
+def import_openfoodfacts_dump(conn, path, country=None, batch_size=10000):
+    """
+    Import products from the OpenFoodFacts CSV export (tab-separated, optionally gzipped).
+    Args:
+        conn (sqlite3.Connection): Open product store connection.
+        path (str): Path to the export file.
+        country (str, optional): Only import products sold in this country (matched on countries_en).
+        batch_size (int): Number of products written per transaction.
+    Returns:
+        int: Number of products imported.
+    """
+    csv.field_size_limit(sys.maxsize)
+    opener = gzip.open if str(path).endswith(".gz") else open
+    imported = 0
+    batch = {}
+    with opener(path, "rt", encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file, delimiter="\t"):
+            barcode = normalize_barcode(row.get("code", ""))
+            if not barcode:
+                continue
+            if country and country.lower() not in (row.get("countries_en") or "").lower():
+                continue
+            nutriments = {}
+            for key, value in row.items():
+                if key.endswith("_100g") and value:
+                    try:
+                        nutriments[key] = float(value)
+                    except ValueError:
+                        continue
+            batch[barcode] = {
+                "product_name": row.get("product_name", ""),
+                "brands": row.get("brands", ""),
+                "nutriments": nutriments,
+            }
+            if len(batch) >= batch_size:
+                save_products(conn, batch, source="openfoodfacts_dump")
+                imported += len(batch)
+                batch = {}
+    if batch:
+        save_products(conn, batch, source="openfoodfacts_dump")
+        imported += len(batch)
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import an OpenFoodFacts CSV export into the local product store.")
+    parser.add_argument("path", help="en.openfoodfacts.org.products.csv(.gz)")
+    parser.add_argument("--country", help="Only import products sold in this country, e.g. India")
+    args = parser.parse_args()
+    store = get_connection()
+    try:
+        print(f"Imported {import_openfoodfacts_dump(store, args.path, country=args.country)} products into {PRODUCT_DB}")
+    finally:
+        store.close()
@@ -0,0 +1,176 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+from config import PUBMED_CACHE_DB
+
+# Cached searches older than this are run again so newly indexed articles are found
+SEARCH_TTL_DAYS = 7
+
+# Bumped when a one-off migration is added to get_connection; stored as PRAGMA user_version
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS esearch_results (
+    query TEXT NOT NULL,
+    retmax INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    pmids TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (query, retmax)
+);
+
+CREATE TABLE IF NOT EXISTS journal_articles (
+    pmid TEXT PRIMARY KEY,
+    journal TEXT NOT NULL,
+    title TEXT,
+    pubdate TEXT,
+    sortpubdate TEXT,
+    doi TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_journal_articles_journal_date
+    ON journal_articles (journal, sortpubdate DESC);
+
+CREATE TABLE IF NOT EXISTS journal_sync (
+    journal TEXT PRIMARY KEY,
+    last_sync TEXT NOT NULL
+);
+"""
+
+
+def get_connection(db_path=PUBMED_CACHE_DB):
+    """
+    Open a connection to the local PubMed cache, creating tables if needed.
+    Args:
+        db_path (Path): Location of the SQLite database file.
+    Returns:
+        sqlite3.Connection: Open connection in WAL mode.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        # esearch_cache was keyed by query only; superseded by esearch_results, which is also keyed by retmax
+        conn.execute("DROP TABLE IF EXISTS esearch_cache")
+    if version < SCHEMA_VERSION:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get_cached_searches(conn, queries, retmax, ttl_days=SEARCH_TTL_DAYS):
+    """
+    Look up previously executed esearch queries.
+    Args:
+        conn (sqlite3.Connection): Open cache connection.
+        queries (list): Query strings to look up.
+        retmax (int): Maximum PMIDs retrieved per query; searches run with another retmax are not reused.
+        ttl_days (float): Age after which a cached search is ignored.
+    Returns:
+        dict: Mapping of query -> {"count": int, "pmids": list} for fresh cached queries only.
+    """
+    fresh_after = (datetime.now() - timedelta(days=ttl_days)).isoformat(timespec="seconds")
+    cached = {}
+    for query in queries:
+        row = conn.execute(
+            "SELECT count, pmids FROM esearch_results WHERE query = ? AND retmax = ? AND fetched_at >= ?",
+            (query, retmax, fresh_after),
+        ).fetchone()
+        if row:
+            cached[query] = {"count": row[0], "pmids": json.loads(row[1])}
+    return cached
+
+
+def save_searches(conn, results, retmax):
+    """
+    Store esearch results in the cache.
+    Args:
+        conn (sqlite3.Connection): Open cache connection.
+        results (dict): Mapping of query -> {"count": int, "pmids": list}.
+        retmax (int): Maximum PMIDs the searches were run with.
+    """
+    fetched_at = datetime.now().isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO esearch_results (query, retmax, count, pmids, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (query, retmax, result["count"], json.dumps(result["pmids"]), fetched_at)
+                for query, result in results.items()
+            ],
+        )
+
+
+def save_journal_articles(conn, journal, summaries):
+    """
+    Store ESummary records for a journal.
+    Args:
+        conn (sqlite3.Connection): Open cache connection.
+        journal (str): Journal abbreviation the articles were fetched for.
+        summaries (list): ESummary result dictionaries.
+    """
+    fetched_at = datetime.now().isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO journal_articles "
+            "(pmid, journal, title, pubdate, sortpubdate, doi, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    item["uid"],
+                    journal,
+                    item.get("title", "No Title Available"),
+                    item.get("pubdate", "No Date Available"),
+                    item.get("sortpubdate", ""),
+                    item.get("elocationid", "No DOI Available"),
+                    fetched_at,
+                )
+                for item in summaries
+            ],
+        )
+
+
+def get_journal_articles(conn, journal, start, end):
+    """
+    Read a page of a journal's most recent cached articles.
+    Args:
+        conn (sqlite3.Connection): Open cache connection.
+        journal (str): Journal abbreviation.
+        start (int): Offset of the first article (newest first).
+        end (int): Offset one past the last article.
+    Returns:
+        list: Dictionaries with pmid, title, pubdate and doi.
+    """
+    rows = conn.execute(
+        "SELECT pmid, title, pubdate, doi FROM journal_articles WHERE journal = ? "
+        "ORDER BY sortpubdate DESC, pmid DESC LIMIT ? OFFSET ?",
+        (journal, end - start, start),
+    ).fetchall()
+    return [{"pmid": r[0], "title": r[1], "pubdate": r[2], "doi": r[3]} for r in rows]
+
+
+def count_journal_articles(conn, journal):
+    """
+    Count cached articles for a journal.
+    """
+    return conn.execute("SELECT COUNT(*) FROM journal_articles WHERE journal = ?", (journal,)).fetchone()[0]
+
+
+def get_last_sync(conn, journal):
+    """
+    Get the date a journal was last synchronised.
+    Returns:
+        str or None: Date as YYYY/MM/DD, or None if never synced.
+    """
+    row = conn.execute("SELECT last_sync FROM journal_sync WHERE journal = ?", (journal,)).fetchone()
+    return row[0] if row else None
+
+
+def set_last_sync(conn, journal, sync_date):
+    """
+    Record the date a journal was last synchronised.
+    """
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO journal_sync (journal, last_sync) VALUES (?, ?)", (journal, sync_date)
+        )
@@ -0,0 +1,56 @@
+# Streamlit form for a declarative questionnaire (panini.questionnaire_engine). Widgets follow the spec's
+# input type; keys are the instrument and item ids, so two questions with the same text never collide.
+import streamlit as st
+
+from panini.questionnaire_engine import localized
+
+SEX_OPTIONS = ["", "Male", "Female"]
+
+
+def render_form(instrument, language="en"):
+    """
+    Render every section of an instrument and collect the answers.
+    Args:
+        instrument (Instrument): Compiled instrument, from load_instrument.
+        language (str): Language of the questions and option labels.
+    Returns:
+        tuple: (item id -> answer, item id -> remark for answers that ask for one).
+    """
+    labels = instrument.option_labels(language)
+    answers = {}
+    remarks = {}
+    for section in instrument.sections:
+        st.header(localized(section["title"], language))
+        for item in section["items"]:
+            question = localized(item["text"], language)
+            key = f"{instrument.id}_{item['id']}"
+            if instrument.input == "slider":
+                answer = st.slider(
+                    question,
+                    min_value=min(instrument.values),
+                    max_value=max(instrument.values),
+                    value=instrument.default if instrument.default is not None else min(instrument.values),
+                    key=key,
+                )
+            elif instrument.input == "selectbox":
+                answer = st.selectbox(question, instrument.values, format_func=labels.get, key=key)
+            else:
+                answer = st.radio(question, instrument.values, format_func=labels.get, index=0, key=key)
+            answers[item["id"]] = answer
+            if answer in instrument.remark_values:
+                remarks[item["id"]] = st.text_input(instrument.remark_prompt(question, language), "", key=f"{key}_remark")
+    return answers, remarks
+
+
+def respondent_details():
+    """
+    Optional respondent fields stored with a submission; age, sex and site feed the cohort dashboard.
+    Returns:
+        dict: respondent_id, age, sex and site, as taken by submission_store.submit.
+    """
+    with st.expander("Respondent details (optional)"):
+        respondent_id = st.text_input("Respondent ID (links this person's repeat submissions)", key="respondent_id")
+        age = st.number_input("Age", min_value=0, max_value=120, value=None, key="respondent_age")
+        sex = st.selectbox("Sex", SEX_OPTIONS, key="respondent_sex")
+        site = st.text_input("Site (clinic, camp or centre)", key="respondent_site")
+    return {"respondent_id": respondent_id, "age": age, "sex": sex or None, "site": site.strip() or None}
@@ -0,0 +1,82 @@
+# Streamlit side of the background report queue (report_jobs.py). A page requests a report, which only
+# queues a job, and calls report_download() on every rerun, outside the block that requested it. While the
+# job runs, the download area polls it on its own, so the rest of the page stays usable; once the job has
+# finished or failed, its outcome is kept in the session, polling stops and the page reruns once to show it.
+import streamlit as st
+
+from report_jobs import DONE, FAILED, job_result, job_status, submit_report
+
+POLL_INTERVAL = "1s"
+EXPIRED = "expired"
+
+
+def _job_key(key):
+    return f"report_job_{key}"
+
+
+def _outcome_key(key):
+    return f"report_outcome_{key}"
+
+
+def request_report(key, kind, *args, **kwargs):
+    """
+    Queue a report for this session, replacing any earlier request under the same key.
+    Args:
+        key (str): Name of the download area on the page.
+        kind (str): Report kind, from report_jobs.REPORT_BUILDERS.
+        *args, **kwargs: Arguments of the report builder.
+    """
+    st.session_state[_job_key(key)] = submit_report(kind, *args, **kwargs)
+    st.session_state.pop(_outcome_key(key), None)
+
+
+def _check(key):
+    # Store and return the job's outcome once it has reached a final status; None while it is still running
+    job_id = st.session_state[_job_key(key)]
+    status = job_status(job_id)
+    if status is None:
+        outcome = (EXPIRED, None)
+    elif status["status"] == FAILED:
+        outcome = (FAILED, status["error"])
+    elif status["status"] == DONE:
+        report = job_result(job_id)
+        # The file may have been cleaned up between the two queries
+        outcome = (EXPIRED, None) if report is None else (DONE, report)
+    else:
+        return None
+    st.session_state[_outcome_key(key)] = outcome
+    return outcome
+
+
+@st.fragment(run_every=POLL_INTERVAL)
+def _poll(key):
+    # Reruns on its own, without rerunning the page, until the job reaches a final status; the page then
+    # reruns once so report_download shows the outcome without this fragment, and polling stops.
+    if _check(key) is None:
+        st.info("Your report is being prepared...")
+        return
+    st.rerun(scope="app")
+
+
+def report_download(key, file_name, label="Download Report"):
+    """
+    Show the download button of the session's last requested report, or its progress while it is built.
+    Does nothing if no report was requested. Call it on every rerun, not only when the report is requested.
+    Args:
+        key (str): Name of the download area, as passed to request_report.
+        file_name (str): Name of the downloaded file.
+        label (str): Button label.
+    """
+    if _job_key(key) not in st.session_state:
+        return
+    outcome = st.session_state.get(_outcome_key(key)) or _check(key)
+    if outcome is None:
+        _poll(key)
+        return
+    status, value = outcome
+    if status == EXPIRED:
+        st.warning("The report has expired. Please generate it again.")
+    elif status == FAILED:
+        st.error(f"The report could not be generated: {value}")
+    else:
+        st.download_button(label, value, file_name=file_name, key=f"download_{st.session_state[_job_key(key)]}")
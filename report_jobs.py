@@ -0,0 +1,238 @@
+# Background report generation. Pages submit a report job (a builder from panini.reports and its arguments)
+# and poll for it on later reruns, so building Word and PDF files with embedded images never blocks the
+# Streamlit session, and several reports are built at once.
+# Jobs are recorded in SQLite (WAL) with their pickled arguments and run in a local pool of worker processes;
+# finished files are kept in REPORT_JOBS_DIR. resume_jobs() resubmits jobs that were queued or running when
+# the server stopped, and cleanup_jobs() removes old jobs and their files; submit_report() runs it every
+# CLEANUP_INTERVAL_SECONDS, so long-running servers do not accumulate reports. The arguments of a job (patient
+# answers) are cleared as soon as it finishes.
+import multiprocessing
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from config import REPORT_JOBS_DB, REPORT_JOBS_DIR, REPORT_RETENTION_HOURS, REPORT_WORKERS
+
+# Report kind -> (builder in panini.reports, file suffix)
+REPORT_BUILDERS = {
+    "dsqols": ("dsqols_word_report", ".docx"),
+    "dgai": ("dgai_word_report", ".docx"),
+    "ipaq": ("ipaq_word_report", ".docx"),
+    "mindful_eating": ("mindful_eating_word_report", ".docx"),
+    "calorie_needs": ("calorie_needs_word_report", ".docx"),
+    "rda": ("rda_word_report", ".docx"),
+    "food_diary": ("food_diary_word_report", ".docx"),
+    "nutrient_deficiency": ("nutrient_deficiency_word_report", ".docx"),
+    "drug_interaction": ("drug_interaction_word_report", ".docx"),
+    "body_composition": ("create_body_composition_pdf", ".pdf"),
+}
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Minimum time between two cleanups triggered by submit_report
+CLEANUP_INTERVAL_SECONDS = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    arguments BLOB NOT NULL,
+    output_path TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+"""
+
+_executor = None
+_executor_lock = threading.Lock()
+_last_cleanup = 0.0
+_cleanup_lock = threading.Lock()
+
+
+def get_connection(db_path=REPORT_JOBS_DB):
+    """
+    Open the job table, creating it if needed.
+    Args:
+        db_path (Path): Location of the SQLite database file.
+    Returns:
+        sqlite3.Connection: Open connection.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _pool():
+    # Worker processes are spawned rather than forked, as the Streamlit server runs many threads
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=REPORT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+    return _executor
+
+
+def _set_status(job_id, status, **fields):
+    assignments = "".join(f", {field} = ?" for field in fields)
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute(f"UPDATE jobs SET status = ?{assignments} WHERE id = ?", (status, *fields.values(), job_id))
+    finally:
+        conn.close()
+
+
+def build_report(job_id, kind, args, kwargs, output_path):
+    """
+    Run one report builder and write its output; runs in a worker process.
+    Builders return bytes or an in-memory buffer.
+    Returns:
+        str: output_path.
+    """
+    from panini import reports
+
+    _set_status(job_id, RUNNING)
+    function_name, _ = REPORT_BUILDERS[kind]
+    result = getattr(reports, function_name)(*args, **kwargs)
+    Path(output_path).write_bytes(result.getvalue() if hasattr(result, "getvalue") else result)
+    return str(output_path)
+
+
+def _finish(job_id, future):
+    # Done-callback of a job's future: record the outcome
+    # Its arguments are only needed to resume an unfinished job
+    error = future.exception()
+    _set_status(
+        job_id, FAILED if error else DONE,
+        error=repr(error) if error else None, finished_at=datetime.now().isoformat(timespec="seconds"),
+        arguments=b"",
+    )
+
+
+def _start(job_id, kind, args, kwargs):
+    output_path = REPORT_JOBS_DIR / f"{job_id}{REPORT_BUILDERS[kind][1]}"
+    _set_status(job_id, QUEUED, output_path=str(output_path))
+    future = _pool().submit(build_report, job_id, kind, args, kwargs, output_path)
+    future.add_done_callback(lambda f: _finish(job_id, f))
+
+
+def submit_report(kind, *args, **kwargs):
+    """
+    Queue a report and return immediately.
+    Args:
+        kind (str): Report kind, from REPORT_BUILDERS.
+        *args, **kwargs: Arguments of the builder; they must be picklable (charts as PNG bytes, dicts).
+    Returns:
+        str: Job id, for job_status and job_result.
+    Raises:
+        ValueError: If the report kind is unknown.
+    """
+    if kind not in REPORT_BUILDERS:
+        raise ValueError(f"Unknown report kind: {kind}")
+    _periodic_cleanup()
+    job_id = uuid.uuid4().hex
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, arguments, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, pickle.dumps((args, kwargs)), datetime.now().isoformat(timespec="seconds")),
+            )
+    finally:
+        conn.close()
+    _start(job_id, kind, args, kwargs)
+    return job_id
+
+
+def job_status(job_id):
+    """
+    Returns:
+        dict: kind, status ("queued", "running", "done" or "failed"), error, created_at and finished_at;
+        None for an unknown job.
+    """
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT kind, status, error, created_at, finished_at FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    return dict(zip(["kind", "status", "error", "created_at", "finished_at"], row))
+
+
+def job_result(job_id):
+    """
+    Returns:
+        bytes: The finished report, or None if the job is not done.
+    """
+    conn = get_connection()
+    try:
+        row = conn.execute("SELECT output_path FROM jobs WHERE id = ? AND status = ?", (job_id, DONE)).fetchone()
+    finally:
+        conn.close()
+    if row is None or not Path(row[0]).exists():
+        return None
+    return Path(row[0]).read_bytes()
+
+
+def resume_jobs():
+    """
+    Resubmit jobs that were queued or running when the server last stopped.
+    Returns:
+        int: Number of jobs resubmitted.
+    """
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            "SELECT id, kind, arguments FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+        ).fetchall()
+    finally:
+        conn.close()
+    for job_id, kind, arguments in rows:
+        args, kwargs = pickle.loads(arguments)
+        _start(job_id, kind, args, kwargs)
+    return len(rows)
+
+
+def _periodic_cleanup():
+    global _last_cleanup
+    with _cleanup_lock:
+        if time.monotonic() - _last_cleanup < CLEANUP_INTERVAL_SECONDS:
+            return
+        _last_cleanup = time.monotonic()
+    cleanup_jobs()
+
+
+def cleanup_jobs(max_age_hours=REPORT_RETENTION_HOURS):
+    """
+    Delete finished and failed jobs older than max_age_hours, with their files.
+    Returns:
+        int: Number of jobs removed.
+    """
+    cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat(timespec="seconds")
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            "SELECT id, output_path FROM jobs WHERE status IN (?, ?) AND created_at < ?", (DONE, FAILED, cutoff)
+        ).fetchall()
+        for _, output_path in rows:
+            if output_path:
+                Path(output_path).unlink(missing_ok=True)
+        with conn:
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id, _ in rows])
+    finally:
+        conn.close()
+    return len(rows)
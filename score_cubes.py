@@ -0,0 +1,183 @@
+# Pre-aggregated summary cubes over stored questionnaire scores, so dashboard filters never rescan submissions.
+# A cube row holds the count, sum and sum of squares of one score (overall, a section or an IPAQ activity)
+# for one combination of instrument, month, age band, sex and site. submission_store adds each submission
+# to its rows in the same transaction that stores it; any filter or grouping is then a SUM over cube rows,
+# whose number depends on the dimension values rather than the number of submissions. Mean and standard
+# deviation follow from count, sum and sum of squares.
+import math
+
+# Cube dimensions, in key order
+DIMENSIONS = ["month", "age_band", "sex", "site"]
+UNKNOWN = "Unknown"
+
+# (upper bound, exclusive, label); older ages fall in OLDEST_AGE_BAND
+AGE_BANDS = [(18, "<18"), (30, "18-29"), (45, "30-44"), (60, "45-59")]
+OLDEST_AGE_BAND = "60+"
+AGE_BAND_LABELS = [label for _, label in AGE_BANDS] + [OLDEST_AGE_BAND, UNKNOWN]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS score_cube (
+    instrument TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    month TEXT NOT NULL,
+    age_band TEXT NOT NULL,
+    sex TEXT NOT NULL,
+    site TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    total REAL NOT NULL,
+    total_sq REAL NOT NULL,
+    PRIMARY KEY (instrument, metric, month, age_band, sex, site)
+) WITHOUT ROWID;
+"""
+
+UPSERT_SQL = """
+INSERT INTO score_cube (instrument, metric, month, age_band, sex, site, n, total, total_sq)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (instrument, metric, month, age_band, sex, site) DO UPDATE SET
+    n = n + excluded.n,
+    total = total + excluded.total,
+    total_sq = total_sq + excluded.total_sq
+"""
+
+
+def create_tables(conn):
+    conn.executescript(SCHEMA)
+
+
+def age_band(age):
+    if age is None or age != age:
+        return UNKNOWN
+    for upper, label in AGE_BANDS:
+        if age < upper:
+            return label
+    return OLDEST_AGE_BAND
+
+
+def cube_cell(submitted_at, age=None, sex=None, site=None):
+    """
+    The cube dimensions of one submission.
+    Args:
+        submitted_at (str): ISO timestamp.
+        age (float, optional): Age in years.
+        sex (str, optional): "Male"/"Female", M/F or 1/0.
+        site (str, optional): Clinic, camp or centre.
+    Returns:
+        tuple: (month "YYYY-MM", age band, sex, site), with UNKNOWN for missing values.
+    """
+    code = str(sex).strip()[:1].upper() if sex is not None else ""
+    sex = {"M": "Male", "1": "Male", "F": "Female", "0": "Female"}.get(code, UNKNOWN)
+    site = str(site).strip() if site is not None and site == site else ""
+    return str(submitted_at)[:7], age_band(age), sex, site or UNKNOWN
+
+
+def _scored(values):
+    # metric -> value, without missing scores
+    return {metric: float(value) for metric, value in values.items() if value is not None and value == value}
+
+
+def add_to_cubes(conn, instrument, cell, values):
+    """
+    Add one submission's scores to the cubes. Runs in the caller's transaction.
+    Args:
+        conn (sqlite3.Connection): Open store connection.
+        instrument (str): Instrument id.
+        cell (tuple): From cube_cell.
+        values (dict): Metric ("overall" or a score column) -> score.
+    """
+    conn.executemany(
+        UPSERT_SQL,
+        [(instrument, metric, *cell, 1, value, value * value) for metric, value in _scored(values).items()],
+    )
+
+
+def replace_cubes(conn, rows):
+    """
+    Rebuild the cubes from scratch, e.g. after importing submissions written before the cubes existed.
+    Runs in the caller's transaction.
+    Args:
+        rows (iterable): (instrument, cell, values) per submission, as for add_to_cubes.
+    """
+    cubes = {}
+    for instrument, cell, values in rows:
+        for metric, value in _scored(values).items():
+            key = (instrument, metric, *cell)
+            n, total, total_sq = cubes.get(key, (0, 0.0, 0.0))
+            cubes[key] = (n + 1, total + value, total_sq + value * value)
+    conn.execute("DELETE FROM score_cube")
+    conn.executemany(UPSERT_SQL, [(*key, *sums) for key, sums in cubes.items()])
+
+
+def _order(dimension, value):
+    # Age bands sort youngest first rather than alphabetically
+    if dimension == "age_band" and value in AGE_BAND_LABELS:
+        return AGE_BAND_LABELS.index(value), ""
+    return 0, value
+
+
+def _where(instrument, metric, filters):
+    clauses = ["instrument = ?", "metric = ?"]
+    params = [instrument, metric]
+    for dimension, allowed in (filters or {}).items():
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dimension}")
+        if allowed:
+            clauses.append(f"{dimension} IN ({', '.join('?' * len(allowed))})")
+            params.extend(allowed)
+    return " AND ".join(clauses), params
+
+
+def cube_summary(conn, instrument, metric="overall", group_by=(), filters=None):
+    """
+    Count, mean and standard deviation of a score, rolled up from the cubes.
+    Args:
+        conn (sqlite3.Connection): Open store connection.
+        instrument (str): Instrument id.
+        metric (str): "overall" or a score column of the instrument.
+        group_by (list): Dimensions to break down by, from DIMENSIONS; none for a single total row.
+        filters (dict, optional): Dimension -> allowed values; empty lists allow everything.
+    Returns:
+        list: One dict per group with the group's dimension values, count, mean and std.
+    """
+    group_by = list(group_by)
+    unknown = set(group_by) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown dimension(s): {', '.join(sorted(unknown))}")
+    where, params = _where(instrument, metric, filters)
+    select = ", ".join(group_by + ["SUM(n)", "SUM(total)", "SUM(total_sq)"])
+    group = f" GROUP BY {', '.join(group_by)}" if group_by else ""
+    summary = []
+    for row in conn.execute(f"SELECT {select} FROM score_cube WHERE {where}{group}", params):
+        *keys, n, total, total_sq = row
+        if not n:
+            continue
+        mean = total / n
+        # Sample variance from the running sums; clamp rounding error below zero
+        variance = max(total_sq - n * mean * mean, 0.0) / (n - 1) if n > 1 else 0.0
+        summary.append({**dict(zip(group_by, keys)), "count": n, "mean": mean, "std": math.sqrt(variance)})
+    return sorted(summary, key=lambda row: [_order(dimension, row[dimension]) for dimension in group_by])
+
+
+def dimension_values(conn, instrument):
+    """
+    Returns:
+        dict: Dimension -> sorted values present in the instrument's cubes, for filter widgets.
+    """
+    return {
+        dimension: sorted(
+            (value for (value,) in conn.execute(
+                f"SELECT DISTINCT {dimension} FROM score_cube WHERE instrument = ?", (instrument,)
+            )),
+            key=lambda value: _order(dimension, value),
+        )
+        for dimension in DIMENSIONS
+    }
+
+
+def cube_metrics(conn, instrument):
+    """
+    Returns:
+        list: Metrics with cube rows for the instrument.
+    """
+    return [metric for (metric,) in conn.execute(
+        "SELECT DISTINCT metric FROM score_cube WHERE instrument = ? ORDER BY metric", (instrument,)
+    )]
@@ -0,0 +1,47 @@
+# Per-process background services: the warm-up, the /metrics server and the report queue recovery.
+# Streamlit only runs the script of the page being visited, and after a restart the first visitor may
+# open any page, so app.py and every page call start_services() before rendering. Each service starts
+# once per server process; later calls are cache hits.
+import streamlit as st
+
+import report_jobs
+import tracing
+from config import METRICS_HOST, METRICS_PORT
+from warmup import start_warmup
+
+
+@st.cache_resource(show_spinner=False)
+def warmup():
+    """
+    Start preloading libraries, datasets and indexes in the background, once per server process.
+    """
+    return start_warmup()
+
+
+@st.cache_resource(show_spinner=False)
+def metrics_server():
+    """
+    Serve the tracing aggregates on /metrics when PANINI_METRICS_PORT is set, once per server process.
+    """
+    if METRICS_PORT:
+        return tracing.start_metrics_server(METRICS_PORT, METRICS_HOST)
+
+
+@st.cache_resource(show_spinner=False)
+def report_queue():
+    """
+    Resubmit report jobs interrupted by the last shutdown and drop expired ones, once per server process.
+    """
+    return report_jobs.resume_jobs(), report_jobs.cleanup_jobs()
+
+
+def start_services():
+    """
+    Start the background services if this server process has not started them yet.
+    Returns:
+        WarmupStatus: Progress of the warm-up.
+    """
+    status = warmup()
+    metrics_server()
+    report_queue()
+    return status
@@ -0,0 +1,497 @@
+# Questionnaire submissions, kept for follow-up and cohort-level analytics.
+# Every submission gets a row in submissions and one row per question in the normalized answers table
+# (indexed by respondent, date and instrument); its section scores also go to a per-instrument table
+# with one column per section, created from the instrument spec.
+# Pages call submit(), which only queues the submission: a background thread commits the queue in
+# batches, so a submit click never waits on disk. Readers open their own connection (WAL).
+# Each write also updates the summary cubes (score_cubes) by month, age band, sex and site.
+# Submissions that cannot be stored are logged and appended to SUBMISSIONS_DEAD_LETTER, never dropped.
+import atexit
+import json
+import logging
+import queue
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+from config import SUBMISSIONS_DB, SUBMISSIONS_DEAD_LETTER
+from lazy_imports import lazy_import
+from panini.questionnaire_engine import list_instruments, load_instrument, localized
+from panini.questionnaires import IPAQ_MET_VALUES
+from score_cubes import add_to_cubes, create_tables, cube_cell, replace_cubes
+
+# Only needed to import scored exports
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+IPAQ = "ipaq"
+
+# Submissions committed per transaction, and how long the writer waits to fill a batch
+BATCH_SIZE = 100
+BATCH_WAIT_SECONDS = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    instrument TEXT NOT NULL,
+    respondent_id TEXT,
+    submitted_at TEXT NOT NULL,
+    language TEXT,
+    overall REAL,
+    badge TEXT,
+    age REAL,
+    sex TEXT,
+    site TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_submissions_instrument_time ON submissions (instrument, submitted_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_respondent ON submissions (respondent_id, instrument, submitted_at);
+
+CREATE TABLE IF NOT EXISTS answers (
+    submission_id INTEGER NOT NULL REFERENCES submissions (id),
+    instrument TEXT NOT NULL,
+    respondent_id TEXT,
+    submitted_at TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    answer TEXT,
+    points REAL,
+    remark TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_answers_respondent ON answers (respondent_id, submitted_at, instrument);
+CREATE INDEX IF NOT EXISTS idx_answers_instrument_item ON answers (instrument, item_id, submitted_at);
+"""
+
+# Respondent columns added after the first release of the store
+RESPONDENT_COLUMNS = {"age": "REAL", "sex": "TEXT", "site": "TEXT"}
+
+# Columns of a scored export (panini.bulk_scoring) read as respondent details; the first present is used
+EXPORT_COLUMNS = {
+    "respondent_id": ["respondent_id", "patient_id", "id", "name"],
+    "submitted_at": ["submitted_at", "timestamp", "date"],
+    "age": ["age"],
+    "sex": ["sex", "gender"],
+    "site": ["site", "centre", "center", "clinic"],
+}
+
+_queue = queue.Queue()
+_writer_thread = None
+_writer_lock = threading.Lock()
+
+
+def stored_instruments():
+    """
+    Returns:
+        list: Instruments with a score table: the spec instruments and "ipaq".
+    """
+    return list_instruments() + [IPAQ]
+
+
+def score_columns(instrument):
+    """
+    Columns of an instrument's score table: its section ids, or the IPAQ activities.
+    """
+    if instrument == IPAQ:
+        return list(IPAQ_MET_VALUES) + ["sitting"]
+    return [section["id"] for section in load_instrument(instrument).sections]
+
+
+def _score_table(instrument):
+    # Instrument ids become table names, so only plain identifiers are accepted
+    if not re.fullmatch(r"[a-z][a-z0-9_]*", instrument):
+        raise ValueError(f"Invalid instrument id: {instrument!r}")
+    return f"scores_{instrument}"
+
+
+def get_connection(db_path=SUBMISSIONS_DB):
+    """
+    Open the submission store, creating tables if needed.
+    Args:
+        db_path (Path): Location of the SQLite database file.
+    Returns:
+        sqlite3.Connection: Open connection.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(submissions)")}
+    for column, kind in RESPONDENT_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE submissions ADD COLUMN {column} {kind}")
+    create_tables(conn)
+    for instrument in stored_instruments():
+        columns = ", ".join(f"{column} REAL" for column in score_columns(instrument))
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_score_table(instrument)} "
+            f"(submission_id INTEGER PRIMARY KEY REFERENCES submissions (id), {columns})"
+        )
+    conn.commit()
+    return conn
+
+
+def _section_keys(instrument):
+    # Section title in any language, or section id -> score column
+    if instrument == IPAQ:
+        return {column: column for column in score_columns(IPAQ)}
+    spec = load_instrument(instrument)
+    keys = {}
+    for section in spec.sections:
+        keys[section["id"]] = section["id"]
+        for language in spec.languages:
+            keys[localized(section["title"], language)] = section["id"]
+    return keys
+
+
+def make_submission(instrument, answers, section_scores=None, overall=None, badge=None, respondent_id=None,
+                    remarks=None, language="en", submitted_at=None, age=None, sex=None, site=None):
+    """
+    Build a submission record.
+    Args:
+        instrument (str): Instrument id, from stored_instruments.
+        answers (dict): Item id -> answer (for IPAQ, e.g. "vigorous_days" -> 3).
+        section_scores (dict, optional): Section title or id -> score.
+        overall (float, optional): Overall score.
+        badge (str, optional): Awarded badge.
+        respondent_id (str, optional): Respondent identifier; anonymous when empty.
+        remarks (dict, optional): Item id -> free-text remark.
+        language (str): Language the form was answered in.
+        submitted_at (datetime or str, optional): Defaults to now.
+        age (float, optional): Respondent's age in years.
+        sex (str, optional): Respondent's sex.
+        site (str, optional): Clinic, camp or centre the form was collected at.
+    Returns:
+        dict: The submission, as taken by record_submissions.
+    """
+    submitted_at = submitted_at or datetime.now()
+    if hasattr(submitted_at, "isoformat"):
+        submitted_at = submitted_at.isoformat(timespec="seconds")
+    if respondent_id is not None:
+        respondent_id = str(respondent_id).strip() or None
+    keys = _section_keys(instrument)
+    return {
+        "instrument": instrument,
+        "respondent_id": respondent_id,
+        "submitted_at": submitted_at,
+        "language": language,
+        "answers": dict(answers),
+        "remarks": dict(remarks or {}),
+        "scores": {keys[key]: score for key, score in (section_scores or {}).items() if key in keys},
+        "overall": overall,
+        "badge": badge,
+        "age": None if age is None or age != age else float(age),
+        "sex": sex or None,
+        "site": site or None,
+    }
+
+
+def _item_points(instrument, answers):
+    if instrument == IPAQ:
+        return {}
+    spec = load_instrument(instrument)
+    return dict(zip(spec.item_ids, spec.item_points(answers)))
+
+
+def _stored_answer(answer):
+    return answer if answer is None or isinstance(answer, (int, float, str)) else json.dumps(answer)
+
+
+def record_submissions(conn, submissions):
+    """
+    Write submissions in one transaction.
+    Args:
+        conn (sqlite3.Connection): Open store connection.
+        submissions (list): Records from make_submission.
+    Returns:
+        list: The new submission ids.
+    """
+    ids = []
+    with conn:
+        for submission in submissions:
+            instrument = submission["instrument"]
+            cursor = conn.execute(
+                "INSERT INTO submissions (instrument, respondent_id, submitted_at, language, overall, badge, age, sex, "
+                "site) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (instrument, submission["respondent_id"], submission["submitted_at"], submission["language"],
+                 submission["overall"], submission["badge"], submission["age"], submission["sex"], submission["site"]),
+            )
+            submission_id = cursor.lastrowid
+            ids.append(submission_id)
+
+            points = _item_points(instrument, submission["answers"])
+            conn.executemany(
+                "INSERT INTO answers (submission_id, instrument, respondent_id, submitted_at, item_id, answer, points, "
+                "remark) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (submission_id, instrument, submission["respondent_id"], submission["submitted_at"], item_id,
+                     _stored_answer(answer), points.get(item_id), submission["remarks"].get(item_id) or None)
+                    for item_id, answer in submission["answers"].items()
+                ],
+            )
+
+            scores = submission["scores"]
+            if scores:
+                columns = list(scores)
+                conn.execute(
+                    f"INSERT INTO {_score_table(instrument)} (submission_id, {', '.join(columns)}) "
+                    f"VALUES (?, {', '.join('?' * len(columns))})",
+                    (submission_id, *scores.values()),
+                )
+
+            cell = cube_cell(submission["submitted_at"], submission["age"], submission["sex"], submission["site"])
+            add_to_cubes(conn, instrument, cell, {"overall": submission["overall"], **scores})
+    return ids
+
+
+def rebuild_cubes(conn):
+    """
+    Recompute the summary cubes from the stored submissions, e.g. for submissions stored before the
+    cubes existed.
+    """
+    def rows():
+        for instrument in stored_instruments():
+            columns = score_columns(instrument)
+            cursor = conn.execute(
+                f"SELECT s.submitted_at, s.age, s.sex, s.site, s.overall, {', '.join(f't.{c}' for c in columns)} "
+                f"FROM submissions s LEFT JOIN {_score_table(instrument)} t ON t.submission_id = s.id "
+                f"WHERE s.instrument = ?",
+                (instrument,),
+            )
+            for submitted_at, age, sex, site, overall, *scores in cursor:
+                yield instrument, cube_cell(submitted_at, age, sex, site), {"overall": overall, **dict(zip(columns, scores))}
+
+    with conn:
+        replace_cubes(conn, rows())
+
+
+def submissions_from_scores(instrument, results, language="en"):
+    """
+    Submission records for a scored export, to store bulk-imported forms.
+    Args:
+        instrument (str): Instrument id.
+        results (pd.DataFrame): From panini.bulk_scoring.score_export. Respondent details are read from the
+        EXPORT_COLUMNS when present (matched case-insensitively). Rows without any answer are left out.
+        language (str): Language of the section titles in results.
+    Returns:
+        list: Records for record_submissions (without per-question answers).
+    """
+    if "answered" in results.columns:
+        results = results[results["answered"] > 0]
+    columns = {str(column).strip().lower(): column for column in results.columns}
+    details = {}
+    for field, candidates in EXPORT_COLUMNS.items():
+        column = next((columns[c] for c in candidates if c in columns), None)
+        if column is not None:
+            details[field] = results[column]
+    if "submitted_at" in details:
+        details["submitted_at"] = pd.to_datetime(details["submitted_at"], errors="coerce").dt.to_pydatetime()
+    if "age" in details:
+        details["age"] = pd.to_numeric(details["age"], errors="coerce")
+    # Blank cells (NaN/NaT) -> None
+    details = {field: [None if pd.isna(value) else value for value in values] for field, values in details.items()}
+
+    keys = _section_keys(instrument)
+    section_columns = [column for column in results.columns if column in keys]
+    scores = results[section_columns + ["overall"]].astype(float).to_dict("records")
+    badges = results["badge"].tolist() if "badge" in results.columns else [None] * len(results)
+
+    submissions = []
+    for position, (row, badge) in enumerate(zip(scores, badges)):
+        values = {field: column[position] for field, column in details.items()}
+        overall = row.pop("overall")
+        sex, site = values.get("sex"), values.get("site")
+        submissions.append(make_submission(
+            instrument,
+            {},
+            section_scores=row,
+            overall=overall,
+            badge=badge if isinstance(badge, str) else None,
+            respondent_id=values.get("respondent_id"),
+            language=language,
+            submitted_at=values.get("submitted_at"),
+            age=values.get("age"),
+            sex=None if sex is None else str(sex),
+            site=None if site is None else str(site),
+        ))
+    return submissions
+
+
+def _dead_letter(submissions, error, path=SUBMISSIONS_DEAD_LETTER):
+    # Keep submissions that could not be stored, with the error, so they can be inspected and re-imported
+    logger.error("Could not store %d submission(s), kept in %s: %r", len(submissions), path, error)
+    failed_at = datetime.now().isoformat(timespec="seconds")
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            for submission in submissions:
+                record = {"failed_at": failed_at, "error": repr(error), "submission": submission}
+                f.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+    except OSError:
+        logger.exception("Could not write failed submissions to %s", path)
+
+
+def _write_batch(conn, batch):
+    try:
+        record_submissions(conn, batch)
+    except Exception:
+        # Write the batch one by one, so one bad record does not lose the others
+        for submission in batch:
+            try:
+                record_submissions(conn, [submission])
+            except Exception as e:
+                _dead_letter([submission], e)
+
+
+def _write_loop(db_path):
+    # Never lets an exception end the thread: flush() waits on the queue, so a dead writer would block shutdown
+    conn = None
+    while True:
+        batch = [_queue.get()]
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(_queue.get(timeout=BATCH_WAIT_SECONDS))
+            except queue.Empty:
+                break
+        try:
+            if conn is None:
+                conn = get_connection(db_path)
+            _write_batch(conn, batch)
+        except Exception as e:
+            # The store could not be opened; reopen it for the next batch
+            conn = None
+            _dead_letter(batch, e)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def start_writer(db_path=SUBMISSIONS_DB):
+    """
+    Start the background writer in a daemon thread, once per process.
+    Returns:
+        threading.Thread: The running writer thread.
+    """
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_write_loop, args=(db_path,), name="submission-writer", daemon=True)
+            _writer_thread.start()
+    return _writer_thread
+
+
+def submit(instrument, answers, **kwargs):
+    """
+    Queue a submission for the background writer and return immediately.
+    Takes the arguments of make_submission.
+    """
+    start_writer()
+    _queue.put(make_submission(instrument, answers, **kwargs))
+
+
+def flush():
+    """
+    Block until every queued submission has been written.
+    """
+    if _writer_thread is not None:
+        _queue.join()
+
+
+# Do not drop queued submissions when the server shuts down
+atexit.register(flush)
+
+
+def _period(start, end, column="s.submitted_at"):
+    clauses, params = [], []
+    if start:
+        clauses.append(f"{column} >= ?")
+        params.append(str(start))
+    if end:
+        clauses.append(f"{column} < ?")
+        params.append(str(end))
+    return "".join(f" AND {clause}" for clause in clauses), params
+
+
+def _rows(cursor):
+    names = [description[0] for description in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+
+def cohort_scores(conn, instrument, start=None, end=None):
+    """
+    Every submission of an instrument with its section scores, oldest first.
+    Args:
+        conn (sqlite3.Connection): Open store connection.
+        instrument (str): Instrument id.
+        start (str, optional): ISO date; submissions on or after it.
+        end (str, optional): ISO date; submissions before it.
+    Returns:
+        list: One dict per submission with id, respondent_id, submitted_at, overall, badge and each section column.
+    """
+    period, params = _period(start, end)
+    columns = ", ".join(f"t.{column}" for column in score_columns(instrument))
+    return _rows(conn.execute(
+        f"SELECT s.id, s.respondent_id, s.submitted_at, s.overall, s.badge, {columns} FROM submissions s "
+        f"LEFT JOIN {_score_table(instrument)} t ON t.submission_id = s.id "
+        f"WHERE s.instrument = ?{period} ORDER BY s.submitted_at, s.id",
+        (instrument, *params),
+    ))
+
+
+def score_summary(conn, instrument, start=None, end=None):
+    """
+    Count, mean, min and max of the overall and each section score.
+    Returns:
+        list: One dict per score column (column, count, mean, min, max).
+    """
+    period, params = _period(start, end)
+    table = _score_table(instrument)
+    summary = []
+    for column, source in [("overall", "s.overall")] + [(c, f"t.{c}") for c in score_columns(instrument)]:
+        count, mean, low, high = conn.execute(
+            f"SELECT COUNT({source}), AVG({source}), MIN({source}), MAX({source}) FROM submissions s "
+            f"LEFT JOIN {table} t ON t.submission_id = s.id WHERE s.instrument = ?{period}",
+            (instrument, *params),
+        ).fetchone()
+        summary.append({"column": column, "count": count, "mean": mean, "min": low, "max": high})
+    return summary
+
+
+def badge_counts(conn, instrument, start=None, end=None):
+    """
+    Returns:
+        dict: Badge -> number of submissions, most common first.
+    """
+    period, params = _period(start, end)
+    return dict(conn.execute(
+        f"SELECT s.badge, COUNT(*) FROM submissions s WHERE s.instrument = ? AND s.badge IS NOT NULL{period} "
+        f"GROUP BY s.badge ORDER BY COUNT(*) DESC",
+        (instrument, *params),
+    ).fetchall())
+
+
+def answer_distribution(conn, instrument, start=None, end=None):
+    """
+    How often each answer was given to each question.
+    Returns:
+        list: (item_id, answer, count) tuples, by item and answer.
+    """
+    period, params = _period(start, end, column="a.submitted_at")
+    return conn.execute(
+        f"SELECT a.item_id, a.answer, COUNT(*) FROM answers a WHERE a.instrument = ?{period} "
+        f"GROUP BY a.item_id, a.answer ORDER BY a.item_id, a.answer",
+        (instrument, *params),
+    ).fetchall()
+
+
+def respondent_history(conn, respondent_id, instrument=None):
+    """
+    A respondent's submissions, oldest first.
+    Returns:
+        list: One dict per submission with id, instrument, submitted_at, overall and badge.
+    """
+    sql = "SELECT id, instrument, submitted_at, overall, badge FROM submissions WHERE respondent_id = ?"
+    params = [str(respondent_id)]
+    if instrument:
+        sql += " AND instrument = ?"
+        params.append(instrument)
+    return _rows(conn.execute(sql + " ORDER BY submitted_at, id", params))
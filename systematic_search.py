@@ -0,0 +1,126 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from eutils import MAX_RETMAX, esearch
+from http_utils import create_session
+from pubmed_cache import get_cached_searches, get_connection, save_searches
+
+
+def parse_keyword_groups(text):
+    """
+    Parse keyword groups from free text.
+    Each line is one concept group; synonyms within a line are comma-separated.
+    Args:
+        text (str): Raw text from the keyword input.
+    Returns:
+        list: List of keyword groups, each a list of unique keywords.
+    """
+    groups = []
+    for line in text.splitlines():
+        keywords = list(dict.fromkeys(kw.strip() for kw in line.split(",") if kw.strip()))
+        if keywords:
+            groups.append(keywords)
+    return groups
+
+
+def format_term(keyword):
+    """
+    Format a keyword for PubMed; truncated terms (ending with *) are left unquoted.
+    """
+    return keyword if keyword.endswith("*") else f'"{keyword}"'
+
+
+def expand_combinations(groups):
+    """
+    Expand keyword groups into AND-combinations taking one keyword from each group.
+    Combinations that differ only in keyword order are generated once.
+    Args:
+        groups (list): Keyword groups from parse_keyword_groups.
+    Returns:
+        list: PubMed query strings in a stable order.
+    """
+    queries = []
+    seen = set()
+    for combo in itertools.product(*groups):
+        key = frozenset(kw.lower() for kw in combo)
+        if key in seen:
+            continue
+        seen.add(key)
+        terms = sorted({kw.lower(): kw for kw in combo}.values(), key=str.lower)
+        queries.append(" AND ".join(format_term(kw) for kw in terms))
+    return queries
+
+
+def run_systematic_search(groups, max_workers=3, retmax=MAX_RETMAX):
+    """
+    Run every keyword combination, reusing cached queries and merging PMIDs.
+    Only combinations not in the local cache for this retmax, or cached more than
+    pubmed_cache.SEARCH_TTL_DAYS ago, are sent to PubMed, concurrently.
+    Args:
+        groups (list): Keyword groups from parse_keyword_groups.
+        max_workers (int): Number of concurrent ESearch requests.
+        retmax (int): Maximum PMIDs retrieved per query.
+    Returns:
+        tuple: (unique PMIDs in first-seen order, list of per-query count rows, list of failed queries).
+    """
+    queries = expand_combinations(groups)
+    conn = get_connection()
+    try:
+        results = get_cached_searches(conn, queries, retmax)
+        cached_queries = set(results)
+        pending = [q for q in queries if q not in results]
+
+        fetched = {}
+        failed = []
+        if pending:
+            session = create_session(pool_size=max_workers)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {q: executor.submit(esearch, session, q, retmax) for q in pending}
+                for query, future in futures.items():
+                    try:
+                        fetched[query] = future.result()
+                    except Exception:
+                        failed.append(query)
+            save_searches(conn, fetched, retmax)
+        results.update(fetched)
+    finally:
+        conn.close()
+
+    seen = set()
+    unique_pmids = []
+    count_rows = []
+    for query in queries:
+        if query not in results:
+            continue
+        pmids = results[query]["pmids"]
+        new_pmids = [pmid for pmid in pmids if pmid not in seen]
+        seen.update(new_pmids)
+        unique_pmids.extend(new_pmids)
+        count_rows.append(
+            {
+                "Query": query,
+                "Hits": results[query]["count"],
+                "Retrieved": len(pmids),
+                "New Unique": len(new_pmids),
+                "Cached": query in cached_queries,
+            }
+        )
+    return unique_pmids, count_rows, failed
+
+
+def prisma_summary(count_rows, unique_pmids):
+    """
+    Summarise identification counts in PRISMA style.
+    Args:
+        count_rows (list): Per-query rows from run_systematic_search.
+        unique_pmids (list): Deduplicated PMIDs.
+    Returns:
+        dict: Records identified, duplicates removed and unique records screened.
+    """
+    identified = sum(row["Retrieved"] for row in count_rows)
+    return {
+        "Queries Executed": len(count_rows),
+        "Records Identified": identified,
+        "Duplicates Removed": identified - len(unique_pmids),
+        "Records Screened": len(unique_pmids),
+    }
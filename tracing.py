@@ -0,0 +1,192 @@
+# Lightweight timing spans for the pages' hot paths (data loads, filters, plan generation, charts, reports).
+# Tracing is off unless PANINI_TRACING=1; a disabled span is a shared no-op context manager.
+# Durations are aggregated per (page, stage) into counts and p50/p95/p99, shown on the app's admin view
+# (?admin=metrics) and, when PANINI_METRICS_PORT is set, served in Prometheus text format on /metrics.
+import contextlib
+import functools
+import math
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import TRACING_ENABLED
+
+# Samples kept per (page, stage) for the percentiles; counts and sums cover every span
+MAX_SAMPLES = 1000
+QUANTILES = [0.5, 0.95, 0.99]
+
+_enabled = TRACING_ENABLED
+_NOOP = contextlib.nullcontext()
+_local = threading.local()
+_lock = threading.Lock()
+_stats = {}
+
+
+class _SpanStats:
+    __slots__ = ("count", "total", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_page(page):
+    """
+    Label spans recorded by this thread (the Streamlit script thread) with a page name.
+    Args:
+        page (str): Page name, or the page's __file__ (its file name without extension is used).
+    """
+    _local.page = os.path.splitext(os.path.basename(page))[0]
+
+
+def record(stage, seconds, page=None):
+    """
+    Add one duration to the (page, stage) aggregate.
+    """
+    key = (page or getattr(_local, "page", "app"), stage)
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = _SpanStats()
+        stats.count += 1
+        stats.total += seconds
+        stats.samples.append(seconds)
+
+
+@contextlib.contextmanager
+def _timed(stage, page):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, page)
+
+
+def span(stage, page=None):
+    """
+    Time a block:  with span("generate_plan"): ...
+    Args:
+        stage (str): Hot-path name, e.g. "load_dataset", "filter", "render_chart", "report".
+        page (str, optional): Page label; defaults to the one given to set_page in this thread.
+    """
+    if not _enabled:
+        return _NOOP
+    return _timed(stage, page)
+
+
+def traced(stage):
+    """
+    Decorator form of span.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _timed(stage, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _quantile(ordered, q):
+    # Nearest-rank percentile: the smallest sample with at least q of the samples at or below it
+    index = max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def snapshot():
+    """
+    Returns:
+        list: One dict per (page, stage) with count, total_s and p50_s/p95_s/p99_s, sorted by page and stage.
+    """
+    with _lock:
+        items = [(key, stats.count, stats.total, sorted(stats.samples)) for key, stats in _stats.items()]
+    rows = []
+    for (page, stage), count, total, ordered in sorted(items):
+        row = {"page": page, "stage": stage, "count": count, "total_s": total}
+        for q in QUANTILES:
+            row[f"p{int(q * 100)}_s"] = _quantile(ordered, q) if ordered else 0.0
+        rows.append(row)
+    return rows
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def prometheus_text():
+    """
+    Render the aggregates as a Prometheus summary, panini_span_seconds{page, stage, quantile}.
+    """
+    lines = [
+        "# HELP panini_span_seconds Duration of instrumented page hot paths.",
+        "# TYPE panini_span_seconds summary",
+    ]
+    for row in snapshot():
+        labels = f'page="{_label(row["page"])}",stage="{_label(row["stage"])}"'
+        for q in QUANTILES:
+            lines.append(f'panini_span_seconds{{{labels},quantile="{q}"}} {row[f"p{int(q * 100)}_s"]:.6f}')
+        lines.append(f"panini_span_seconds_sum{{{labels}}} {row['total_s']:.6f}")
+        lines.append(f"panini_span_seconds_count{{{labels}}} {row['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server_lock = threading.Lock()
+_server = None
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    Serve /metrics from a daemon thread, once per process.
+    The endpoint has no authentication, so it only listens on localhost unless another host is given.
+    Args:
+        port (int): TCP port.
+        host (str): Interface to bind.
+    Returns:
+        ThreadingHTTPServer: The running server.
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,197 @@
+# Warm-up run at server start so the first visitor does not pay for imports, CSV parsing and index setup.
+# startup.start_services() starts it in a daemon thread with start_warmup() on the first page load of a server
+# process; the status object reports readiness.
+# It can also run as a preload step before the server starts (`python warmup.py`), which creates the
+# SQLite stores and pulls the data files into the OS page cache.
+import threading
+import time
+
+import tracing
+from lazy_imports import preload
+
+# Libraries the pages import lazily; loading them here moves the import cost off the first request
+HEAVY_MODULES = [
+    "matplotlib.pyplot",
+    "seaborn",
+    "plotly.express",
+    "plotly.graph_objects",
+    "networkx",
+    "docx",
+    "docx.shared",
+    "fpdf",
+    "wordcloud",
+    "reportlab.lib.pagesizes",
+    "reportlab.pdfgen.canvas",
+]
+
+
+class WarmupStatus:
+    """
+    Progress of a warm-up run. `ready` is set once every step has finished, whether or not it succeeded.
+    """
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.timings = {}
+        self.errors = {}
+
+    def summary(self):
+        """
+        Returns:
+            dict: ready flag, per-step seconds and error messages.
+        """
+        return {"ready": self.ready.is_set(), "timings": dict(self.timings), "errors": dict(self.errors)}
+
+
+def warm_imports():
+    """
+    Import the heavy plotting and report libraries.
+    Returns:
+        dict: Module name -> error message for modules that failed to import.
+    """
+    return preload(HEAVY_MODULES)
+
+
+def warm_datasets():
+    """
+    Parse every registered dataset into the shared load_dataset cache.
+    Returns:
+        dict: Dataset name -> error message for datasets that failed to load.
+    """
+    from dataset_registry import DATASETS, load_dataset
+
+    errors = {}
+    for name in DATASETS:
+        try:
+            load_dataset(name)
+        except Exception as e:
+            errors[name] = str(e)
+    return errors
+
+
+def warm_indexes():
+    """
+    Create the SQLite stores and touch their indexes so the first query reads from a warm page cache.
+    Returns:
+        dict: Store name -> error message for stores that failed to open.
+    """
+    import abstract_index
+    import api_cache
+    import body_composition_store
+    import interaction_kb
+    import product_store
+    import submission_store
+
+    errors = {}
+    try:
+        conn = abstract_index.get_index_connection()
+        try:
+            abstract_index.search_abstracts(conn, "nutrition", limit=1)
+            abstract_index.list_journals(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        errors["abstract_index"] = str(e)
+
+    stores = (
+        ("api_cache", api_cache),
+        ("body_composition_store", body_composition_store),
+        ("interaction_kb", interaction_kb),
+        ("product_store", product_store),
+        ("submission_store", submission_store),
+    )
+    for name, module in stores:
+        try:
+            module.get_connection().close()
+        except Exception as e:
+            errors[name] = str(e)
+    return errors
+
+
+def warm_renderers():
+    """
+    Render throwaway charts so matplotlib builds its font cache and plotly loads its templates.
+    Returns:
+        dict: Renderer name -> error message for renderers that failed.
+    """
+    from io import BytesIO
+
+    errors = {}
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(1, 1))
+        ax.plot([0, 1], [0, 1])
+        fig.savefig(BytesIO(), format="png")
+        plt.close(fig)
+    except Exception as e:
+        errors["matplotlib"] = str(e)
+
+    try:
+        import plotly.graph_objects as go
+
+        go.Figure(go.Scatter(x=[0, 1], y=[0, 1])).to_json()
+    except Exception as e:
+        errors["plotly"] = str(e)
+    return errors
+
+
+WARMUP_STEPS = [
+    ("imports", warm_imports),
+    ("datasets", warm_datasets),
+    ("indexes", warm_indexes),
+    ("renderers", warm_renderers),
+]
+
+
+def run_warmup(status=None):
+    """
+    Run every warm-up step in order, recording timings and errors.
+    Args:
+        status (WarmupStatus, optional): Status object to update; a new one is created if omitted.
+    Returns:
+        WarmupStatus: The finished status, with `ready` set.
+    """
+    status = status or WarmupStatus()
+    tracing.set_page("warmup")
+    try:
+        for name, step in WARMUP_STEPS:
+            start = time.perf_counter()
+            try:
+                errors = step()
+            except Exception as e:
+                errors = {name: str(e)}
+            status.timings[name] = time.perf_counter() - start
+            status.errors.update({f"{name}: {key}": message for key, message in errors.items()})
+    finally:
+        status.ready.set()
+    return status
+
+
+_warmup_lock = threading.Lock()
+_warmup_status = None
+
+
+def start_warmup():
+    """
+    Start the warm-up in a daemon thread, once per process.
+    Returns:
+        WarmupStatus: Status of the running (or finished) warm-up.
+    """
+    global _warmup_status
+    with _warmup_lock:
+        if _warmup_status is None:
+            _warmup_status = WarmupStatus()
+            threading.Thread(target=run_warmup, args=(_warmup_status,), name="warmup", daemon=True).start()
+    return _warmup_status
+
+
+if __name__ == "__main__":
+    result = run_warmup()
+    for step, seconds in result.timings.items():
+        print(f"{step}: {seconds:.2f} s")
+    for key, message in result.errors.items():
+        print(f"failed {key}: {message}")